@@ -3,24 +3,80 @@ Database Manager for Personal Finance Tracker
 Handles all SQLite database operations
 """
 
+import hashlib
+import json
 import sqlite3
 import os
+import time
+from collections import Counter
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Dict, Optional, Tuple
+from typing import Callable, List, Dict, Optional, Tuple, Iterator
+from database.migrations import MIGRATIONS
+
+# Connection profiles: PRAGMA settings applied whenever a connection is opened
+CONNECTION_PROFILES = {
+    # Interactive use: WAL lets the query thread read while the GUI writes, and
+    # synchronous=NORMAL only fsyncs at checkpoints instead of on every commit
+    'default': {
+        'busy_timeout': 5000,  # ms to wait on a locked database
+        'journal_mode': 'WAL',
+        'synchronous': 'NORMAL',
+        'cache_size': -16000,  # Negative = KiB, so 16 MB of page cache
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 1000,  # Pages of WAL before an automatic checkpoint
+        'checkpoint_on_close': 'TRUNCATE',
+    },
+    # Same as default but fsyncs every commit, for when power loss is a concern
+    'durable': {
+        'busy_timeout': 5000,
+        'journal_mode': 'WAL',
+        'synchronous': 'FULL',
+        'cache_size': -16000,
+        'mmap_size': 64 * 1024 * 1024,
+        'temp_store': 'MEMORY',
+        'wal_autocheckpoint': 1000,
+        'checkpoint_on_close': 'TRUNCATE',
+    },
+    # Original SQLite defaults: rollback journal with a full fsync on every commit
+    'legacy': {
+        'busy_timeout': 5000,
+        'journal_mode': 'DELETE',
+        'synchronous': 'FULL',
+    },
+}
+
 
 class DatabaseManager:
-    def __init__(self, db_path: str = None):
-        """Initialize database manager with connection to SQLite database"""
+    def __init__(self, db_path: str = None, initialize: bool = True, profile='default'):
+        """
+        Initialize database manager with connection to SQLite database
+
+        Args:
+            db_path: Path to the database file (defaults to Documents/FinanceTracker/finance.db)
+            initialize: Apply the schema on connect; secondary connections to an
+                        already initialized database can skip it
+            profile: Name of a CONNECTION_PROFILES entry, or a dict of PRAGMA settings
+        """
         if db_path is None:
             # Default to Documents folder
             documents_path = os.path.join(os.path.expanduser('~'), 'Documents', 'FinanceTracker')
             os.makedirs(documents_path, exist_ok=True)
             db_path = os.path.join(documents_path, 'finance.db')
 
+        if isinstance(profile, str):
+            if profile not in CONNECTION_PROFILES:
+                raise ValueError(f"Unknown connection profile: {profile}")
+            profile = CONNECTION_PROFILES[profile]
+
         self.db_path = db_path
+        self.profile = dict(profile)
+        self.batch_depth = 0  # Nesting level of open batch() blocks
         self.conn = None
         self.connect()
-        self.initialize_database()
+        if initialize:
+            self.initialize_database()
 
     def connect(self):
         """Create database connection"""
@@ -28,9 +84,37 @@ class DatabaseManager:
             self.conn = sqlite3.connect(self.db_path)
             self.conn.row_factory = sqlite3.Row  # Access columns by name
             self.conn.execute("PRAGMA foreign_keys = ON")  # Enable foreign keys
+            # Used by migration 3 to backfill the dedup fingerprint column
+            self.conn.create_function('transaction_fingerprint', 4, DatabaseManager.transaction_fingerprint,
+                                      deterministic=True)
+            self.apply_profile()
         except sqlite3.Error as e:
             raise Exception(f"Database connection error: {e}")
 
+    def apply_profile(self):
+        """Apply the connection profile's PRAGMA settings"""
+        for pragma in ('busy_timeout', 'journal_mode', 'synchronous', 'cache_size',
+                       'mmap_size', 'temp_store', 'wal_autocheckpoint'):
+            if pragma in self.profile:
+                # PRAGMA values cannot be bound as parameters; profiles are trusted constants
+                self.conn.execute(f"PRAGMA {pragma} = {self.profile[pragma]}").fetchall()
+
+    def checkpoint(self, mode: str = 'PASSIVE') -> Dict:
+        """
+        Copy committed WAL content back into the main database file
+
+        Args:
+            mode: PASSIVE (never blocks), FULL, RESTART or TRUNCATE (also empties the WAL file)
+
+        Returns:
+            Dictionary with busy flag, WAL pages and pages checkpointed
+        """
+        if mode not in ('PASSIVE', 'FULL', 'RESTART', 'TRUNCATE'):
+            raise ValueError(f"Unknown checkpoint mode: {mode}")
+
+        row = self.conn.execute(f"PRAGMA wal_checkpoint({mode})").fetchone()
+        return {'busy': row[0], 'log_pages': row[1], 'checkpointed_pages': row[2]}
+
     def initialize_database(self):
         """Create tables if they don't exist"""
         schema_path = os.path.join(os.path.dirname(__file__), 'schema.sql')
@@ -39,13 +123,116 @@ class DatabaseManager:
                 schema_sql = f.read()
             self.conn.executescript(schema_sql)
             self.conn.commit()
+            self.apply_migrations()
         except Exception as e:
             raise Exception(f"Database initialization error: {e}")
 
+    def apply_migrations(self):
+        """Apply pending schema migrations, each in its own transaction"""
+        version = self.conn.execute("PRAGMA user_version").fetchone()[0]
+        for number in range(version + 1, len(MIGRATIONS) + 1):
+            try:
+                self.conn.executescript(
+                    f"BEGIN;\n{MIGRATIONS[number - 1]}\nPRAGMA user_version = {number};\nCOMMIT;"
+                )
+            except sqlite3.Error as e:
+                if self.conn.in_transaction:
+                    self.conn.rollback()
+                raise Exception(f"Migration {number} failed: {e}")
+
     def close(self):
-        """Close database connection"""
+        """Close database connection, checkpointing the WAL if the profile asks for it"""
         if self.conn:
+            checkpoint_mode = self.profile.get('checkpoint_on_close')
+            if checkpoint_mode:
+                try:
+                    self.checkpoint(checkpoint_mode)
+                except sqlite3.Error:
+                    pass  # Another connection is busy; SQLite checkpoints on its own later
             self.conn.close()
+            self.conn = None
+
+    def restore_from(self, source_path: str, pages: int = -1,
+                     progress_callback: Callable[[int, int], bool] = None):
+        """
+        Replace the contents of the open database with another database file
+
+        The pages are written through this connection with SQLite's backup API, so
+        the file keeps its journal mode and other connections simply see the new
+        contents on their next read. Afterwards the connection is reopened, which
+        drops per-connection state left from the old contents such as temporary
+        tables, and migrations bring a backup from an older version up to date.
+
+        Args:
+            source_path: Database file to copy from (opened read-only); it should
+                         already have been verified
+            pages: Pages copied per step (-1 copies everything in one step)
+            progress_callback: Called as (pages_copied, total_pages) after each step;
+                               returning False aborts, leaving the old contents, unless
+                               the last step has already run
+        """
+        if self.batch_depth > 0 or self.conn.in_transaction:
+            raise Exception("Cannot restore inside an open transaction")
+
+        class _Cancelled(Exception):
+            pass
+
+        def progress(status, remaining, total):
+            # The final step has already committed the new contents, so it cannot be undone
+            if progress_callback and progress_callback(total - remaining, total) is False and remaining:
+                raise _Cancelled()
+
+        source = sqlite3.connect(f"file:{source_path}?mode=ro", uri=True)
+        try:
+            source.backup(self.conn, pages=pages, progress=progress)
+        except _Cancelled:
+            raise Exception("Restore cancelled")
+        except sqlite3.Error as e:
+            raise Exception(f"Error restoring database: {e}")
+        finally:
+            source.close()
+
+        self.close()
+        self.connect()
+        self.initialize_database()
+
+    # ==================== UNIT OF WORK ====================
+
+    @contextmanager
+    def batch(self):
+        """
+        Group several operations into one atomic commit
+
+        Mutators called inside the block skip their own commits and the outermost
+        block commits once on exit. Nested blocks are savepoints, so an exception
+        rolls back only the innermost block before propagating.
+
+        Usage:
+            with db.batch():
+                db.add_account(...)
+                db.add_transaction(...)
+        """
+        self.batch_depth += 1
+        savepoint = f"batch_{self.batch_depth}"
+        self.conn.execute(f"SAVEPOINT {savepoint}")
+        try:
+            yield self
+        except BaseException:
+            self.conn.execute(f"ROLLBACK TO {savepoint}")
+            self.conn.execute(f"RELEASE {savepoint}")
+            raise
+        else:
+            self.conn.execute(f"RELEASE {savepoint}")
+        finally:
+            self.batch_depth -= 1
+
+        if self.batch_depth == 0:
+            self.conn.commit()
+
+    def _commit(self):
+        """Commit unless an enclosing batch() block will commit on exit"""
+        if self.batch_depth == 0:
+            self.conn.commit()
 
     # ==================== ACCOUNT OPERATIONS ====================
 
@@ -57,30 +244,22 @@ class DatabaseManager:
                    VALUES (?, ?, ?, ?, ?)""",
                 (name, account_type, initial_balance, initial_balance, currency)
             )
-            self.conn.commit()
+            self._commit()
             return cursor.lastrowid
         except sqlite3.Error as e:
             raise Exception(f"Error adding account: {e}")
 
     def update_account(self, account_id: int, name: str, account_type: str, initial_balance: float, currency: str):
-        """Update account details (recalculates current balance based on transactions)"""
+        """Update account details (shifts current balance by the change in initial balance)"""
         try:
-            # Get current balance from transactions
-            cursor = self.conn.execute(
-                """SELECT SUM(CASE WHEN transaction_type = 'income' THEN amount ELSE -amount END) as balance
-                   FROM transactions WHERE account_id = ?""",
-                (account_id,)
-            )
-            transaction_balance = cursor.fetchone()['balance'] or 0
-            new_current_balance = initial_balance + transaction_balance
-
             self.conn.execute(
                 """UPDATE accounts
-                   SET name = ?, account_type = ?, initial_balance = ?, current_balance = ?, currency = ?
+                   SET name = ?, account_type = ?, current_balance = current_balance - initial_balance + ?,
+                       initial_balance = ?, currency = ?
                    WHERE id = ?""",
-                (name, account_type, initial_balance, new_current_balance, currency, account_id)
+                (name, account_type, initial_balance, initial_balance, currency, account_id)
             )
-            self.conn.commit()
+            self._commit()
         except sqlite3.Error as e:
             raise Exception(f"Error updating account: {e}")
 
@@ -88,7 +267,7 @@ class DatabaseManager:
         """Delete an account (cascades to transactions)"""
         try:
             self.conn.execute("DELETE FROM accounts WHERE id = ?", (account_id,))
-            self.conn.commit()
+            self._commit()
         except sqlite3.Error as e:
             raise Exception(f"Error deleting account: {e}")
 
@@ -112,7 +291,12 @@ class DatabaseManager:
         return [dict(row) for row in cursor.fetchall()]
 
     def recalculate_account_balance(self, account_id: int):
-        """Recalculate account balance based on transactions"""
+        """
+        Recalculate account balance from scratch based on transactions
+
+        Balances are normally maintained incrementally by the transaction triggers
+        in schema.sql; this full re-sum is only needed to repair drift.
+        """
         try:
             account = self.get_account(account_id)
             if not account:
@@ -130,10 +314,49 @@ class DatabaseManager:
                 "UPDATE accounts SET current_balance = ? WHERE id = ?",
                 (new_balance, account_id)
             )
-            self.conn.commit()
+            self._commit()
         except sqlite3.Error as e:
             raise Exception(f"Error recalculating balance: {e}")
 
+    def verify_balances(self, repair: bool = False) -> List[Dict]:
+        """
+        Compare incrementally maintained balances against a full re-sum
+
+        Args:
+            repair: Recalculate the balance of every account that has drifted
+
+        Returns:
+            List of drifted accounts with current_balance, expected_balance and drift
+        """
+        cursor = self.conn.execute(
+            """SELECT a.id, a.name, a.current_balance,
+                      a.initial_balance + COALESCE(SUM(CASE WHEN t.transaction_type = 'income'
+                                                            THEN t.amount ELSE -t.amount END), 0)
+                          as expected_balance
+               FROM accounts a
+               LEFT JOIN transactions t ON t.account_id = a.id
+               GROUP BY a.id"""
+        )
+
+        drifted = []
+        for row in cursor.fetchall():
+            drift = row['current_balance'] - row['expected_balance']
+            if abs(drift) >= 0.005:
+                drifted.append({
+                    'id': row['id'],
+                    'name': row['name'],
+                    'current_balance': row['current_balance'],
+                    'expected_balance': row['expected_balance'],
+                    'drift': drift
+                })
+
+        if repair and drifted:
+            with self.batch():
+                for account in drifted:
+                    self.recalculate_account_balance(account['id'])
+
+        return drifted
+
     # ==================== CATEGORY OPERATIONS ====================
 
     def add_category(self, name: str, category_type: str, description: str = '') -> int:
@@ -143,7 +366,7 @@ class DatabaseManager:
                 "INSERT INTO categories (name, type, description) VALUES (?, ?, ?)",
                 (name, category_type, description)
             )
-            self.conn.commit()
+            self._commit()
             return cursor.lastrowid
         except sqlite3.IntegrityError:
             raise Exception(f"Category '{name}' already exists")
@@ -157,7 +380,7 @@ class DatabaseManager:
                 "UPDATE categories SET name = ?, type = ?, description = ? WHERE id = ?",
                 (name, category_type, description, category_id)
             )
-            self.conn.commit()
+            self._commit()
         except sqlite3.IntegrityError:
             raise Exception(f"Category '{name}' already exists")
         except sqlite3.Error as e:
@@ -167,7 +390,7 @@ class DatabaseManager:
         """Delete a category (will fail if it has transactions)"""
         try:
             self.conn.execute("DELETE FROM categories WHERE id = ?", (category_id,))
-            self.conn.commit()
+            self._commit()
         except sqlite3.IntegrityError:
             raise Exception("Cannot delete category: it has associated transactions")
         except sqlite3.Error as e:
@@ -194,65 +417,164 @@ class DatabaseManager:
 
     # ==================== TRANSACTION OPERATIONS ====================
 
+    @staticmethod
+    def transaction_fingerprint(account_id: int, transaction_date: str, amount: float,
+                                description: Optional[str]) -> str:
+        """
+        Dedup key identifying the same bank transaction across imports
+
+        The description is compared case- and whitespace-insensitively and the amount
+        to the cent, so reformatted exports of one statement produce the same keys.
+
+        Returns:
+            16 hex digit hash of account, date, amount and normalized description
+        """
+        normalized = ' '.join(str(description or '').lower().split())
+        key = f"{account_id}|{transaction_date}|{round(float(amount) * 100)}|{normalized}"
+        return hashlib.blake2b(key.encode('utf-8'), digest_size=8).hexdigest()
+
     def add_transaction(self, account_id: int, category_id: int, amount: float,
                        transaction_type: str, description: str, transaction_date: str) -> int:
         """Add a new transaction"""
         try:
             cursor = self.conn.execute(
                 """INSERT INTO transactions
-                   (account_id, category_id, amount, transaction_type, description, transaction_date)
-                   VALUES (?, ?, ?, ?, ?, ?)""",
-                (account_id, category_id, amount, transaction_type, description, transaction_date)
+                   (account_id, category_id, amount, transaction_type, description, transaction_date,
+                    fingerprint)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                (account_id, category_id, amount, transaction_type, description, transaction_date,
+                 self.transaction_fingerprint(account_id, transaction_date, amount, description))
             )
-            transaction_id = cursor.lastrowid
-            self.conn.commit()
+            self._commit()
+            return cursor.lastrowid
+        except sqlite3.Error as e:
+            raise Exception(f"Error adding transaction: {e}")
 
-            # Update account balance
-            self.recalculate_account_balance(account_id)
+    def add_transactions_bulk(self, transactions: List[Tuple], skip_duplicates: bool = False,
+                              seen: Optional[Dict[str, int]] = None) -> Dict:
+        """
+        Add many transactions in a single database transaction
+
+        Inside a batch() block the rows join the enclosing transaction directly rather
+        than opening a nested savepoint, which makes repeated large inserts several times
+        slower; an error should therefore abort the whole block.
+
+        With skip_duplicates, rows whose fingerprint is already stored are dropped by one
+        INSERT ... SELECT against a temporary staging table rather than a query per row.
+        Repeats are counted, so a statement holding two identical purchases imports both
+        the first time and neither when imported again: the n-th copy of a fingerprint in
+        the import is skipped while the table holds at least n of them.
+
+        Args:
+            transactions: Iterable of (account_id, category_id, amount, transaction_type,
+                          description, transaction_date) tuples
+            skip_duplicates: Leave out rows already in the database
+            seen: Fingerprint counts carried between calls when one import is inserted in
+                  several batches; pass the same empty dict to each call
+
+        Returns:
+            Dictionary with inserted and skipped counts, skipped_fingerprints (one entry
+            per skipped row), elapsed seconds and rows_per_sec
+        """
+        start_time = time.perf_counter()
+        rows = [
+            (*row, self.transaction_fingerprint(row[0], row[5], row[2], row[4]))
+            for row in transactions
+        ]
 
-            return transaction_id
+        try:
+            if self.batch_depth:
+                skipped = self._insert_transactions(rows, skip_duplicates, seen)
+            else:
+                with self.batch():
+                    skipped = self._insert_transactions(rows, skip_duplicates, seen)
         except sqlite3.Error as e:
-            raise Exception(f"Error adding transaction: {e}")
+            raise Exception(f"Error adding transactions: {e}")
+
+        elapsed = time.perf_counter() - start_time
+        return {
+            'inserted': len(rows) - len(skipped),
+            'skipped': len(skipped),
+            'skipped_fingerprints': skipped,
+            'elapsed': elapsed,
+            'rows_per_sec': len(rows) / elapsed if elapsed > 0 else 0
+        }
+
+    def _insert_transactions(self, rows: List[Tuple], skip_duplicates: bool,
+                             seen: Optional[Dict[str, int]]) -> List[str]:
+        """Insert fingerprinted rows for add_transactions_bulk, returning the fingerprints skipped"""
+        if not skip_duplicates:
+            self.conn.executemany(
+                """INSERT INTO transactions
+                   (account_id, category_id, amount, transaction_type, description, transaction_date,
+                    fingerprint)
+                   VALUES (?, ?, ?, ?, ?, ?, ?)""",
+                rows
+            )
+            return []
+
+        # Number each row by how many earlier rows of this import share its fingerprint
+        seen = {} if seen is None else seen
+        staged = []
+        for row in rows:
+            occurrence = seen.get(row[6], 0)
+            seen[row[6]] = occurrence + 1
+            staged.append((*row, occurrence))
+
+        self.conn.execute(
+            """CREATE TEMP TABLE IF NOT EXISTS import_staging (
+                   account_id INTEGER, category_id INTEGER, amount REAL, transaction_type TEXT,
+                   description TEXT, transaction_date TEXT, fingerprint TEXT, occurrence INTEGER,
+                   duplicate INTEGER
+               )"""
+        )
+        self.conn.execute("DELETE FROM temp.import_staging")
+        self.conn.executemany("INSERT INTO temp.import_staging VALUES (?, ?, ?, ?, ?, ?, ?, ?, 0)", staged)
+
+        # The earlier copies of a fingerprint this import added count towards the stored
+        # total, which keeps the comparison exact when an import spans several calls
+        self.conn.execute(
+            """UPDATE temp.import_staging
+               SET duplicate = occurrence < (SELECT COUNT(*) FROM transactions t
+                                             WHERE t.fingerprint = import_staging.fingerprint)"""
+        )
+        self.conn.execute(
+            """INSERT INTO transactions
+               (account_id, category_id, amount, transaction_type, description, transaction_date,
+                fingerprint)
+               SELECT account_id, category_id, amount, transaction_type, description,
+                      transaction_date, fingerprint
+               FROM temp.import_staging
+               WHERE NOT duplicate
+               ORDER BY rowid"""
+        )
+        skipped = [row[0] for row in
+                   self.conn.execute("SELECT fingerprint FROM temp.import_staging WHERE duplicate")]
+        self.conn.execute("DELETE FROM temp.import_staging")
+        return skipped
 
     def update_transaction(self, transaction_id: int, account_id: int, category_id: int,
                           amount: float, transaction_type: str, description: str, transaction_date: str):
         """Update transaction details"""
         try:
-            # Get old transaction to update old account balance
-            old_transaction = self.get_transaction(transaction_id)
-            old_account_id = old_transaction['account_id'] if old_transaction else None
-
             self.conn.execute(
                 """UPDATE transactions
                    SET account_id = ?, category_id = ?, amount = ?, transaction_type = ?,
-                       description = ?, transaction_date = ?
+                       description = ?, transaction_date = ?, fingerprint = ?
                    WHERE id = ?""",
-                (account_id, category_id, amount, transaction_type, description, transaction_date, transaction_id)
+                (account_id, category_id, amount, transaction_type, description, transaction_date,
+                 self.transaction_fingerprint(account_id, transaction_date, amount, description),
+                 transaction_id)
             )
-            self.conn.commit()
-
-            # Recalculate balances for both old and new accounts
-            if old_account_id and old_account_id != account_id:
-                self.recalculate_account_balance(old_account_id)
-            self.recalculate_account_balance(account_id)
-
+            self._commit()
         except sqlite3.Error as e:
             raise Exception(f"Error updating transaction: {e}")
 
     def delete_transaction(self, transaction_id: int):
         """Delete a transaction"""
         try:
-            # Get account_id before deleting
-            transaction = self.get_transaction(transaction_id)
-            account_id = transaction['account_id'] if transaction else None
-
             self.conn.execute("DELETE FROM transactions WHERE id = ?", (transaction_id,))
-            self.conn.commit()
-
-            # Recalculate account balance
-            if account_id:
-                self.recalculate_account_balance(account_id)
-
+            self._commit()
         except sqlite3.Error as e:
             raise Exception(f"Error deleting transaction: {e}")
 
@@ -269,13 +591,18 @@ class DatabaseManager:
         row = cursor.fetchone()
         return dict(row) if row else None
 
+    # Transaction listings join with CROSS JOIN, which SQLite never reorders: with
+    # transactions as the outer loop, rows come straight out of a date index. Given
+    # statistics for a single account the planner would otherwise loop over accounts
+    # first and sort every transaction in a temp B-tree.
+
     def get_all_transactions(self, limit: int = None) -> List[Dict]:
         """Get all transactions"""
         query = """SELECT t.*, a.name as account_name, c.name as category_name
                    FROM transactions t
-                   JOIN accounts a ON t.account_id = a.id
-                   JOIN categories c ON t.category_id = c.id
-                   ORDER BY t.transaction_date DESC, t.created_at DESC"""
+                   CROSS JOIN accounts a ON t.account_id = a.id
+                   CROSS JOIN categories c ON t.category_id = c.id
+                   ORDER BY t.transaction_date DESC, t.id DESC"""
 
         if limit:
             query += f" LIMIT {limit}"
@@ -283,13 +610,44 @@ class DatabaseManager:
         cursor = self.conn.execute(query)
         return [dict(row) for row in cursor.fetchall()]
 
+    def iter_transactions(self, filters: Optional[Dict] = None, batch_size: int = 1000) -> Iterator[Dict]:
+        """
+        Stream transactions (newest first) without materializing the whole result
+
+        Args:
+            filters: Same keys as get_transactions_page
+            batch_size: Rows pulled from the cursor per fetchmany call
+
+        Yields:
+            One transaction dict at a time
+        """
+        where_sql, params = self._build_transaction_filters(filters)
+        cursor = self.conn.execute(
+            f"""SELECT t.*, a.name as account_name, c.name as category_name
+                FROM transactions t
+                CROSS JOIN accounts a ON t.account_id = a.id
+                CROSS JOIN categories c ON t.category_id = c.id
+                {where_sql}
+                ORDER BY {self._order_by_sql('date_desc')}""",
+            params
+        )
+        try:
+            while True:
+                rows = cursor.fetchmany(batch_size)
+                if not rows:
+                    break
+                for row in rows:
+                    yield dict(row)
+        finally:
+            cursor.close()
+
     def get_transactions_by_date_range(self, start_date: str, end_date: str) -> List[Dict]:
         """Get transactions within a date range"""
         cursor = self.conn.execute(
             """SELECT t.*, a.name as account_name, c.name as category_name
                FROM transactions t
-               JOIN accounts a ON t.account_id = a.id
-               JOIN categories c ON t.category_id = c.id
+               CROSS JOIN accounts a ON t.account_id = a.id
+               CROSS JOIN categories c ON t.category_id = c.id
                WHERE t.transaction_date BETWEEN ? AND ?
                ORDER BY t.transaction_date DESC""",
             (start_date, end_date)
@@ -301,8 +659,8 @@ class DatabaseManager:
         cursor = self.conn.execute(
             """SELECT t.*, a.name as account_name, c.name as category_name
                FROM transactions t
-               JOIN accounts a ON t.account_id = a.id
-               JOIN categories c ON t.category_id = c.id
+               CROSS JOIN accounts a ON t.account_id = a.id
+               CROSS JOIN categories c ON t.category_id = c.id
                WHERE t.account_id = ?
                ORDER BY t.transaction_date DESC""",
             (account_id,)
@@ -314,14 +672,208 @@ class DatabaseManager:
         cursor = self.conn.execute(
             """SELECT t.*, a.name as account_name, c.name as category_name
                FROM transactions t
-               JOIN accounts a ON t.account_id = a.id
-               JOIN categories c ON t.category_id = c.id
+               CROSS JOIN accounts a ON t.account_id = a.id
+               CROSS JOIN categories c ON t.category_id = c.id
                WHERE t.category_id = ?
                ORDER BY t.transaction_date DESC""",
             (category_id,)
         )
         return [dict(row) for row in cursor.fetchall()]
 
+    # Sort orders accepted by get_transactions_page as (key columns, direction), mapped to
+    # fixed SQL and never interpolated from input. Every key ends in id, so it is unique
+    # and a page can continue after a given row.
+    TRANSACTION_ORDERS = {
+        'date_desc': (('transaction_date', 'id'), 'DESC'),
+        'date_asc': (('transaction_date', 'id'), 'ASC'),
+        'amount_desc': (('amount', 'id'), 'DESC'),
+        'amount_asc': (('amount', 'id'), 'ASC'),
+    }
+
+    def _order_by_sql(self, order: str) -> str:
+        """ORDER BY terms for a TRANSACTION_ORDERS entry"""
+        columns, direction = self.TRANSACTION_ORDERS[order]
+        return ', '.join(f"t.{column} {direction}" for column in columns)
+
+    def _build_transaction_filters(self, filters: Optional[Dict]) -> Tuple[str, list]:
+        """Translate a filters dict into a WHERE clause and its parameters"""
+        filters = filters or {}
+        clauses = []
+        params = []
+
+        if filters.get('start_date'):
+            clauses.append("t.transaction_date >= ?")
+            params.append(filters['start_date'])
+        if filters.get('end_date'):
+            clauses.append("t.transaction_date <= ?")
+            params.append(filters['end_date'])
+        if filters.get('account_id') is not None:
+            clauses.append("t.account_id = ?")
+            params.append(filters['account_id'])
+        if filters.get('category_id') is not None:
+            clauses.append("t.category_id = ?")
+            params.append(filters['category_id'])
+        if filters.get('transaction_type'):
+            clauses.append("t.transaction_type = ?")
+            params.append(filters['transaction_type'])
+
+        where_sql = f"WHERE {' AND '.join(clauses)}" if clauses else ""
+        return where_sql, params
+
+    def get_transaction_totals(self, filters: Optional[Dict] = None) -> Dict:
+        """Get count, income and expense totals over every transaction matching filters"""
+        where_sql, params = self._build_transaction_filters(filters)
+
+        cursor = self.conn.execute(
+            f"""SELECT COUNT(*) as count,
+                       SUM(CASE WHEN t.transaction_type = 'income' THEN t.amount ELSE 0 END) as income,
+                       SUM(CASE WHEN t.transaction_type = 'expense' THEN t.amount ELSE 0 END) as expense
+                FROM transactions t
+                {where_sql}""",
+            params
+        )
+        totals = cursor.fetchone()
+
+        return {
+            'count': totals['count'],
+            'income': totals['income'] or 0,
+            'expense': totals['expense'] or 0
+        }
+
+    def get_transactions_page(self, filters: Optional[Dict] = None, offset: int = 0,
+                              limit: Optional[int] = None, order: str = 'date_desc',
+                              after: Optional[Dict] = None) -> List[Dict]:
+        """
+        Get one page of transactions matching filters
+
+        Args:
+            filters: Optional keys start_date, end_date (inclusive), account_id,
+                     category_id and transaction_type
+            offset: Number of matching rows to skip
+            limit: Maximum number of rows to return (None for all)
+            order: One of TRANSACTION_ORDERS
+            after: The last transaction of the previous page; the page starts right
+                   after it by seeking on the order's key, so reading page N costs the
+                   same as page 1 instead of stepping over every earlier row
+        """
+        if order not in self.TRANSACTION_ORDERS:
+            raise ValueError(f"Unknown transaction order: {order}")
+
+        where_sql, params = self._build_transaction_filters(filters)
+        if after is not None:
+            columns, direction = self.TRANSACTION_ORDERS[order]
+            keyset = (f"({', '.join(f't.{column}' for column in columns)}) "
+                      f"{'<' if direction == 'DESC' else '>'} ({', '.join('?' * len(columns))})")
+            where_sql = f"{where_sql} AND {keyset}" if where_sql else f"WHERE {keyset}"
+            params += [after[column] for column in columns]
+
+        cursor = self.conn.execute(
+            f"""SELECT t.*, a.name as account_name, c.name as category_name
+                FROM transactions t
+                CROSS JOIN accounts a ON t.account_id = a.id
+                CROSS JOIN categories c ON t.category_id = c.id
+                {where_sql}
+                ORDER BY {self._order_by_sql(order)}
+                LIMIT ? OFFSET ?""",
+            params + [limit if limit is not None else -1, offset]
+        )
+        return [dict(row) for row in cursor.fetchall()]
+
+    # ==================== IMPORT JOBS ====================
+
+    def create_import_job(self, file_hash: str, filename: str, account_id: int,
+                          column_mapping: Dict[str, int]) -> int:
+        """Record the start of a chunked import"""
+        try:
+            cursor = self.conn.execute(
+                """INSERT INTO import_jobs
+                   (file_hash, filename, account_id, column_mapping, last_transaction_id)
+                   VALUES (?, ?, ?, ?, (SELECT COALESCE(MAX(id), 0) FROM transactions))""",
+                (file_hash, filename, account_id, json.dumps(column_mapping, sort_keys=True))
+            )
+            self._commit()
+            return cursor.lastrowid
+        except sqlite3.Error as e:
+            raise Exception(f"Error creating import job: {e}")
+
+    def get_import_job(self, job_id: int) -> Optional[Dict]:
+        """Get a single import job by ID"""
+        cursor = self.conn.execute("SELECT * FROM import_jobs WHERE id = ?", (job_id,))
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    def get_unfinished_import_job(self, file_hash: str, account_id: int,
+                                  column_mapping: Dict[str, int]) -> Optional[Dict]:
+        """Find an interrupted import of the same file into the same account with the same mapping"""
+        cursor = self.conn.execute(
+            """SELECT * FROM import_jobs
+               WHERE file_hash = ? AND account_id = ? AND status = 'running' AND column_mapping = ?
+               ORDER BY id DESC LIMIT 1""",
+            (file_hash, account_id, json.dumps(column_mapping, sort_keys=True))
+        )
+        row = cursor.fetchone()
+        return dict(row) if row else None
+
+    def checkpoint_import_job(self, job_id: int, byte_offset: int, row_num: int,
+                              inserted: int, skipped: int, error_count: int,
+                              skipped_fingerprints: List[str] = ()):
+        """
+        Record how far an import has got
+
+        Call inside the batch() block that inserts the chunk, so the rows and the
+        checkpoint are committed together.
+
+        Args:
+            skipped_fingerprints: Fingerprints of the rows the chunk skipped as duplicates
+        """
+        try:
+            self.conn.executemany(
+                """INSERT INTO import_job_skips (job_id, fingerprint, count) VALUES (?, ?, 1)
+                   ON CONFLICT (job_id, fingerprint) DO UPDATE SET count = count + 1""",
+                ((job_id, fingerprint) for fingerprint in skipped_fingerprints)
+            )
+            self.conn.execute(
+                """UPDATE import_jobs
+                   SET byte_offset = ?, row_num = ?, inserted = ?, skipped = ?, error_count = ?,
+                       updated_at = CURRENT_TIMESTAMP
+                   WHERE id = ?""",
+                (byte_offset, row_num, inserted, skipped, error_count, job_id)
+            )
+            self._commit()
+        except sqlite3.Error as e:
+            raise Exception(f"Error updating import job: {e}")
+
+    def complete_import_job(self, job_id: int):
+        """Mark an import as finished so it is no longer resumed"""
+        try:
+            self.conn.execute(
+                "UPDATE import_jobs SET status = 'completed', updated_at = CURRENT_TIMESTAMP WHERE id = ?",
+                (job_id,)
+            )
+            self.conn.execute("DELETE FROM import_job_skips WHERE job_id = ?", (job_id,))
+            self._commit()
+        except sqlite3.Error as e:
+            raise Exception(f"Error completing import job: {e}")
+
+    def get_import_job_fingerprint_counts(self, job: Dict) -> Dict[str, int]:
+        """
+        How often an import job has read each fingerprint so far
+
+        This is the seen dict for add_transactions_bulk when the job resumes: the
+        rows the job inserted (those newer than last_transaction_id) plus the rows
+        it skipped as duplicates.
+        """
+        # Counted here rather than with GROUP BY, which would sort the job's rows
+        # by fingerprint in a temp B-tree
+        counts = Counter(row[0] for row in self.conn.execute(
+            "SELECT fingerprint FROM transactions WHERE id > ? AND account_id = ?",
+            (job['last_transaction_id'], job['account_id'])
+        ))
+        for fingerprint, count in self.conn.execute(
+                "SELECT fingerprint, count FROM import_job_skips WHERE job_id = ?", (job['id'],)):
+            counts[fingerprint] += count
+        return dict(counts)
+
     # ==================== REPORTING & ANALYTICS ====================
 
     def get_cash_on_hand(self) -> float:
@@ -346,26 +898,17 @@ class DatabaseManager:
 
     def get_monthly_summary(self, year: int, month: int) -> Dict:
         """Get income/expense summary for a specific month"""
-        start_date = f"{year}-{month:02d}-01"
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
-
         cursor = self.conn.execute(
             """SELECT
-                transaction_type,
-                SUM(amount) as total
-               FROM transactions
-               WHERE transaction_date >= ? AND transaction_date < ?
-               GROUP BY transaction_type""",
-            (start_date, end_date)
+                SUM(CASE WHEN type = 'income' THEN total ELSE 0 END) as income,
+                SUM(CASE WHEN type = 'expense' THEN total ELSE 0 END) as expense
+               FROM monthly_rollups
+               WHERE year_month = ?""",
+            (f"{year}-{month:02d}",)
         )
+        row = cursor.fetchone()
 
-        summary = {'income': 0, 'expense': 0}
-        for row in cursor.fetchall():
-            summary[row['transaction_type']] = row['total']
-
+        summary = {'income': row['income'] or 0, 'expense': row['expense'] or 0}
         summary['net'] = summary['income'] - summary['expense']
         return summary
 
@@ -373,46 +916,74 @@ class DatabaseManager:
         """Get income/expense summary for a specific year"""
         cursor = self.conn.execute(
             """SELECT
-                transaction_type,
-                SUM(amount) as total
-               FROM transactions
-               WHERE strftime('%Y', transaction_date) = ?
-               GROUP BY transaction_type""",
-            (str(year),)
+                SUM(CASE WHEN type = 'income' THEN total ELSE 0 END) as income,
+                SUM(CASE WHEN type = 'expense' THEN total ELSE 0 END) as expense
+               FROM monthly_rollups
+               WHERE year_month BETWEEN ? AND ?""",
+            (f"{year}-01", f"{year}-12")
         )
+        row = cursor.fetchone()
 
-        summary = {'income': 0, 'expense': 0}
-        for row in cursor.fetchall():
-            summary[row['transaction_type']] = row['total']
-
+        summary = {'income': row['income'] or 0, 'expense': row['expense'] or 0}
         summary['net'] = summary['income'] - summary['expense']
         return summary
 
     def get_category_breakdown(self, start_date: str, end_date: str, transaction_type: str) -> List[Dict]:
         """Get spending/income breakdown by category for date range"""
+        # One index range per category instead of sorting every matching row by category
         cursor = self.conn.execute(
-            """SELECT c.name, SUM(t.amount) as total
-               FROM transactions t
-               JOIN categories c ON t.category_id = c.id
-               WHERE t.transaction_date BETWEEN ? AND ?
-                 AND t.transaction_type = ?
-               GROUP BY c.id, c.name
+            """SELECT c.name,
+                      (SELECT SUM(t.amount)
+                       FROM transactions t
+                       WHERE t.category_id = c.id
+                         AND t.transaction_type = ?
+                         AND t.transaction_date BETWEEN ? AND ?) as total
+               FROM categories c
                ORDER BY total DESC""",
-            (start_date, end_date, transaction_type)
+            (transaction_type, start_date, end_date)
+        )
+        return [dict(row) for row in cursor.fetchall() if row['total'] is not None]
+
+    def get_monthly_category_breakdown(self, year: int, month: int, transaction_type: str) -> List[Dict]:
+        """Get spending/income breakdown by category for a calendar month"""
+        cursor = self.conn.execute(
+            """SELECT c.name, r.total
+               FROM (SELECT category_id, SUM(total) as total
+                     FROM monthly_rollups
+                     WHERE year_month = ? AND type = ?
+                     GROUP BY category_id) r
+               JOIN categories c ON r.category_id = c.id
+               ORDER BY r.total DESC""",
+            (f"{year}-{month:02d}", transaction_type)
         )
         return [dict(row) for row in cursor.fetchall()]
 
     def get_monthly_trend(self, months: int = 12) -> List[Dict]:
-        """Get monthly income/expense trend for the last N months"""
+        """Get monthly income/expense trend for the last N calendar months (including this one)"""
         cursor = self.conn.execute(
             """SELECT
-                strftime('%Y-%m', transaction_date) as month,
-                transaction_type,
-                SUM(amount) as total
-               FROM transactions
-               WHERE transaction_date >= date('now', '-' || ? || ' months')
-               GROUP BY month, transaction_type
+                year_month as month,
+                type as transaction_type,
+                SUM(total) as total
+               FROM monthly_rollups
+               WHERE year_month >= strftime('%Y-%m', date('now', 'start of month', '-' || ? || ' months'))
+               GROUP BY year_month, type
                ORDER BY month DESC""",
-            (months,)
+            (months - 1,)
         )
         return [dict(row) for row in cursor.fetchall()]
+
+    def rebuild_monthly_rollups(self):
+        """Rebuild the monthly_rollups table from scratch out of raw transactions"""
+        try:
+            with self.batch():
+                self.conn.execute("DELETE FROM monthly_rollups")
+                self.conn.execute(
+                    """INSERT INTO monthly_rollups (account_id, category_id, year_month, type, total, count)
+                       SELECT account_id, category_id, substr(transaction_date, 1, 7), transaction_type,
+                              SUM(amount), COUNT(*)
+                       FROM transactions
+                       GROUP BY account_id, category_id, substr(transaction_date, 1, 7), transaction_type"""
+                )
+        except sqlite3.Error as e:
+            raise Exception(f"Error rebuilding monthly rollups: {e}")
@@ -0,0 +1,141 @@
+"""
+Schema Migrations for Personal Finance Tracker
+
+schema.sql creates the base tables. Each entry below is applied once, in order,
+on top of it; PRAGMA user_version records how many have run.
+"""
+
+MIGRATIONS = [
+    # 1: Composite indexes matching the query shapes in DatabaseManager. Listings
+    #    sort by (transaction_date, id) and every index ends in the rowid SQLite
+    #    appends anyway, so pages come back in index order and keyset pages seek
+    #    straight to their start without a temp B-tree sort.
+    """
+    DROP INDEX IF EXISTS idx_transactions_account;
+    DROP INDEX IF EXISTS idx_transactions_category;
+
+    -- Date-ordered listings and date-range filters (kept as the original schema wrote it)
+    CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date);
+    -- Covering index for date-range totals (count, income, expense)
+    CREATE INDEX IF NOT EXISTS idx_transactions_date_type_amount
+        ON transactions(transaction_date, transaction_type, amount);
+    -- Per-account history sorted by date (also serves the accounts foreign key)
+    CREATE INDEX IF NOT EXISTS idx_transactions_account_date
+        ON transactions(account_id, transaction_date);
+    -- Per-category history sorted by date (also serves the categories foreign key)
+    CREATE INDEX IF NOT EXISTS idx_transactions_category_date
+        ON transactions(category_id, transaction_date);
+    -- Covering index for per-account balance sums
+    CREATE INDEX IF NOT EXISTS idx_transactions_account_type_amount
+        ON transactions(account_id, transaction_type, amount);
+    """,
+
+    # 2: Monthly totals per account, category and type, kept current by triggers so
+    #    reports read one row per group and month instead of every transaction
+    """
+    CREATE TABLE IF NOT EXISTS monthly_rollups (
+        account_id INTEGER NOT NULL,
+        category_id INTEGER NOT NULL,
+        year_month TEXT NOT NULL,
+        type TEXT NOT NULL CHECK(type IN ('income', 'expense')),
+        total REAL NOT NULL DEFAULT 0,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (year_month, type, category_id, account_id),
+        FOREIGN KEY (account_id) REFERENCES accounts(id) ON DELETE CASCADE,
+        FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE CASCADE
+    ) WITHOUT ROWID;
+
+    INSERT INTO monthly_rollups (account_id, category_id, year_month, type, total, count)
+    SELECT account_id, category_id, substr(transaction_date, 1, 7), transaction_type, SUM(amount), COUNT(*)
+    FROM transactions
+    GROUP BY account_id, category_id, substr(transaction_date, 1, 7), transaction_type;
+
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_insert
+    AFTER INSERT ON transactions
+    BEGIN
+        INSERT INTO monthly_rollups (account_id, category_id, year_month, type, total, count)
+        VALUES (NEW.account_id, NEW.category_id, substr(NEW.transaction_date, 1, 7),
+                NEW.transaction_type, NEW.amount, 1)
+        ON CONFLICT (year_month, type, category_id, account_id)
+        DO UPDATE SET total = total + excluded.total, count = count + 1;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_delete
+    AFTER DELETE ON transactions
+    BEGIN
+        UPDATE monthly_rollups
+        SET total = total - OLD.amount, count = count - 1
+        WHERE year_month = substr(OLD.transaction_date, 1, 7) AND type = OLD.transaction_type
+          AND category_id = OLD.category_id AND account_id = OLD.account_id;
+        DELETE FROM monthly_rollups
+        WHERE year_month = substr(OLD.transaction_date, 1, 7) AND type = OLD.transaction_type
+          AND category_id = OLD.category_id AND account_id = OLD.account_id AND count <= 0;
+    END;
+
+    CREATE TRIGGER IF NOT EXISTS trg_transactions_rollup_update
+    AFTER UPDATE OF account_id, category_id, amount, transaction_type, transaction_date ON transactions
+    BEGIN
+        UPDATE monthly_rollups
+        SET total = total - OLD.amount, count = count - 1
+        WHERE year_month = substr(OLD.transaction_date, 1, 7) AND type = OLD.transaction_type
+          AND category_id = OLD.category_id AND account_id = OLD.account_id;
+        DELETE FROM monthly_rollups
+        WHERE year_month = substr(OLD.transaction_date, 1, 7) AND type = OLD.transaction_type
+          AND category_id = OLD.category_id AND account_id = OLD.account_id AND count <= 0;
+        INSERT INTO monthly_rollups (account_id, category_id, year_month, type, total, count)
+        VALUES (NEW.account_id, NEW.category_id, substr(NEW.transaction_date, 1, 7),
+                NEW.transaction_type, NEW.amount, 1)
+        ON CONFLICT (year_month, type, category_id, account_id)
+        DO UPDATE SET total = total + excluded.total, count = count + 1;
+    END;
+    """,
+
+    # 3: Dedup fingerprint so re-imported statements can skip rows already stored.
+    #    transaction_fingerprint() is the Python function DatabaseManager registers on
+    #    every connection; the application fills the column on insert and update.
+    """
+    ALTER TABLE transactions ADD COLUMN fingerprint TEXT;
+
+    UPDATE transactions
+    SET fingerprint = transaction_fingerprint(account_id, transaction_date, amount, description);
+
+    CREATE INDEX IF NOT EXISTS idx_transactions_fingerprint ON transactions(fingerprint);
+    """,
+
+    # 4: Checkpoint journal for chunked CSV imports. Each chunk of rows commits together
+    #    with its job's byte offset and row number, so an interrupted import resumes
+    #    after the last committed chunk.
+    """
+    CREATE TABLE IF NOT EXISTS import_jobs (
+        id INTEGER PRIMARY KEY AUTOINCREMENT,
+        file_hash TEXT NOT NULL,
+        filename TEXT NOT NULL,
+        account_id INTEGER NOT NULL,
+        column_mapping TEXT NOT NULL,
+        status TEXT NOT NULL DEFAULT 'running' CHECK(status IN ('running', 'completed')),
+        byte_offset INTEGER NOT NULL DEFAULT 0,  -- End of the last committed row
+        row_num INTEGER NOT NULL DEFAULT 0,      -- File row number at byte_offset
+        inserted INTEGER NOT NULL DEFAULT 0,
+        skipped INTEGER NOT NULL DEFAULT 0,
+        error_count INTEGER NOT NULL DEFAULT 0,
+        last_transaction_id INTEGER NOT NULL DEFAULT 0,  -- Newest transaction before the job
+        started_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        updated_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+        FOREIGN KEY (account_id) REFERENCES accounts(id) ON DELETE CASCADE
+    );
+
+    CREATE INDEX IF NOT EXISTS idx_import_jobs_file
+        ON import_jobs(file_hash, account_id, status);
+
+    -- Fingerprints a job skipped as duplicates, so duplicate detection resumes exactly
+    CREATE TABLE IF NOT EXISTS import_job_skips (
+        job_id INTEGER NOT NULL,
+        fingerprint TEXT NOT NULL,
+        count INTEGER NOT NULL DEFAULT 0,
+        PRIMARY KEY (job_id, fingerprint),
+        FOREIGN KEY (job_id) REFERENCES import_jobs(id) ON DELETE CASCADE
+    ) WITHOUT ROWID;
+    """,
+]
+
+SCHEMA_VERSION = len(MIGRATIONS)
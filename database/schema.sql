@@ -33,12 +33,41 @@ CREATE TABLE IF NOT EXISTS transactions (
     FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE RESTRICT
 );
 
--- Indexes for better query performance
-CREATE INDEX IF NOT EXISTS idx_transactions_date ON transactions(transaction_date);
-CREATE INDEX IF NOT EXISTS idx_transactions_account ON transactions(account_id);
-CREATE INDEX IF NOT EXISTS idx_transactions_category ON transactions(category_id);
+-- Indexes for better query performance (transaction indexes live in migrations.py)
 CREATE INDEX IF NOT EXISTS idx_accounts_type ON accounts(account_type);
 
+-- Keep account balances current with O(1) deltas as transactions change
+CREATE TRIGGER IF NOT EXISTS trg_transactions_balance_insert
+AFTER INSERT ON transactions
+BEGIN
+    UPDATE accounts
+    SET current_balance = current_balance +
+        CASE WHEN NEW.transaction_type = 'income' THEN NEW.amount ELSE -NEW.amount END
+    WHERE id = NEW.account_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_transactions_balance_delete
+AFTER DELETE ON transactions
+BEGIN
+    UPDATE accounts
+    SET current_balance = current_balance -
+        CASE WHEN OLD.transaction_type = 'income' THEN OLD.amount ELSE -OLD.amount END
+    WHERE id = OLD.account_id;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_transactions_balance_update
+AFTER UPDATE OF account_id, amount, transaction_type ON transactions
+BEGIN
+    UPDATE accounts
+    SET current_balance = current_balance -
+        CASE WHEN OLD.transaction_type = 'income' THEN OLD.amount ELSE -OLD.amount END
+    WHERE id = OLD.account_id;
+    UPDATE accounts
+    SET current_balance = current_balance +
+        CASE WHEN NEW.transaction_type = 'income' THEN NEW.amount ELSE -NEW.amount END
+    WHERE id = NEW.account_id;
+END;
+
 -- Insert default categories
 INSERT OR IGNORE INTO categories (name, type, description) VALUES
     ('Salary', 'income', 'Monthly salary and wages'),
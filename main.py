@@ -2,14 +2,22 @@
 Personal Finance Tracker - Main Entry Point
 """
 
+import time
+STARTED = time.perf_counter()
+
+import multiprocessing
 import sys
 from PyQt5.QtWidgets import QApplication
 from PyQt5.QtCore import Qt
 from database.db_manager import DatabaseManager
 from ui.main_window import MainWindow
+from utils.startup_timer import StartupTimer
 
 def main():
     """Main application entry point"""
+    startup_timer = StartupTimer(STARTED)
+    startup_timer.mark('imports')
+
     # Enable High DPI scaling
     QApplication.setAttribute(Qt.AA_EnableHighDpiScaling, True)
     QApplication.setAttribute(Qt.AA_UseHighDpiPixmaps, True)
@@ -20,13 +28,15 @@ def main():
 
     # Set application style
     app.setStyle('Fusion')
+    startup_timer.mark('Qt')
 
     try:
         # Initialize database
         db_manager = DatabaseManager()
+        startup_timer.mark('database')
 
-        # Create and show main window
-        window = MainWindow(db_manager)
+        # Create and show main window; it logs the remaining phases after its first paint
+        window = MainWindow(db_manager, startup_timer)
         window.show()
 
         # Run application
@@ -38,4 +48,8 @@ def main():
 
 
 if __name__ == '__main__':
+    # Import and backup verification workers are spawned by re-running this
+    # executable; in the frozen build this turns them into workers instead of
+    # starting another copy of the application
+    multiprocessing.freeze_support()
     main()
@@ -0,0 +1,71 @@
+"""
+Backup catalog - listings stay in step with the backup folder
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest import mock
+
+from database.db_manager import DatabaseManager
+from utils.backup import BackupManager
+from utils.backup_catalog import BackupCatalog
+
+
+class BackupCatalogTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db_path = os.path.join(directory.name, 'finance.db')
+        self.backup_dir = os.path.join(directory.name, 'backups')
+
+        db = DatabaseManager(self.db_path)
+        db.add_account('Checking', 'debit', 25)
+        db.close()
+        self.snapshot = BackupManager.create_backup(self.db_path, self.backup_dir)
+
+    def listed(self, refresh=False):
+        return sorted(backup['filename'] for backup in BackupManager.list_backups(self.backup_dir, refresh))
+
+    def test_new_snapshot_is_cataloged(self):
+        self.assertTrue(BackupCatalog(self.backup_dir).is_current())
+        self.assertEqual(self.listed(), [os.path.basename(self.snapshot)])
+
+    def test_legacy_file_added_or_removed_by_hand(self):
+        # The root folder is not listed on every check; a refresh picks the change up
+        legacy = os.path.join(self.backup_dir, 'finance_backup_20240101_120000.db')
+        shutil.copy2(self.db_path, legacy)
+        self.assertTrue(BackupCatalog(self.backup_dir).is_current())
+        self.assertEqual(self.listed(), [os.path.basename(self.snapshot)])
+        self.assertEqual(self.listed(refresh=True),
+                         sorted([os.path.basename(self.snapshot), os.path.basename(legacy)]))
+
+        entry = BackupCatalog(self.backup_dir).get(legacy)
+        self.assertEqual(entry['kind'], 'file')
+        self.assertEqual(entry['sha256'], BackupManager.file_sha256(legacy))
+
+        os.remove(legacy)
+        self.assertEqual(self.listed(refresh=True), [os.path.basename(self.snapshot)])
+
+    def test_check_does_not_list_the_backup_folder(self):
+        catalog = BackupCatalog(self.backup_dir)
+        with mock.patch('os.listdir', side_effect=AssertionError("listed the folder")), \
+                mock.patch('os.scandir', side_effect=AssertionError("listed the folder")):
+            self.assertTrue(catalog.is_current())
+            self.assertEqual(self.listed(), [os.path.basename(self.snapshot)])
+
+    def test_other_files_in_root_do_not_invalidate(self):
+        with open(os.path.join(self.backup_dir, 'notes.txt'), 'w') as f:
+            f.write('kept next to the backups')
+        self.assertTrue(BackupCatalog(self.backup_dir).is_current())
+
+    def test_snapshot_manifest_removed_by_hand(self):
+        second = BackupManager.create_backup(self.db_path, self.backup_dir)
+        os.remove(second)
+        self.assertFalse(BackupCatalog(self.backup_dir).is_current())
+        self.assertEqual(self.listed(), [os.path.basename(self.snapshot)])
+
+
+if __name__ == '__main__':
+    unittest.main()
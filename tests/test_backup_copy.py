@@ -0,0 +1,79 @@
+"""
+Online database copies - SQLite's backup API instead of copying the file
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+from utils.backup import BackupManager
+
+
+class CopyDatabaseTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.db_path = os.path.join(self.directory, 'finance.db')
+        self.copy_path = os.path.join(self.directory, 'copy.db')
+
+        # Closing checkpoints the WAL, so the writer stays open for the whole test
+        self.db = DatabaseManager(self.db_path)
+        self.addCleanup(self.db.close)
+        self.account_id = self.db.add_account('Checking', 'debit', 0)
+        self.db.add_transactions_bulk(self.rows(2000))
+
+    def rows(self, count, start=0):
+        return [(self.account_id, 5, 1.0 + i, 'expense', f"Row {i} " + 'x' * 100, '2024-01-01')
+                for i in range(start, start + count)]
+
+    def count_rows(self, path):
+        conn = sqlite3.connect(path)
+        try:
+            self.assertEqual(conn.execute("PRAGMA integrity_check").fetchone()[0], 'ok')
+            return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_copy_includes_wal_content(self):
+        self.assertGreater(os.path.getsize(self.db_path + '-wal'), 0)
+
+        self.assertTrue(BackupManager.copy_database(self.db_path, self.copy_path))
+
+        self.assertEqual(self.count_rows(self.copy_path), 2000)
+        self.assertFalse(os.path.exists(self.copy_path + '-wal'))
+        self.assertFalse(os.path.exists(self.copy_path + '.partial'))
+        conn = sqlite3.connect(self.copy_path)
+        self.addCleanup(conn.close)
+        self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], 'delete')
+
+    def test_copy_is_the_snapshot_at_its_start(self):
+        steps = []
+
+        def write_during_copy(done, total):
+            if not steps:
+                # Under WAL the writer commits while the copy is in progress
+                self.db.add_transactions_bulk(self.rows(100, start=2000))
+            steps.append((done, total))
+
+        self.assertTrue(BackupManager.copy_database(self.db_path, self.copy_path, pages=8,
+                                                    progress_callback=write_during_copy))
+
+        self.assertGreater(len(steps), 1)
+        self.assertEqual(steps[-1][0], steps[-1][1])
+        self.assertEqual(self.count_rows(self.copy_path), 2000)
+        self.assertEqual(self.db.get_transaction_totals()['count'], 2100)
+
+    def test_cancelled_copy_leaves_nothing(self):
+        result = BackupManager.copy_database(self.db_path, self.copy_path, pages=8,
+                                             progress_callback=lambda done, total: done < 16)
+
+        self.assertFalse(result)
+        self.assertFalse(os.path.exists(self.copy_path))
+        self.assertFalse(os.path.exists(self.copy_path + '.partial'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+"""
+Backup repository - deduplicated snapshots, garbage collection and restore
+"""
+
+import hashlib
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+from utils.backup import BackupManager
+from utils.backup_repository import BackupRepository
+
+
+class BackupRepositoryTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.db_path = os.path.join(self.directory, 'finance.db')
+        self.backup_dir = os.path.join(self.directory, 'backups')
+        self.repository = BackupRepository(self.backup_dir)
+
+        self.db = DatabaseManager(self.db_path)
+        self.addCleanup(self.db.close)
+        self.account_id = self.db.add_account('Checking', 'debit', 0)
+        self.add_rows(5000)
+
+    def add_rows(self, count, start=0):
+        self.db.add_transactions_bulk([
+            (self.account_id, 5, 1.0 + i, 'expense', f"Row {i} " + 'x' * 150, '2024-01-01')
+            for i in range(start, start + count)
+        ])
+
+    def stored_chunks(self):
+        return {name for prefix in os.listdir(self.repository.chunks_dir)
+                for name in os.listdir(os.path.join(self.repository.chunks_dir, prefix))}
+
+    def restored_count(self, manifest_path):
+        target = os.path.join(self.directory, 'restored.db')
+        self.repository.restore_snapshot(manifest_path, target)
+        with open(target, 'rb') as f:
+            self.assertEqual(hashlib.sha256(f.read()).hexdigest(),
+                             BackupRepository.load_manifest(manifest_path)['sha256'])
+        conn = sqlite3.connect(target)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+        finally:
+            conn.close()
+            os.remove(target)
+
+    def test_unchanged_pages_are_stored_once(self):
+        first = BackupRepository.load_manifest(BackupManager.create_backup(self.db_path, self.backup_dir))
+        self.assertGreater(len(first['chunks']), 10)
+        self.assertEqual(first['new_chunks'], len(set(first['chunks'])))
+
+        self.db.add_transaction(self.account_id, 5, 3.5, 'expense', 'One more', '2024-02-01')
+        second = BackupRepository.load_manifest(BackupManager.create_backup(self.db_path, self.backup_dir))
+
+        self.assertEqual(len(second['chunks']), len(first['chunks']))
+        self.assertLess(second['new_chunks'], len(second['chunks']) // 4)
+        self.assertLess(second['stored_bytes'], first['stored_bytes'] // 4)
+        self.assertEqual(self.stored_chunks(), set(first['chunks']) | set(second['chunks']))
+
+    def test_restore_and_garbage_collection(self):
+        first = BackupManager.create_backup(self.db_path, self.backup_dir)
+        self.add_rows(3000, start=5000)
+        second = BackupManager.create_backup(self.db_path, self.backup_dir, compression='lzma')
+
+        self.assertEqual(self.restored_count(first), 5000)
+        self.assertEqual(self.restored_count(second), 8000)
+
+        second_chunks = set(BackupRepository.load_manifest(second)['chunks'])
+        only_first = set(BackupRepository.load_manifest(first)['chunks']) - second_chunks
+        self.assertTrue(only_first)
+
+        BackupManager.delete_backup(first)
+
+        self.assertEqual(self.stored_chunks(), second_chunks)
+        self.assertEqual([backup['filepath'] for backup in BackupManager.list_backups(self.backup_dir)], [second])
+        self.assertEqual(self.restored_count(second), 8000)
+
+    def test_corrupt_chunk_fails_restore(self):
+        manifest_path = BackupManager.create_backup(self.db_path, self.backup_dir)
+        digest = BackupRepository.load_manifest(manifest_path)['chunks'][3]
+        chunk_path = self.repository._chunk_path(digest)
+        with open(chunk_path, 'rb') as f:
+            packed = f.read()
+        tag, compress, _ = BackupRepository.COMPRESSORS['zlib']
+        with open(chunk_path, 'wb') as f:
+            f.write(tag + compress(b'\0' * BackupRepository.CHUNK_SIZE))
+
+        target = os.path.join(self.directory, 'restored.db')
+        with self.assertRaises(ValueError):
+            self.repository.restore_snapshot(manifest_path, target)
+        self.assertFalse(os.path.exists(target))
+        self.assertFalse(os.path.exists(target + '.partial'))
+
+        with open(chunk_path, 'wb') as f:
+            f.write(packed)
+        self.assertEqual(self.restored_count(manifest_path), 5000)
+
+    def test_cancelled_snapshot_writes_no_manifest(self):
+        result = BackupManager.create_backup(self.db_path, self.backup_dir,
+                                             progress_callback=lambda done, total: done * 4 < total * 3)
+
+        self.assertIsNone(result)
+        self.assertEqual(self.repository.list_snapshots(), [])
+        self.assertEqual(BackupManager.list_backups(self.backup_dir), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
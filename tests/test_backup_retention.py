@@ -0,0 +1,90 @@
+"""
+Backup retention - pruning snapshots to hourly, daily and weekly buckets
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+from utils.backup import BackupManager
+from utils.backup_repository import BackupRepository
+
+# Snapshot times, newest first; 2024-05-10 is the Friday of ISO week 19
+SNAPSHOTS = {
+    'a': '2024-05-10T12:30:00',  # newest: every bucket
+    'b': '2024-05-10T12:10:00',  # same hour, day and week as a
+    'c': '2024-05-10T11:50:00',  # second hour
+    'd': '2024-05-10T09:00:00',  # third hour
+    'e': '2024-05-10T08:00:00',  # fourth hour
+    'f': '2024-05-09T23:00:00',  # second day
+    'g': '2024-05-09T10:00:00',  # second day, older
+    'h': '2024-05-08T10:00:00',  # third day, still week 19
+    'i': '2024-05-01T10:00:00',  # week 18
+    'j': '2024-04-20T10:00:00',  # week 16
+}
+
+
+class RetentionTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.backup_dir = os.path.join(directory.name, 'backups')
+        db_path = os.path.join(directory.name, 'finance.db')
+        db = DatabaseManager(db_path)
+        db.add_account('Checking', 'debit', 10)
+        db.close()
+
+        # Copies of one real snapshot, backdated so the buckets are known
+        original = BackupManager.create_backup(db_path, self.backup_dir)
+        manifest = BackupRepository.load_manifest(original)
+        del manifest['path']
+        os.remove(original)
+        self.paths = {}
+        for name, created in SNAPSHOTS.items():
+            path = os.path.join(self.backup_dir, 'snapshots', f"finance_backup_{name}.json")
+            with open(path, 'w', encoding='utf-8') as f:
+                json.dump(dict(manifest, created=created), f)
+            self.paths[name] = path
+
+        self.legacy = os.path.join(self.backup_dir, 'finance_backup_20200101_000000.db')
+        shutil.copy2(db_path, self.legacy)
+        BackupManager.rescan_backups(self.backup_dir)
+
+    def remaining(self):
+        return sorted(name for name, path in self.paths.items() if os.path.exists(path))
+
+    def test_keeps_newest_of_each_bucket(self):
+        deleted = BackupManager.apply_retention(self.backup_dir, keep_hourly=3, keep_daily=2, keep_weekly=2)
+
+        self.assertEqual(sorted(deleted), sorted(self.paths[name] for name in 'beghj'))
+        self.assertEqual(self.remaining(), ['a', 'c', 'd', 'f', 'i'])
+        # The single-file backup is dated by its file, so it lists first but is never pruned
+        listed = [backup['filepath'] for backup in BackupManager.list_backups(self.backup_dir)]
+        self.assertEqual(listed, [self.legacy] + [self.paths[name] for name in 'acdfi'])
+
+    def test_pruning_twice_is_stable(self):
+        BackupManager.apply_retention(self.backup_dir, keep_hourly=3, keep_daily=2, keep_weekly=2)
+        self.assertEqual(BackupManager.apply_retention(self.backup_dir, keep_hourly=3, keep_daily=2,
+                                                       keep_weekly=2), [])
+
+    def test_zero_buckets_keep_only_the_newest(self):
+        BackupManager.apply_retention(self.backup_dir, keep_hourly=0, keep_daily=0, keep_weekly=0)
+
+        self.assertEqual(self.remaining(), ['a'])
+        self.assertTrue(os.path.exists(self.legacy))
+        # The survivor still restores after its siblings' chunks were collected
+        manifest = BackupRepository.load_manifest(self.paths['a'])
+        for digest in manifest['chunks']:
+            BackupRepository(self.backup_dir).read_chunk(digest)
+
+    def test_empty_directory(self):
+        empty = os.path.join(os.path.dirname(self.backup_dir), 'empty')
+        os.makedirs(empty)
+        self.assertEqual(BackupManager.apply_retention(empty), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
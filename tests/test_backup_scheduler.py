@@ -0,0 +1,82 @@
+"""
+Backup scheduler - snapshots taken on a worker thread once enough rows change
+"""
+
+import os
+import tempfile
+import time
+import unittest
+
+from PyQt5.QtCore import QCoreApplication, QSettings
+
+from database.db_manager import DatabaseManager
+from ui.backup_scheduler import BackupScheduler
+from utils.backup import BackupManager
+
+
+class BackupSchedulerTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db = DatabaseManager(os.path.join(directory.name, 'finance.db'))
+        self.addCleanup(self.db.close)
+        self.account_id = self.db.add_account('Checking', 'debit', 0)
+
+        settings = QSettings(os.path.join(directory.name, 'settings.ini'), QSettings.IniFormat)
+        settings.setValue('backup/interval_minutes', 0)
+        settings.setValue('backup/write_threshold', 1000)
+        for key in ('keep_hourly', 'keep_daily', 'keep_weekly'):
+            settings.setValue(f"backup/{key}", 0)
+        self.scheduler = BackupScheduler(self.db, settings)
+        self.addCleanup(self.scheduler.shutdown)
+
+        self.results = []
+        self.scheduler.backup_finished.connect(self.results.append)
+        self.scheduler.backup_failed.connect(self.fail)
+
+    def wait_for_results(self, count, timeout=10.0):
+        deadline = time.monotonic() + timeout
+        while len(self.results) < count and time.monotonic() < deadline:
+            QCoreApplication.processEvents()
+            time.sleep(0.01)
+        return len(self.results) >= count
+
+    def add_rows(self, count):
+        self.db.add_transactions_bulk([(self.account_id, 5, 1.0 + i, 'expense', f"Row {i}", '2024-01-01')
+                                       for i in range(count)])
+
+    def test_write_threshold_triggers_snapshot(self):
+        self.add_rows(10)
+        self.scheduler.check()
+        self.assertFalse(self.scheduler.running)
+
+        self.add_rows(1000)
+        self.scheduler.check()
+        self.assertTrue(self.scheduler.running)
+        self.assertTrue(self.wait_for_results(1))
+
+        self.assertFalse(self.scheduler.running)
+        self.assertEqual(self.scheduler.pending_writes(), 0)
+        self.assertTrue(os.path.exists(self.results[0]['path']))
+
+    def test_writes_on_other_connections_count(self):
+        self.scheduler.record_writes(1500)
+        self.assertTrue(self.wait_for_results(1))
+
+        self.add_rows(1200)
+        self.scheduler.check()
+        self.assertTrue(self.wait_for_results(2))
+
+        # With every bucket count at zero, pruning keeps only the newest snapshot
+        self.assertEqual(self.results[1]['pruned'], 1)
+        snapshots = BackupManager.list_backups(self.scheduler.backup_directory())
+        self.assertEqual([backup['filepath'] for backup in snapshots], [self.results[1]['path']])
+        self.assertEqual(snapshots[0]['row_counts']['transactions'], 1200)
+
+
+if __name__ == '__main__':
+    unittest.main()
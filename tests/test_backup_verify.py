@@ -0,0 +1,66 @@
+"""
+Backup verification - every backup in a directory, in a worker pool
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+from unittest import mock
+
+from database.db_manager import DatabaseManager
+from utils.backup import BackupManager
+
+
+class VerifyAllBackupsTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db_path = os.path.join(directory.name, 'finance.db')
+        self.backup_dir = os.path.join(directory.name, 'backups')
+        os.makedirs(self.backup_dir)
+
+        # A single-file backup from before snapshots, damaged on disk
+        self.damaged = os.path.join(self.backup_dir, 'finance_backup_20240101_000000.db')
+        with open(self.damaged, 'wb') as f:
+            f.write(b'SQLite format 3\x00' + b'\xff' * 4096)
+
+        db = DatabaseManager(self.db_path)
+        account_id = db.add_account('Checking', 'debit', 0)
+        for month in (1, 2):
+            db.add_transactions_bulk([(account_id, 5, 10 + i, 'expense', f"Row {i}", f"2024-0{month}-15")
+                                      for i in range(200)])
+            BackupManager.create_backup(self.db_path, self.backup_dir)
+        db.close()
+
+    def check_results(self, results):
+        self.assertEqual(len(results), 3)
+        by_path = {result['path']: result for result in results}
+        self.assertFalse(by_path.pop(self.damaged)['ok'])
+        for result in by_path.values():
+            self.assertTrue(result['ok'], result['problems'])
+        self.assertEqual(sorted(result['row_counts']['transactions'] for result in by_path.values()),
+                         [200, 400])
+
+    def test_frozen_build_verifies_in_threads(self):
+        with mock.patch.object(sys, 'frozen', True, create=True), \
+                mock.patch('utils.backup.ProcessPoolExecutor',
+                           side_effect=AssertionError("spawned a process pool in the frozen build")):
+            results = BackupManager.verify_all_backups(self.backup_dir, workers=2)
+        self.check_results(results)
+
+    def test_progress_callback_can_stop(self):
+        calls = []
+
+        def progress(done, total):
+            calls.append((done, total))
+            return False
+
+        with mock.patch.object(sys, 'frozen', True, create=True):
+            results = BackupManager.verify_all_backups(self.backup_dir, workers=1, progress_callback=progress)
+        self.assertEqual(calls, [(1, 3)])
+        self.assertEqual(len(results), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
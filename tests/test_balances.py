@@ -0,0 +1,75 @@
+"""
+Account balances - kept current by triggers instead of a full re-sum per change
+"""
+
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+
+
+class BalanceTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db = DatabaseManager(os.path.join(directory.name, 'finance.db'))
+        self.addCleanup(self.db.close)
+        self.checking = self.db.add_account('Checking', 'debit', 100)
+        self.card = self.db.add_account('Card', 'credit', 0)
+
+    def balance(self, account_id):
+        return self.db.get_account(account_id)['current_balance']
+
+    def test_each_change_adjusts_the_balance(self):
+        salary = self.db.add_transaction(self.checking, 1, 500, 'income', 'Salary', '2024-04-01')
+        rent = self.db.add_transaction(self.checking, 7, 300, 'expense', 'Rent', '2024-04-02')
+        self.assertAlmostEqual(self.balance(self.checking), 300)
+
+        # Amount and type change together
+        self.db.update_transaction(rent, self.checking, 7, 250, 'expense', 'Rent', '2024-04-02')
+        self.assertAlmostEqual(self.balance(self.checking), 350)
+        self.db.update_transaction(salary, self.checking, 1, 500, 'expense', 'Refund', '2024-04-01')
+        self.assertAlmostEqual(self.balance(self.checking), -650)
+
+        # Moving a transaction to another account adjusts both
+        self.db.update_transaction(rent, self.card, 7, 250, 'expense', 'Rent', '2024-04-02')
+        self.assertAlmostEqual(self.balance(self.checking), -400)
+        self.assertAlmostEqual(self.balance(self.card), -250)
+
+        self.db.delete_transaction(salary)
+        self.assertAlmostEqual(self.balance(self.checking), 100)
+
+        # A new initial balance shifts the current one by the difference
+        self.db.update_account(self.checking, 'Checking', 'debit', 150, 'USD')
+        self.assertAlmostEqual(self.balance(self.checking), 150)
+
+    def test_balances_match_a_full_re_sum(self):
+        self.db.add_transactions_bulk([
+            (self.checking if i % 2 else self.card, 5, 1.1 * i + 1, 'expense' if i % 3 else 'income',
+             f"Row {i}", '2024-04-05')
+            for i in range(300)
+        ])
+        self.assertEqual(self.db.verify_balances(), [])
+
+        expected = self.balance(self.checking)
+        self.db.recalculate_account_balance(self.checking)
+        self.assertAlmostEqual(self.balance(self.checking), expected)
+
+    def test_verify_balances_reports_and_repairs_drift(self):
+        self.db.add_transaction(self.checking, 5, 40, 'expense', 'Groceries', '2024-04-03')
+        self.db.conn.execute("UPDATE accounts SET current_balance = 0 WHERE id = ?", (self.checking,))
+        self.db.conn.commit()
+
+        drifted = self.db.verify_balances()
+        self.assertEqual([account['id'] for account in drifted], [self.checking])
+        self.assertAlmostEqual(drifted[0]['expected_balance'], 60)
+        self.assertAlmostEqual(drifted[0]['drift'], -60)
+
+        self.db.verify_balances(repair=True)
+        self.assertAlmostEqual(self.balance(self.checking), 60)
+        self.assertEqual(self.db.verify_balances(), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
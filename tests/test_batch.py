@@ -0,0 +1,64 @@
+"""
+Batched writes - one commit per batch() block, savepoints for nested blocks
+"""
+
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+
+
+class BatchTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        db_path = os.path.join(directory.name, 'finance.db')
+        self.db = DatabaseManager(db_path)
+        self.addCleanup(self.db.close)
+        # A second connection only sees what has been committed
+        self.reader = DatabaseManager(db_path, initialize=False)
+        self.addCleanup(self.reader.close)
+
+    def committed_accounts(self):
+        return sorted(row['name'] for row in self.reader.get_all_accounts())
+
+    def test_outermost_block_commits_once(self):
+        with self.db.batch():
+            account_id = self.db.add_account('Checking', 'debit', 0)
+            self.db.add_transaction(account_id, 5, 20.0, 'expense', 'Groceries', '2024-01-02')
+            self.assertEqual(self.committed_accounts(), [])
+
+        self.assertEqual(self.committed_accounts(), ['Checking'])
+        self.assertFalse(self.db.conn.in_transaction)
+        self.assertEqual(self.reader.get_all_accounts()[0]['current_balance'], -20.0)
+
+    def test_nested_failure_rolls_back_inner_block_only(self):
+        with self.db.batch():
+            self.db.add_account('Checking', 'debit', 0)
+            with self.assertRaises(RuntimeError):
+                with self.db.batch():
+                    self.db.add_account('Savings', 'debit', 0)
+                    raise RuntimeError('import failed')
+            self.db.add_account('Card', 'credit', 0)
+            self.assertEqual(self.committed_accounts(), [])
+
+        self.assertEqual(self.committed_accounts(), ['Card', 'Checking'])
+        self.assertEqual(self.db.batch_depth, 0)
+
+    def test_outer_failure_rolls_back_everything(self):
+        self.db.add_account('Existing', 'debit', 0)
+        with self.assertRaises(RuntimeError):
+            with self.db.batch():
+                self.db.add_account('Checking', 'debit', 0)
+                with self.db.batch():
+                    self.db.add_account('Savings', 'debit', 0)
+                raise RuntimeError('cancelled')
+
+        self.assertEqual(self.committed_accounts(), ['Existing'])
+        self.assertFalse(self.db.conn.in_transaction)
+        self.assertEqual(self.db.batch_depth, 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
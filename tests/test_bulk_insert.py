@@ -0,0 +1,123 @@
+"""
+Bulk transaction inserts - one transaction for a whole import, with optional
+duplicate detection
+"""
+
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+
+
+class BulkInsertTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db = DatabaseManager(os.path.join(directory.name, 'finance.db'))
+        self.addCleanup(self.db.close)
+        self.account_id = self.db.add_account('Checking', 'debit', 100)
+
+    def rows(self, count, start=0):
+        return [(self.account_id, 1 if i % 2 else 5, 10.0 + i, 'income' if i % 2 else 'expense',
+                 f"Row {i}", f"2024-03-{1 + i % 28:02d}")
+                for i in range(start, start + count)]
+
+    def count(self):
+        return self.db.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0]
+
+    def test_inserts_every_row_in_one_commit(self):
+        statements = []
+        self.db.conn.set_trace_callback(statements.append)
+        stats = self.db.add_transactions_bulk(self.rows(1000))
+        self.db.conn.set_trace_callback(None)
+
+        self.assertEqual((stats['inserted'], stats['skipped']), (1000, 0))
+        boundaries = [sql.split()[0].upper() for sql in statements
+                      if sql.split()[0].upper() in ('BEGIN', 'SAVEPOINT', 'RELEASE', 'COMMIT')]
+        self.assertEqual(boundaries, ['SAVEPOINT', 'RELEASE'])
+        self.assertEqual(self.count(), 1000)
+
+        income = sum(10.0 + i for i in range(1000) if i % 2)
+        expense = sum(10.0 + i for i in range(1000) if not i % 2)
+        self.assertAlmostEqual(self.db.get_account(self.account_id)['current_balance'], 100 + income - expense)
+
+    def test_failed_row_rolls_back_the_whole_insert(self):
+        rows = self.rows(10)
+        rows[7] = (self.account_id, 5, -1.0, 'expense', 'Negative', '2024-03-08')  # CHECK(amount > 0)
+
+        with self.assertRaises(Exception):
+            self.db.add_transactions_bulk(rows)
+        self.assertEqual(self.count(), 0)
+        self.assertEqual(self.db.get_account(self.account_id)['current_balance'], 100)
+
+    def test_rows_keep_file_order(self):
+        self.db.add_transactions_bulk(self.rows(50))
+        descriptions = [row[0] for row in self.db.conn.execute(
+            "SELECT description FROM transactions WHERE transaction_date = '2024-03-01' ORDER BY id")]
+        self.assertEqual(descriptions, ['Row 0', 'Row 28'])
+
+
+class DuplicateDetectionTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db = DatabaseManager(os.path.join(directory.name, 'finance.db'))
+        self.addCleanup(self.db.close)
+        self.account_id = self.db.add_account('Checking', 'debit', 0)
+        self.coffee = (self.account_id, 5, 4.5, 'expense', 'Coffee', '2024-03-01')
+        self.lunch = (self.account_id, 5, 12.0, 'expense', 'Lunch', '2024-03-01')
+
+    def import_rows(self, rows, seen=None):
+        return self.db.add_transactions_bulk(rows, skip_duplicates=True, seen=seen)
+
+    def count(self, description):
+        return self.db.conn.execute("SELECT COUNT(*) FROM transactions WHERE description = ?",
+                                    (description,)).fetchone()[0]
+
+    def test_repeated_purchases_import_once(self):
+        first = self.import_rows([self.coffee, self.coffee, self.lunch])
+        self.assertEqual((first['inserted'], first['skipped']), (3, 0))
+
+        again = self.import_rows([self.coffee, self.coffee, self.lunch])
+        self.assertEqual((again['inserted'], again['skipped']), (0, 3))
+        self.assertEqual(len(again['skipped_fingerprints']), 3)
+        self.assertEqual(self.count('Coffee'), 2)
+
+    def test_extra_copy_is_inserted(self):
+        self.import_rows([self.coffee, self.coffee])
+
+        result = self.import_rows([self.coffee, self.coffee, self.coffee])
+
+        self.assertEqual((result['inserted'], result['skipped']), (1, 2))
+        self.assertEqual(self.count('Coffee'), 3)
+
+    def test_reformatted_rows_match(self):
+        self.import_rows([self.coffee])
+        reformatted = (self.account_id, 5, 4.500000001, 'expense', '  COFFEE ', '2024-03-01')
+        other_account = (self.db.add_account('Card', 'credit', 0), 5, 4.5, 'expense', 'Coffee', '2024-03-01')
+
+        result = self.import_rows([reformatted, other_account])
+
+        self.assertEqual((result['inserted'], result['skipped']), (1, 1))
+
+    def test_seen_counts_carry_across_batches(self):
+        self.import_rows([self.coffee])
+        seen = {}
+
+        first = self.import_rows([self.coffee], seen=seen)
+        second = self.import_rows([self.coffee, self.lunch], seen=seen)
+
+        # The second call's coffee is the import's second copy; the table holds one
+        self.assertEqual((first['inserted'], first['skipped']), (0, 1))
+        self.assertEqual((second['inserted'], second['skipped']), (2, 0))
+        self.assertEqual(self.count('Coffee'), 2)
+
+    def test_without_skip_duplicates_everything_is_inserted(self):
+        self.import_rows([self.coffee])
+        result = self.db.add_transactions_bulk([self.coffee, self.coffee])
+        self.assertEqual((result['inserted'], result['skipped']), (2, 0))
+        self.assertEqual(self.count('Coffee'), 3)
+
+if __name__ == '__main__':
+    unittest.main()
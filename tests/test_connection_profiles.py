@@ -0,0 +1,84 @@
+"""
+Connection profiles - PRAGMA settings and WAL checkpointing
+"""
+
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+
+
+class ConnectionProfileTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db_path = os.path.join(directory.name, 'finance.db')
+
+    def open(self, **kwargs):
+        db = DatabaseManager(self.db_path, **kwargs)
+        self.addCleanup(db.close)
+        return db
+
+    def pragma(self, db, name):
+        return db.conn.execute(f"PRAGMA {name}").fetchone()[0]
+
+    def test_default_profile_uses_wal(self):
+        db = self.open()
+        self.assertEqual(self.pragma(db, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(db, 'synchronous'), 1)  # NORMAL
+        self.assertEqual(self.pragma(db, 'busy_timeout'), 5000)
+        self.assertEqual(self.pragma(db, 'cache_size'), -16000)
+
+    def test_durable_profile_syncs_every_commit(self):
+        db = self.open(profile='durable')
+        self.assertEqual(self.pragma(db, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(db, 'synchronous'), 2)  # FULL
+
+    def test_legacy_profile_uses_rollback_journal(self):
+        db = self.open(profile='legacy')
+        self.assertEqual(self.pragma(db, 'journal_mode'), 'delete')
+        self.assertEqual(self.pragma(db, 'synchronous'), 2)
+
+    def test_custom_profile_dict(self):
+        db = self.open(profile={'journal_mode': 'WAL', 'cache_size': -2000})
+        self.assertEqual(self.pragma(db, 'journal_mode'), 'wal')
+        self.assertEqual(self.pragma(db, 'cache_size'), -2000)
+
+    def test_unknown_profile_is_rejected(self):
+        with self.assertRaises(ValueError):
+            DatabaseManager(self.db_path, profile='turbo')
+
+    def test_reader_sees_commits_while_writer_is_open(self):
+        writer = self.open()
+        reader = self.open(initialize=False)
+        writer.add_account('Checking', 'debit', 10)
+
+        self.assertEqual([row['name'] for row in reader.get_all_accounts()], ['Checking'])
+
+    def test_checkpoint_truncates_wal(self):
+        db = self.open()
+        account_id = db.add_account('Checking', 'debit', 0)
+        db.add_transactions_bulk([(account_id, 5, 1.0 + i, 'expense', f"Row {i}", '2024-01-01')
+                                  for i in range(200)])
+        wal_path = self.db_path + '-wal'
+        self.assertGreater(os.path.getsize(wal_path), 0)
+
+        result = db.checkpoint('TRUNCATE')
+
+        self.assertEqual(result['busy'], 0)
+        self.assertEqual(os.path.getsize(wal_path), 0)
+        with self.assertRaises(ValueError):
+            db.checkpoint('EVENTUALLY')
+
+    def test_close_checkpoints_wal(self):
+        db = DatabaseManager(self.db_path)
+        db.add_account('Checking', 'debit', 0)
+        db.close()
+
+        wal_path = self.db_path + '-wal'
+        self.assertTrue(not os.path.exists(wal_path) or os.path.getsize(wal_path) == 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+"""
+CSV export - streaming rows straight from a database cursor
+"""
+
+import csv
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+from utils.csv_handler import CSVHandler
+
+class CSVExportTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.csv_path = os.path.join(self.directory, 'export.csv')
+
+        self.db = self.open_database('source.db')
+        account_id = self.db.add_account('Checking', 'debit', 0)
+        descriptions = ['Coffee', 'Rent, January', 'Said "thanks"', 'Café', '']
+        self.db.add_transactions_bulk([
+            (account_id, 1 if i % 4 == 0 else 5 + i % 3, round(1.01 + i * 2.37, 2),
+             'income' if i % 4 == 0 else 'expense', f"{descriptions[i % 5]} {i}".strip(),
+             f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}")
+            for i in range(300)
+        ])
+
+    def open_database(self, name):
+        db = DatabaseManager(os.path.join(self.directory, name))
+        self.addCleanup(db.close)
+        return db
+
+    def stored(self, db):
+        return sorted((row['transaction_date'], row['category_name'], row['transaction_type'],
+                       row['amount'], row['description'])
+                      for row in db.get_transactions_page())
+
+    def test_rows_match_database(self):
+        count = CSVHandler.export_transactions(self.db.iter_transactions(batch_size=64), self.csv_path)
+        self.assertEqual(count, 300)
+
+        with open(self.csv_path, newline='', encoding='utf-8') as f:
+            reader = csv.DictReader(f)
+            self.assertEqual(reader.fieldnames, ['date', 'account', 'category', 'type', 'amount', 'description'])
+            exported = sorted((row['date'], row['category'], row['type'], float(row['amount']), row['description'])
+                              for row in reader)
+
+        self.assertEqual(exported, self.stored(self.db))
+
+    def test_progress_and_cancel(self):
+        progress = []
+
+        def on_progress(done, total):
+            progress.append((done, total))
+
+        count = CSVHandler.export_transactions(self.db.iter_transactions(), self.csv_path, total=300,
+                                               progress_callback=on_progress, progress_interval=100)
+        self.assertEqual(count, 300)
+        self.assertEqual(progress, [(100, 300), (200, 300), (300, 300), (300, 300)])
+
+        def cancel_after_first(done, total):
+            return done < 100
+
+        result = CSVHandler.export_transactions(self.db.iter_transactions(), self.csv_path, total=300,
+                                                progress_callback=cancel_after_first, progress_interval=100)
+        self.assertIsNone(result)
+        self.assertFalse(os.path.exists(self.csv_path))
+
+    def test_empty_export_leaves_no_file(self):
+        empty = self.open_database('empty.db')
+        with self.assertRaises(ValueError):
+            CSVHandler.export_transactions(empty.iter_transactions(), self.csv_path)
+        self.assertFalse(os.path.exists(self.csv_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
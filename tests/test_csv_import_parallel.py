@@ -0,0 +1,79 @@
+"""
+Parallel CSV import - spawned parser processes started from a script entry point
+"""
+
+import ast
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import textwrap
+import unittest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Runs the import the way main.py does: from a __main__ guard, which spawned
+# workers need because they re-import the entry script
+SCRIPT = textwrap.dedent("""
+    import json
+    import multiprocessing
+    import sys
+
+    from database.db_manager import DatabaseManager
+    from utils.csv_handler import CSVHandler
+
+    if __name__ == '__main__':
+        multiprocessing.freeze_support()
+        db_path, csv_path = sys.argv[1:3]
+        db = DatabaseManager(db_path)
+        account_id = db.add_account('Checking', 'debit', 0)
+        category_map = {category['name']: category['id'] for category in db.get_all_categories()}
+        success, error_count, errors, stats = CSVHandler.import_transactions_parallel(
+            csv_path, account_id, {'date': 0, 'amount': 1, 'description': 2, 'category': 3},
+            db, category_map, workers=2, chunk_size=4096)
+        stored = db.get_transaction_totals()['count']
+        db.close()
+        print(json.dumps({'success': success, 'errors': errors, 'stored': stored}))
+""")
+
+
+class ParallelImportTests(unittest.TestCase):
+    def test_parallel_import_from_main_guarded_script(self):
+        with tempfile.TemporaryDirectory() as directory:
+            csv_path = os.path.join(directory, 'statement.csv')
+            with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+                f.write("Date,Amount,Description,Category\n")
+                for i in range(2000):
+                    f.write(f"2024-{1 + i % 12:02d}-{1 + i % 28:02d},{i % 90 + 1}.25,Row {i},Groceries\n")
+                f.write("not a date,1.00,Broken,Groceries\n")
+
+            script_path = os.path.join(directory, 'run_import.py')
+            with open(script_path, 'w', encoding='utf-8') as f:
+                f.write(SCRIPT)
+
+            env = dict(os.environ, PYTHONPATH=REPO_ROOT)
+            completed = subprocess.run(
+                [sys.executable, script_path, os.path.join(directory, 'finance.db'), csv_path],
+                cwd=directory, env=env, capture_output=True, text=True, timeout=300
+            )
+            self.assertEqual(completed.returncode, 0, completed.stderr)
+            result = json.loads(completed.stdout.strip().splitlines()[-1])
+
+        self.assertEqual(result['success'], 2000)
+        self.assertEqual(result['stored'], 2000)
+        self.assertEqual(len(result['errors']), 1)
+        self.assertTrue(result['errors'][0].startswith('Row 2002:'), result['errors'][0])
+
+    def test_main_calls_freeze_support_first(self):
+        with open(os.path.join(REPO_ROOT, 'main.py'), encoding='utf-8') as f:
+            tree = ast.parse(f.read())
+
+        guards = [node for node in tree.body if isinstance(node, ast.If)
+                  and ast.unparse(node.test) in ("__name__ == '__main__'", '__name__ == "__main__"')]
+        self.assertEqual(len(guards), 1)
+        self.assertEqual(ast.unparse(guards[0].body[0]), 'multiprocessing.freeze_support()')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+CSV import parity - the serial and parallel paths accept and reject the same
+rows with the same messages
+"""
+
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+from utils.csv_handler import CSVHandler
+
+MAPPING = {'date': 0, 'amount': 1, 'description': 2, 'category': 3, 'type': 4}
+
+MIXED_CSV = (
+    "Date,Amount,Description,Category,Type\n"
+    "2024-01-05,12.50,Coffee,Groceries,expense\n"
+    "2024-01-06,7\n"                                  # short: no description
+    "\n"                                              # blank line
+    "2024-01-07,3000,Pay,Salary,income\n"
+    "2024-13-45,5,Bad date,Groceries,expense\n"
+    "2024-01-08,abc,Bad amount,Groceries,expense\n"
+    "2024-01-09,-4,Negative,Groceries,expense\n"
+    "2024-01-10,9,Bad type,Groceries,transfer\n"
+    "2024-01-11,9,No type,Groceries\n"                # short: no type
+    "2024-01-12,9,No category\n"                      # short: no category
+    "2024-01-13,9,,Groceries,expense\n"               # empty description is fine
+    "2024-01-14,15,Unknown category,Hobbies,expense\n"
+    '2024-01-15,"1,250.00","Rent, January",Rent,expense\n'
+    "2024-01-16,9,Extra fields,Groceries,expense,x,y\n"
+    "bad,abc,Short and bad\n"                         # bad date is found before the missing type
+    "2024-01-17,8,Last row without newline,Groceries,expense"
+)
+
+
+class ImportParityTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.csv_path = os.path.join(self.directory, 'mixed.csv')
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write(MIXED_CSV)
+
+    def run_import(self, name, import_fn, **kwargs):
+        db = DatabaseManager(os.path.join(self.directory, f"{name}.db"))
+        self.addCleanup(db.close)
+        account_id = db.add_account('Checking', 'debit', 0)
+        category_map = {category['name']: category['id'] for category in db.get_all_categories()}
+        success, error_count, errors, stats = import_fn(self.csv_path, account_id, MAPPING, db,
+                                                        category_map, **kwargs)
+        stored = [(row['transaction_date'], row['amount'], row['transaction_type'], row['description'],
+                   row['category_name'])
+                  for row in db.get_transactions_page(order='date_asc')]
+        return success, error_count, errors, stored
+
+    def test_all_paths_agree(self):
+        serial = self.run_import('serial', CSVHandler.import_transactions)
+        parallel = self.run_import('parallel', CSVHandler.import_transactions_parallel,
+                                   workers=2, chunk_size=128)
+
+        self.assertEqual(parallel, serial)
+
+        success, error_count, errors, stored = serial
+        self.assertEqual(success, 7)
+        self.assertEqual(errors, [
+            "Row 3: Invalid row format (not enough columns)",
+            "Row 4: Invalid row format (not enough columns)",
+            "Row 6: Invalid date format '2024-13-45'",
+            "Row 7: Invalid amount 'abc'",
+            "Row 8: Invalid amount '-4'",
+            "Row 9: Invalid transaction type 'transfer'",
+            "Row 10: Invalid row format (not enough columns)",
+            "Row 11: Invalid row format (not enough columns)",
+            "Row 16: Invalid date format 'bad'",
+        ])
+        self.assertIn(('2024-01-13', 9.0, 'expense', '', 'Groceries'), stored)
+        self.assertIn(('2024-01-14', 15.0, 'expense', 'Unknown category', 'Other Expense'), stored)
+        self.assertIn(('2024-01-15', 1250.0, 'expense', 'Rent, January', 'Rent'), stored)
+
+    def test_quoted_line_breaks_survive_chunking(self):
+        # Files past PARALLEL_THRESHOLD go to the parallel path; tiny chunks put
+        # most chunk boundaries inside the quoted, multi-line descriptions
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write('Date,Amount,"Description\nof the payment",Category,Type\n')
+            for day in range(1, 29):
+                f.write(f'2024-02-{day:02d},{day}.50,"Card payment\nref ""{day}""\n",Groceries,expense\n')
+            f.write('2024-02-29,abc,"Bad\namount",Groceries,expense\n')
+
+        serial = self.run_import('serial', CSVHandler.import_transactions)
+        for chunk_size in (16, 50, 4096):
+            with self.subTest(chunk_size=chunk_size):
+                parallel = self.run_import(f"parallel_{chunk_size}", CSVHandler.import_transactions_parallel,
+                                           workers=2, chunk_size=chunk_size)
+                self.assertEqual(parallel, serial)
+
+        success, error_count, errors, stored = serial
+        self.assertEqual(success, 28)
+        self.assertEqual(errors, ["Row 30: Invalid amount 'abc'"])
+        self.assertIn(('2024-02-03', 3.5, 'expense', 'Card payment\nref "3"', 'Groceries'), stored)
+
+    def test_header_only_file_imports_nothing(self):
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write("Date,Amount,Description,Category,Type\n")
+
+        serial = self.run_import('serial', CSVHandler.import_transactions)
+        parallel = self.run_import('parallel', CSVHandler.import_transactions_parallel, workers=2)
+
+        self.assertEqual(serial, (0, 0, [], []))
+        self.assertEqual(parallel, serial)
+
+    def test_short_row_rejected_without_type_column(self):
+        # Without a type column nothing else would catch the missing description
+        with open(self.csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write("Date,Amount,Description\n")
+            for day in range(1, 21):
+                f.write(f"2024-01-{day:02d},{day}.40,Lunch\n")
+            f.write("2024-01-21,7\n2024-01-22,8.25,\n")
+        mapping = {'date': 0, 'amount': 1, 'description': 2}
+
+        for name, import_fn in [('serial', CSVHandler.import_transactions),
+                                ('parallel', CSVHandler.import_transactions_parallel)]:
+            with self.subTest(path=name):
+                db = DatabaseManager(os.path.join(self.directory, f"short_{name}.db"))
+                self.addCleanup(db.close)
+                account_id = db.add_account('Checking', 'debit', 0)
+                category_map = {category['name']: category['id'] for category in db.get_all_categories()}
+                success, error_count, errors, stats = import_fn(self.csv_path, account_id, mapping, db,
+                                                                category_map)
+                self.assertEqual(success, 21)
+                self.assertEqual(errors, ["Row 22: Invalid row format (not enough columns)"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,95 @@
+"""
+Resumable CSV import - an interrupted import continues after its last checkpoint
+"""
+
+import os
+import tempfile
+import unittest
+from unittest import mock
+
+from database.db_manager import DatabaseManager
+from utils.csv_handler import CSVHandler
+
+MAPPING = {'date': 0, 'amount': 1, 'description': 2, 'category': 3}
+
+
+class ResumeImportTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+        self.db = DatabaseManager(os.path.join(self.directory, 'finance.db'))
+        self.addCleanup(self.db.close)
+        self.account_id = self.db.add_account('Checking', 'debit', 0)
+        self.category_map = {category['name']: category['id'] for category in self.db.get_all_categories()}
+
+    def write_csv(self, encoding='utf-8'):
+        path = os.path.join(self.directory, f"statement_{encoding}.csv")
+        with open(path, 'w', encoding=encoding, newline='') as f:
+            f.write("Date,Amount,Description,Category\r\n")
+            for i in range(1, 41):
+                # Two identical purchases, so duplicate counting must survive the resume
+                description = 'Coffee' if i in (20, 21) else f"Purchase {i} é"
+                amount = '4.50' if i in (20, 21) else f"{i}.25"
+                f.write(f"2024-02-{1 + i % 28:02d},{amount},{description},Groceries\r\n")
+            f.write("2024-02-10,oops,Bad amount,Groceries\r\n")
+        return path
+
+    def interrupted(self, import_fn, path, **kwargs):
+        """Run an import that dies on its second chunk"""
+        real_bulk = self.db.add_transactions_bulk
+        calls = []
+
+        def failing_bulk(*args, **kw):
+            calls.append(1)
+            if len(calls) == 2:
+                raise RuntimeError("power cut")
+            return real_bulk(*args, **kw)
+
+        with mock.patch.object(self.db, 'add_transactions_bulk', side_effect=failing_bulk):
+            with self.assertRaises(ValueError):
+                import_fn(path, self.account_id, MAPPING, self.db, self.category_map, **kwargs)
+
+    def stored(self):
+        return [(row['transaction_date'], row['amount'], row['description'])
+                for row in self.db.get_transactions_page(order='date_asc')]
+
+    def test_import_resumes_after_last_checkpoint(self):
+        for encoding in ('utf-8', 'utf-16'):
+            with self.subTest(encoding=encoding):
+                self.db.conn.execute("DELETE FROM transactions")
+                self.db.conn.commit()
+                path = self.write_csv(encoding)
+
+                self.interrupted(CSVHandler.import_transactions, path, checkpoint_rows=15)
+                self.assertEqual(len(self.stored()), 15)
+
+                success, error_count, errors, stats = CSVHandler.import_transactions(
+                    path, self.account_id, MAPPING, self.db, self.category_map, checkpoint_rows=15)
+                self.assertEqual(stats['resumed_from_row'], 16)
+                self.assertEqual(success, 25)
+                self.assertEqual(errors, ["Row 42: Invalid amount 'oops'"])
+                self.assertEqual(len(self.stored()), 40)
+                self.assertEqual(sum(1 for row in self.stored() if row[2] == 'Coffee'), 2)
+
+    def test_paths_resume_each_others_jobs(self):
+        path = self.write_csv()
+        self.interrupted(CSVHandler.import_transactions, path, checkpoint_rows=15)
+
+        # The parallel path picks up the byte offset the serial path recorded
+        success, error_count, errors, stats = CSVHandler.import_transactions_parallel(
+            path, self.account_id, MAPPING, self.db, self.category_map, workers=2)
+        self.assertEqual(stats['resumed_from_row'], 16)
+        self.assertEqual(success, 25)
+
+        # Importing the finished file again skips every row as a duplicate
+        success, error_count, errors, stats = CSVHandler.import_transactions(
+            path, self.account_id, MAPPING, self.db, self.category_map)
+        self.assertIsNone(stats['resumed_from_row'])
+        self.assertEqual((success, stats['skipped']), (0, 40))
+        self.assertEqual(len(self.stored()), 40)
+
+
+if __name__ == '__main__':
+    unittest.main()
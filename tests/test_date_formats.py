@@ -0,0 +1,83 @@
+"""
+Date format inference - one format per file instead of a strptime loop per row
+"""
+
+import os
+import tempfile
+import unittest
+from datetime import datetime
+
+from database.db_manager import DatabaseManager
+from utils.csv_handler import CSVHandler, DATE_FORMATS
+
+
+class InferDateFormatTests(unittest.TestCase):
+    def test_unambiguous_columns(self):
+        cases = {
+            '%Y-%m-%d': ['2024-01-05', '2024-12-31', '2023-2-9'],
+            '%d/%m/%Y': ['05/01/2024', '25/12/2024', '13/02/2023'],
+            '%m/%d/%Y': ['01/05/2024', '12/25/2024', '02/13/2023'],
+            '%Y%m%d': ['20240105', '20241231'],
+            '%d-%m-%Y': ['31-01-2024', '15-06-2024'],
+        }
+        for expected, values in cases.items():
+            with self.subTest(expected=expected):
+                self.assertEqual(CSVHandler.infer_date_format(values), (expected, False))
+
+    def test_day_and_month_both_twelve_or_less_is_ambiguous(self):
+        self.assertEqual(CSVHandler.infer_date_format(['01/02/2024', '03/04/2024', '12/11/2024']),
+                         ('%m/%d/%Y', True))
+
+    def test_best_format_wins_over_stray_values(self):
+        values = ['25/01/2024', '26/01/2024', '01/02/2024', 'pending', '', '  ']
+        self.assertEqual(CSVHandler.infer_date_format(values), ('%d/%m/%Y', False))
+
+    def test_no_match(self):
+        self.assertEqual(CSVHandler.infer_date_format(['soon', 'yesterday']), (None, False))
+        self.assertEqual(CSVHandler.infer_date_format([]), (None, False))
+
+    def test_compiled_parsers_agree_with_strptime(self):
+        values = ['2024-02-29', '2023-02-29', '2024-04-31', '2024-1-7', '29/02/2024', '31/04/2024',
+                  '04/31/2024', '12/31/99', '01/01/68', '1/2/2024', '20241301', '20240230', '2024/13/01',
+                  '00/10/2024', '2024-00-10', '24-01-2024']
+        for fmt in DATE_FORMATS:
+            parse = CSVHandler._date_parser(fmt)
+            for value in values:
+                with self.subTest(fmt=fmt, value=value):
+                    try:
+                        expected = datetime.strptime(value, fmt).strftime('%Y-%m-%d')
+                    except ValueError:
+                        expected = None
+                    self.assertEqual(parse(value), expected)
+
+
+class ImportDateFormatTests(unittest.TestCase):
+    def test_day_first_file_is_read_day_first(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        csv_path = os.path.join(directory.name, 'statement.csv')
+        with open(csv_path, 'w', encoding='utf-8', newline='') as f:
+            f.write("Date,Amount,Description,Category,Type\n")
+            # Only the later rows rule out month/day; per-row parsing would read 03/02 as March 2nd
+            f.write("03/02/2024,10,Early,Groceries,expense\n")
+            for day in range(13, 29):
+                f.write(f"{day}/02/2024,{day},Row {day},Groceries,expense\n")
+
+        mapping = {'date': 0, 'amount': 1, 'description': 2, 'category': 3, 'type': 4}
+
+        for import_fn in (CSVHandler.import_transactions, CSVHandler.import_transactions_parallel):
+            with self.subTest(import_fn=import_fn.__name__):
+                db = DatabaseManager(os.path.join(directory.name, f"{import_fn.__name__}.db"))
+                self.addCleanup(db.close)
+                account_id = db.add_account('Checking', 'debit', 0)
+                category_map = {category['name']: category['id'] for category in db.get_all_categories()}
+                success, error_count, errors, stats = import_fn(csv_path, account_id, mapping, db, category_map)
+
+                self.assertEqual((success, error_count), (17, 0))
+                self.assertEqual((stats['date_format'], stats['date_format_ambiguous']), ('%d/%m/%Y', False))
+                dates = {row['description']: row['transaction_date'] for row in db.get_transactions_page()}
+                self.assertEqual(dates['Early'], '2024-02-03')
+                self.assertEqual(dates['Row 28'], '2024-02-28')
+
+if __name__ == '__main__':
+    unittest.main()
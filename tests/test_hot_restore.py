@@ -0,0 +1,98 @@
+"""
+Hot restore - replacing the open database while other connections stay open
+"""
+
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+from utils.backup import BackupManager
+
+
+class HotRestoreTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+        self.db_path = os.path.join(self.directory, 'finance.db')
+        self.backup_dir = os.path.join(self.directory, 'backups')
+
+        self.db = DatabaseManager(self.db_path)
+        self.addCleanup(self.db.close)
+        # Stands in for the query thread's connection, which is not closed during a restore
+        self.other = DatabaseManager(self.db_path, initialize=False)
+        self.addCleanup(self.other.close)
+
+        checking = self.db.add_account('Checking', 'debit', 100)
+        self.db.add_transactions_bulk([(checking, 5, 2.0 + i, 'expense', f"Row {i}", '2024-01-05')
+                                       for i in range(300)])
+        self.snapshot = BackupManager.create_backup(self.db_path, self.backup_dir)
+        self.backed_up = self.state(self.other)
+
+        savings = self.db.add_account('Savings', 'debit', 5000)
+        self.db.add_transaction(savings, 1, 1200.0, 'income', 'Bonus', '2024-02-01')
+        self.db.delete_transaction(self.db.get_transactions_page(limit=1)[0]['id'])
+        self.changed = self.state(self.other)
+        self.assertNotEqual(self.changed, self.backed_up)
+
+    def state(self, db):
+        accounts = sorted((row['name'], round(row['current_balance'], 2)) for row in db.get_all_accounts())
+        return accounts, db.get_transaction_totals()['count'], db.get_yearly_summary(2024)
+
+    def test_other_connection_sees_restored_contents(self):
+        progress = []
+        self.assertTrue(BackupManager.restore_into(self.snapshot, self.db,
+                                                   progress_callback=lambda done, total: progress.append(done)))
+
+        self.assertTrue(progress)
+        self.assertEqual(self.state(self.other), self.backed_up)
+        self.assertEqual(self.state(self.db), self.backed_up)
+        self.assertEqual(self.db.verify_balances(), [])
+        self.assertEqual(self.other.conn.execute("PRAGMA journal_mode").fetchone()[0], 'wal')
+        self.assertFalse(os.path.exists(self.db_path + '.restoring'))
+
+        # Both connections keep working against the restored file
+        self.other.add_account('After restore', 'credit', 0)
+        self.assertIn('After restore', [row['name'] for row in self.db.get_all_accounts()])
+
+    def test_current_database_is_backed_up_first(self):
+        BackupManager.restore_into(self.snapshot, self.db)
+
+        pre_restore = BackupManager.list_backups(os.path.join(self.directory, 'pre_restore_backups'))
+        self.assertEqual(len(pre_restore), 1)
+        self.assertEqual(pre_restore[0]['row_counts']['transactions'], self.changed[1])
+
+        BackupManager.restore_into(pre_restore[0]['filepath'], self.db, create_backup_of_current=False)
+        self.assertEqual(self.state(self.other), self.changed)
+
+    def test_cancelled_restore_keeps_current_contents(self):
+        # Copy a few pages per step so there is a step to cancel before the last one
+        original_pages = BackupManager.BACKUP_PAGES
+        BackupManager.BACKUP_PAGES = 2
+        self.addCleanup(setattr, BackupManager, 'BACKUP_PAGES', original_pages)
+
+        with self.assertRaises(Exception):
+            BackupManager.restore_into(self.snapshot, self.db, create_backup_of_current=False,
+                                       progress_callback=lambda done, total: False)
+
+        self.assertEqual(self.state(self.other), self.changed)
+        self.assertEqual(self.state(self.db), self.changed)
+
+    def test_cancel_after_the_last_step_completes_restore(self):
+        restored = BackupManager.restore_into(self.snapshot, self.db, create_backup_of_current=False,
+                                              progress_callback=lambda done, total: done < total)
+
+        self.assertTrue(restored)
+        self.assertEqual(self.state(self.other), self.backed_up)
+        self.assertEqual(self.state(self.db), self.backed_up)
+
+    def test_restore_refused_inside_batch(self):
+        with self.db.batch():
+            with self.assertRaises(Exception):
+                BackupManager.restore_into(self.snapshot, self.db, create_backup_of_current=False)
+        self.assertEqual(self.state(self.other), self.changed)
+
+
+if __name__ == '__main__':
+    unittest.main()
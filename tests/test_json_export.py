@@ -0,0 +1,106 @@
+"""
+JSON export - streamed documents and NDJSON files read back record by record
+"""
+
+import gzip
+import json
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+from utils.json_handler import JSONHandler
+
+
+class JSONRoundTripTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+        self.db = self.open_database('source.db')
+        checking = self.db.add_account('Checking', 'debit', 250.0)
+        card = self.db.add_account('Card "Gold"', 'credit', 0)
+        pets = self.db.add_category('Pets', 'expense', 'Food, vet, toys')
+        self.db.add_transactions_bulk([
+            (checking if i % 3 else card, (1, 5, 7, pets)[i % 4], round(0.5 + i * 3.1, 2),
+             'income' if i % 4 == 0 else 'expense', f"Row {i} – café \"{i % 7}\"",
+             f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}")
+            for i in range(250)
+        ])
+
+    def open_database(self, name):
+        db = DatabaseManager(os.path.join(self.directory, name))
+        self.addCleanup(db.close)
+        return db
+
+    def snapshot(self, db):
+        transactions = sorted((row['account_name'], row['category_name'], row['amount'],
+                               row['transaction_type'], row['description'], row['transaction_date'])
+                              for row in db.get_transactions_page())
+        accounts = sorted((row['name'], row['account_type'], row['initial_balance'], round(row['current_balance'], 2))
+                          for row in db.get_all_accounts())
+        categories = sorted((row['name'], row['type']) for row in db.get_all_categories())
+        return transactions, accounts, categories
+
+    def test_round_trip_in_every_format(self):
+        for name, compact in (('export.json', False), ('export.json', True), ('export.ndjson', False),
+                              ('export.jsonl.gz', False), ('export.json.gz', True)):
+            with self.subTest(name=name, compact=compact):
+                path = os.path.join(self.directory, name)
+                counts = JSONHandler.export_data(self.db, path, compact=compact)
+                self.assertEqual(counts['transactions'], 250)
+                self.assertEqual(counts['accounts'], 2)
+
+                target = self.open_database(f"{name}-{compact}.db")
+                imported = JSONHandler.import_data(path, target)
+
+                self.assertEqual(imported, {'accounts': 2, 'categories': 1, 'transactions': 250})
+                self.assertEqual(self.snapshot(target), self.snapshot(self.db))
+
+    def test_document_is_plain_json(self):
+        path = os.path.join(self.directory, 'export.json.gz')
+        JSONHandler.export_data(self.db, path)
+
+        with gzip.open(path, 'rt', encoding='utf-8') as f:
+            document = json.load(f)
+
+        self.assertEqual(list(document), ['export_date', 'accounts', 'categories', 'transactions'])
+        self.assertEqual(len(document['transactions']), 250)
+        self.assertEqual(list(JSONHandler.iter_records(path))[-1], ('transactions', document['transactions'][-1]))
+
+    def test_ndjson_has_one_record_per_line(self):
+        path = os.path.join(self.directory, 'export.ndjson')
+        JSONHandler.export_data(self.db, path)
+
+        with open(path, encoding='utf-8') as f:
+            lines = [json.loads(line) for line in f]
+
+        self.assertEqual(lines[0]['format'], JSONHandler.FORMAT_NAME)
+        self.assertEqual(len(lines), 1 + 2 + len(self.db.get_all_categories()) + 250)
+        self.assertEqual({line['table'] for line in lines[1:]}, {'accounts', 'categories', 'transactions'})
+
+    def test_cancelled_import_rolls_back(self):
+        path = os.path.join(self.directory, 'export.ndjson')
+        JSONHandler.export_data(self.db, path)
+        target = self.open_database('target.db')
+        before = self.snapshot(target)
+
+        original_batch_size = JSONHandler.IMPORT_BATCH_SIZE
+        JSONHandler.IMPORT_BATCH_SIZE = 100
+        self.addCleanup(setattr, JSONHandler, 'IMPORT_BATCH_SIZE', original_batch_size)
+        result = JSONHandler.import_data(path, target, progress_callback=lambda done, total: done < 200)
+
+        self.assertEqual(result, {})
+        self.assertEqual(self.snapshot(target), before)
+
+    def test_cancelled_export_removes_file(self):
+        path = os.path.join(self.directory, 'export.json')
+        result = JSONHandler.export_data(self.db, path, progress_callback=lambda done, total: False,
+                                         progress_interval=50)
+        self.assertIsNone(result)
+        self.assertFalse(os.path.exists(path))
+
+
+if __name__ == '__main__':
+    unittest.main()
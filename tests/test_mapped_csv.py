@@ -0,0 +1,96 @@
+"""
+Memory-mapped CSV reader - encoding, dialect and header detection and previews
+"""
+
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+from utils.csv_handler import CSVHandler
+from utils.mapped_csv import MappedCSVFile
+
+HEADER = ['Date', 'Amount', 'Description', 'Category', 'Type']
+ROWS = [[f"2024-01-{1 + i % 28:02d}", f"{5 + i}.25", f"Café {i}", 'Groceries', 'expense'] for i in range(25)]
+
+
+class MappedCSVTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.directory = directory.name
+
+    def write(self, data, name='statement.csv'):
+        path = os.path.join(self.directory, name)
+        with open(path, 'wb') as f:
+            f.write(data)
+        return path
+
+    def csv_text(self, delimiter=',', header=True):
+        rows = ([HEADER] if header else []) + ROWS
+        return ''.join(delimiter.join(row) + '\r\n' for row in rows)
+
+    def test_encodings(self):
+        text = self.csv_text()
+        cases = [
+            ('utf-8', text.encode('utf-8'), 0),
+            ('utf-8', text.encode('utf-8-sig'), 3),
+            ('cp1252', text.encode('cp1252'), 0),
+            ('utf-16-le', text.encode('utf-16'), 2),  # Python writes the native (little-endian) mark
+            ('utf-16-be', text.encode('utf-16-be'), 0),
+            ('utf-32-le', text.encode('utf-32'), 4),
+        ]
+        for codec, data, bom_length in cases:
+            with self.subTest(codec=codec, bom_length=bom_length):
+                with MappedCSVFile(self.write(data)) as f:
+                    self.assertEqual((f.codec, f.bom_length), (codec, bom_length))
+                    self.assertEqual(f.ascii_compatible, codec in ('utf-8', 'cp1252'))
+                    self.assertTrue(f.has_header)
+                    self.assertEqual(f.rows(3), [HEADER] + ROWS[:2])
+
+    def test_delimiters(self):
+        for delimiter in ',;\t|':
+            with self.subTest(delimiter=delimiter):
+                csv_format = CSVHandler.sniff(self.write(self.csv_text(delimiter).encode('utf-8')))
+                self.assertEqual(csv_format['delimiter'], delimiter)
+                self.assertTrue(csv_format['has_header'])
+
+    def test_headerless_file(self):
+        path = self.write(self.csv_text(header=False).encode('utf-8'))
+        self.assertFalse(CSVHandler.sniff(path)['has_header'])
+        self.assertEqual(CSVHandler.get_csv_preview(path, 2), ROWS[:2])
+
+    def test_preview_reads_rows_past_the_window(self):
+        long_description = 'Split\nacross lines ' + 'x' * 5000
+        text = self.csv_text() + f'2024-02-01,9.99,"{long_description}",Groceries,expense\r\n' + 'tail,row\r\n'
+        with MappedCSVFile(self.write(text.encode('utf-8'))) as f:
+            f.SNIFF_BYTES = 256  # Force the window to grow several times
+            rows = f.rows(len(ROWS) + 2)
+
+        self.assertEqual(len(rows), len(ROWS) + 2)
+        self.assertEqual(rows[-1][2], long_description)
+
+    def test_preview_of_short_and_empty_files(self):
+        path = self.write(self.csv_text().encode('utf-8'))
+        self.assertEqual(CSVHandler.get_csv_preview(path, 100), [HEADER] + ROWS)
+        self.assertEqual(CSVHandler.get_csv_preview(self.write(b'', 'empty.csv')), [])
+
+    def test_utf16_imports_through_the_serial_path(self):
+        path = self.write(self.csv_text().encode('utf-16'))
+        db = DatabaseManager(os.path.join(self.directory, 'finance.db'))
+        self.addCleanup(db.close)
+        account_id = db.add_account('Checking', 'debit', 0)
+        category_map = {category['name']: category['id'] for category in db.get_all_categories()}
+        mapping = {'date': 0, 'amount': 1, 'description': 2, 'category': 3, 'type': 4}
+
+        with self.assertRaises(ValueError):
+            CSVHandler.import_transactions_parallel(path, account_id, mapping, db, category_map)
+        success, error_count, _, _ = CSVHandler.import_transactions(path, account_id, mapping, db, category_map)
+
+        self.assertEqual((success, error_count), (len(ROWS), 0))
+        self.assertEqual(sorted(row['description'] for row in db.get_transactions_page()),
+                         sorted(row[2] for row in ROWS))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,162 @@
+"""
+Schema migrations - upgrading a database created by the original release
+"""
+
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+from database.migrations import SCHEMA_VERSION
+
+# Schema shipped before migrations existed (user_version 0)
+BASELINE_SCHEMA = """
+CREATE TABLE accounts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL,
+    account_type TEXT NOT NULL CHECK(account_type IN ('debit', 'credit')),
+    initial_balance REAL DEFAULT 0,
+    current_balance REAL DEFAULT 0,
+    currency TEXT DEFAULT 'USD',
+    created_date TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+CREATE TABLE categories (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    name TEXT NOT NULL UNIQUE,
+    type TEXT NOT NULL CHECK(type IN ('income', 'expense')),
+    description TEXT
+);
+
+CREATE TABLE transactions (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    account_id INTEGER NOT NULL,
+    category_id INTEGER NOT NULL,
+    amount REAL NOT NULL CHECK(amount > 0),
+    transaction_type TEXT NOT NULL CHECK(transaction_type IN ('income', 'expense')),
+    description TEXT,
+    transaction_date DATE NOT NULL,
+    created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    FOREIGN KEY (account_id) REFERENCES accounts(id) ON DELETE CASCADE,
+    FOREIGN KEY (category_id) REFERENCES categories(id) ON DELETE RESTRICT
+);
+
+CREATE INDEX idx_transactions_date ON transactions(transaction_date);
+CREATE INDEX idx_transactions_account ON transactions(account_id);
+CREATE INDEX idx_transactions_category ON transactions(category_id);
+CREATE INDEX idx_accounts_type ON accounts(account_type);
+
+INSERT INTO categories (name, type, description) VALUES
+    ('Salary', 'income', 'Monthly salary and wages'),
+    ('Freelance', 'income', 'Freelance income'),
+    ('Investment', 'income', 'Investment returns'),
+    ('Other Income', 'income', 'Miscellaneous income'),
+    ('Groceries', 'expense', 'Food and groceries'),
+    ('Utilities', 'expense', 'Electricity, water, gas, internet'),
+    ('Rent', 'expense', 'Rent or mortgage');
+"""
+
+
+class MigrationTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db_path = os.path.join(directory.name, 'finance.db')
+
+        self.rows = [
+            (1 + i % 2, 1 if i % 5 == 0 else 5 + i % 3, round(10 + i * 0.75, 2),
+             'income' if i % 5 == 0 else 'expense', f"Row {i % 40}", f"202{3 + i % 2}-{1 + i % 12:02d}-{1 + i % 28:02d}")
+            for i in range(150)
+        ]
+        balances = {1: 1000.0, 2: 0.0}
+        for account_id, _, amount, transaction_type, _, _ in self.rows:
+            balances[account_id] += amount if transaction_type == 'income' else -amount
+
+        conn = sqlite3.connect(self.db_path)
+        conn.executescript(BASELINE_SCHEMA)
+        conn.executemany(
+            "INSERT INTO accounts (name, account_type, initial_balance, current_balance) VALUES (?, ?, ?, ?)",
+            [('Checking', 'debit', 1000.0, balances[1]), ('Card', 'credit', 0.0, balances[2])]
+        )
+        conn.executemany(
+            """INSERT INTO transactions (account_id, category_id, amount, transaction_type, description, transaction_date)
+               VALUES (?, ?, ?, ?, ?, ?)""",
+            self.rows
+        )
+        conn.commit()
+        conn.close()
+
+    def open(self, path=None):
+        db = DatabaseManager(path or self.db_path)
+        self.addCleanup(db.close)
+        return db
+
+    def schema(self, db):
+        """Indexes and triggers with their SQL, and the columns of every table"""
+        objects = [tuple(row) for row in db.conn.execute(
+            "SELECT type, name, sql FROM sqlite_master WHERE type IN ('index', 'trigger') ORDER BY name")]
+        for (table,) in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'table' ORDER BY name"):
+            columns = [tuple(row)[1:] for row in db.conn.execute(f"PRAGMA table_xinfo({table})")]
+            objects.append(('table', table, columns))
+        return objects
+
+    def test_upgrade_matches_fresh_schema(self):
+        db = self.open()
+        fresh = self.open(os.path.join(os.path.dirname(self.db_path), 'fresh.db'))
+
+        self.assertEqual(db.conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+        self.assertEqual(db.conn.execute("PRAGMA integrity_check").fetchone()[0], 'ok')
+        self.assertEqual(db.conn.execute("SELECT COUNT(*) FROM transactions").fetchone()[0], len(self.rows))
+        self.assertEqual(self.schema(db), self.schema(fresh))
+
+        indexes = {row[0] for row in db.conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+        self.assertFalse({'idx_transactions_account', 'idx_transactions_category'} & indexes)
+
+    def test_rollups_are_backfilled(self):
+        db = self.open()
+
+        for year in (2023, 2024):
+            expected = {'income': 0.0, 'expense': 0.0}
+            for row in self.rows:
+                if row[5].startswith(str(year)):
+                    expected[row[3]] += row[2]
+            summary = db.get_yearly_summary(year)
+            self.assertAlmostEqual(summary['income'], expected['income'])
+            self.assertAlmostEqual(summary['expense'], expected['expense'])
+
+        rollup_rows = db.conn.execute("SELECT SUM(count) FROM monthly_rollups").fetchone()[0]
+        self.assertEqual(rollup_rows, len(self.rows))
+
+    def test_existing_balances_stay_consistent(self):
+        db = self.open()
+        self.assertEqual(db.verify_balances(), [])
+
+        db.add_transaction(1, 5, 25.0, 'expense', 'After upgrade', '2024-06-01')
+        self.assertEqual(db.verify_balances(), [])
+
+    def test_fingerprints_are_backfilled(self):
+        db = self.open()
+
+        missing = db.conn.execute("SELECT COUNT(*) FROM transactions WHERE fingerprint IS NULL").fetchone()[0]
+        self.assertEqual(missing, 0)
+        result = db.add_transactions_bulk(self.rows, skip_duplicates=True)
+        self.assertEqual(result['inserted'], 0)
+        self.assertEqual(result['skipped'], len(self.rows))
+
+    def test_reopening_is_a_no_op(self):
+        def state(db):
+            return ([tuple(row) for row in db.conn.execute("SELECT type, name, sql FROM sqlite_master ORDER BY name")],
+                    [tuple(row) for row in db.conn.execute("SELECT * FROM monthly_rollups ORDER BY 1, 2, 3, 4")])
+
+        db = self.open()
+        before = state(db)
+        db.close()
+
+        db = self.open()
+        self.assertEqual(db.conn.execute("PRAGMA user_version").fetchone()[0], SCHEMA_VERSION)
+        self.assertEqual(state(db), before)
+
+
+if __name__ == '__main__':
+    unittest.main()
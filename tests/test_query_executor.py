@@ -0,0 +1,159 @@
+"""
+Query executor - background operations, channels and cancellation
+"""
+
+import os
+import tempfile
+import threading
+import time
+import unittest
+
+from PyQt5.QtCore import QCoreApplication
+
+from database.db_manager import DatabaseManager
+from ui.query_executor import QueryExecutor
+
+
+def wait_until(condition, timeout=5.0):
+    """Process queued signals until condition() holds or the timeout passes"""
+    deadline = time.monotonic() + timeout
+    while not condition() and time.monotonic() < deadline:
+        QCoreApplication.processEvents()
+        time.sleep(0.005)
+    QCoreApplication.processEvents()
+    return condition()
+
+
+class QueryExecutorTests(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.app = QCoreApplication.instance() or QCoreApplication([])
+
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        db_path = os.path.join(directory.name, 'finance.db')
+        db = DatabaseManager(db_path)
+        db.add_account('Checking', 'debit', 125.0)
+        db.close()
+
+        self.executor = QueryExecutor(db_path)
+        self.addCleanup(self.executor.shutdown)
+
+    def test_result_is_delivered_on_the_calling_thread(self):
+        results = []
+        self.executor.submit(lambda db: (db.get_all_accounts()[0]['current_balance'], threading.get_ident()),
+                             on_result=lambda result: results.append((result, threading.get_ident())))
+
+        self.assertTrue(wait_until(lambda: results))
+        (balance, worker_thread), delivered_on = results[0]
+        self.assertEqual(balance, 125.0)
+        self.assertNotEqual(worker_thread, threading.get_ident())
+        self.assertEqual(delivered_on, threading.get_ident())
+
+    def test_errors_go_to_on_error(self):
+        results, errors = [], []
+
+        def fail(db):
+            raise ValueError('no such report')
+
+        self.executor.submit(fail, on_result=results.append, on_error=errors.append)
+
+        self.assertTrue(wait_until(lambda: errors))
+        self.assertEqual(errors, ['no such report'])
+        self.assertEqual(results, [])
+
+    def test_errors_without_handler_are_signalled(self):
+        unhandled = []
+        self.executor.unhandled_error.connect(unhandled.append)
+
+        def fail(db):
+            raise ValueError('lost update')
+
+        self.executor.submit(fail, on_result=lambda result: None)
+        self.executor.submit(fail, on_error=lambda message: None)
+
+        self.assertTrue(wait_until(lambda: not self.executor.callbacks))
+        self.assertEqual(unhandled, ['lost update'])
+
+    def test_newer_submission_supersedes_channel(self):
+        release = threading.Event()
+        results = []
+
+        def slow(db):
+            release.wait(5)
+            return 'stale'
+
+        self.executor.submit(slow, on_result=results.append, channel='summary')
+        self.executor.submit(lambda db: 'fresh', on_result=results.append, channel='summary')
+        release.set()
+
+        self.assertTrue(wait_until(lambda: results))
+        self.assertTrue(wait_until(lambda: not self.executor.callbacks))
+        self.assertEqual(results, ['fresh'])
+
+    def test_cancel_interrupts_running_statement(self):
+        started = threading.Event()
+        results, errors = [], []
+
+        def slow_count(db):
+            # Signal once the statement is actually running, so the cancel has something to interrupt
+            db.conn.set_progress_handler(lambda: started.set(), 10000)
+            try:
+                return db.conn.execute(
+                    "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 100000000)"
+                    " SELECT COUNT(*) FROM n").fetchone()[0]
+            finally:
+                db.conn.set_progress_handler(None, 0)
+
+        start = time.monotonic()
+        ticket = self.executor.submit(slow_count, on_result=results.append, on_error=errors.append)
+        self.assertTrue(started.wait(5))
+        self.executor.cancel(ticket)
+
+        follow_up = []
+        self.executor.submit(lambda db: 'ready', on_result=follow_up.append)
+        self.assertTrue(wait_until(lambda: follow_up))
+        self.assertLess(time.monotonic() - start, 5)
+        self.assertEqual((results, errors), ([], []))
+
+    def test_cancel_stops_progress_reporting_operation(self):
+        started = threading.Event()
+        outcome = []
+        progress = []
+
+        def import_rows(db, report):
+            for done in range(1, 1000):
+                started.set()
+                if not report(done, 999):
+                    outcome.append(done)
+                    return 'stopped'
+                time.sleep(0.002)
+            return 'completed'
+
+        results = []
+        ticket = self.executor.submit(import_rows, on_result=results.append,
+                                      on_progress=lambda done, total: progress.append((done, total)))
+        self.assertTrue(started.wait(5))
+        self.assertTrue(wait_until(lambda: progress))
+        self.executor.cancel(ticket)
+
+        self.assertTrue(wait_until(lambda: outcome))
+        self.assertLess(outcome[0], 999)
+        wait_until(lambda: False, timeout=0.05)
+        self.assertEqual(results, [])
+        self.assertEqual(progress[0][1], 999)
+
+    def test_shutdown_closes_worker_connection(self):
+        results = []
+        self.executor.submit(lambda db: len(db.get_all_accounts()), on_result=results.append)
+        self.assertTrue(wait_until(lambda: results))
+
+        self.executor.shutdown()
+
+        self.assertTrue(self.executor.thread.isFinished())
+        self.assertIsNone(self.executor.worker.db)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,127 @@
+"""
+Query plan checks - every read method must be answered from an index, and every
+transactions index must serve at least one method
+
+Each probe calls the real DatabaseManager method while a trace callback records
+its statements, then runs EXPLAIN QUERY PLAN over them against a populated and
+ANALYZEd database, so the check follows the queries as written and the plans the
+planner picks once it has statistics.
+"""
+
+import os
+import random
+import re
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+
+
+class QueryPlanTests(unittest.TestCase):
+    ROWS = 5000
+
+    def populate(self, account_count):
+        """Create a database with account_count accounts and ANALYZE it"""
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        db = DatabaseManager(os.path.join(directory.name, 'finance.db'))
+        self.addCleanup(db.close)
+
+        accounts = [db.add_account(f"Account {i}", 'debit', 100) for i in range(account_count)]
+        categories = [category['id'] for category in db.get_all_categories()]
+        rng = random.Random(account_count)
+        db.add_transactions_bulk([
+            (rng.choice(accounts), rng.choice(categories), round(rng.uniform(1, 500), 2),
+             rng.choice(['income', 'expense']), f"Row {i}",
+             f"{rng.randint(2022, 2024)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}")
+            for i in range(self.ROWS)
+        ])
+        db.conn.execute("ANALYZE")
+        db.conn.commit()
+        return db, accounts[0], categories[0]
+
+    def probes(self, db, account_id, category_id):
+        """(name, call, allowed) - 'scan' permits a full ordered pass over transactions,
+        'sort' permits sorting an already aggregated result"""
+        date_range = {'start_date': '2023-03-01', 'end_date': '2023-03-31'}
+        job = {'id': 0, 'account_id': account_id, 'last_transaction_id': self.ROWS - 100}
+        return [
+            ('get_all_transactions', lambda: db.get_all_transactions(limit=1), {'scan'}),
+            ('iter_transactions', lambda: list(db.iter_transactions()), {'scan'}),
+            ('get_transactions_by_date_range',
+             lambda: db.get_transactions_by_date_range('2023-03-01', '2023-03-31'), set()),
+            ('get_transactions_by_account', lambda: db.get_transactions_by_account(account_id), set()),
+            ('get_transactions_by_category', lambda: db.get_transactions_by_category(category_id), set()),
+            ('get_transaction_totals', lambda: db.get_transaction_totals(date_range), set()),
+            ('get_transactions_page (date)', lambda: db.get_transactions_page(date_range, limit=1), set()),
+            ('get_transactions_page (account)',
+             lambda: db.get_transactions_page({'account_id': account_id}, limit=1), set()),
+            ('get_transactions_page (account, type)', lambda: db.get_transactions_page(
+                dict(date_range, account_id=account_id, transaction_type='income'), limit=1), set()),
+            ('get_transactions_page (after)', lambda: db.get_transactions_page(
+                {'account_id': account_id}, limit=1, after={'transaction_date': '2023-03-15', 'id': 100}), set()),
+            ('get_transactions_page (category)', lambda: db.get_transactions_page(
+                dict(date_range, category_id=category_id), limit=1), set()),
+            ('get_monthly_summary', lambda: db.get_monthly_summary(2023, 3), set()),
+            ('get_yearly_summary', lambda: db.get_yearly_summary(2023), set()),
+            ('get_monthly_trend', lambda: db.get_monthly_trend(12), {'sort'}),
+            ('get_category_breakdown',
+             lambda: db.get_category_breakdown('2023-03-01', '2023-03-31', 'expense'), {'sort'}),
+            ('get_monthly_category_breakdown',
+             lambda: db.get_monthly_category_breakdown(2023, 3, 'expense'), {'sort'}),
+            ('recalculate_account_balance', lambda: db.recalculate_account_balance(account_id), set()),
+            ('verify_balances', lambda: db.verify_balances(), set()),
+            ('get_import_job_fingerprint_counts', lambda: db.get_import_job_fingerprint_counts(job), set()),
+            # Last, as it adds a row
+            ('add_transactions_bulk', lambda: db.add_transactions_bulk(
+                [(account_id, category_id, 9.99, 'expense', 'Probe', '2023-03-15')], skip_duplicates=True), set()),
+        ]
+
+    def plans(self, db, call):
+        """(sql, detail) for every EXPLAIN QUERY PLAN line of the queries call runs"""
+        statements = []
+        db.conn.set_trace_callback(statements.append)
+        try:
+            call()
+        finally:
+            db.conn.set_trace_callback(None)
+
+        return [(sql, row['detail'])
+                for sql in statements if sql.lstrip().upper().startswith(('SELECT', 'UPDATE', 'INSERT'))
+                for row in db.conn.execute(f"EXPLAIN QUERY PLAN {sql}")]
+
+    def violations(self, db, call, allowed):
+        """EXPLAIN QUERY PLAN lines where transactions or monthly_rollups is fully
+        scanned or rows are sorted in a temp B-tree"""
+        found = []
+        for sql, detail in self.plans(db, call):
+            full_scan = re.match(r'SCAN (t|transactions|monthly_rollups)\b', detail) and 'scan' not in allowed
+            temp_sort = 'TEMP B-TREE' in detail and not ('sort' in allowed and 'ORDER BY' in detail)
+            if full_scan or temp_sort:
+                found.append(f"{detail}\n    in {' '.join(sql.split())}")
+        return found
+
+    def test_read_methods_use_indexes(self):
+        # A single account is the common case and the one where the planner is most
+        # tempted to loop over accounts and sort
+        for account_count in (1, 4):
+            db, account_id, category_id = self.populate(account_count)
+            for name, call, allowed in self.probes(db, account_id, category_id):
+                with self.subTest(accounts=account_count, method=name):
+                    self.assertEqual(self.violations(db, call, allowed), [])
+
+    def test_every_index_is_used(self):
+        # Each index slows down every insert, so one no method reads is pure cost
+        db, account_id, category_id = self.populate(4)
+        used = set()
+        for name, call, allowed in self.probes(db, account_id, category_id):
+            for sql, detail in self.plans(db, call):
+                used.update(re.findall(r'USING (?:COVERING )?INDEX (\w+)', detail))
+
+        indexes = {row['name'] for row in db.conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = 'transactions' AND sql IS NOT NULL")}
+        self.assertEqual(indexes - used, set())
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,159 @@
+"""
+Reports - summaries and trends checked against sums over the raw rows
+"""
+
+import os
+import tempfile
+import unittest
+from collections import defaultdict
+
+from database.db_manager import DatabaseManager
+
+
+class ReportTestCase(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db = DatabaseManager(os.path.join(directory.name, 'finance.db'))
+        self.addCleanup(self.db.close)
+        self.checking = self.db.add_account('Checking', 'debit', 0)
+        self.card = self.db.add_account('Card', 'credit', 0)
+
+    def raw_totals(self, key):
+        """Income and expense totals per key(transaction_date) over the stored rows"""
+        totals = defaultdict(lambda: {'income': 0.0, 'expense': 0.0})
+        for row in self.db.conn.execute("SELECT amount, transaction_type, transaction_date FROM transactions"):
+            totals[key(row['transaction_date'])][row['transaction_type']] += row['amount']
+        return totals
+
+
+class SummaryQueryTests(ReportTestCase):
+    def setUp(self):
+        super().setUp()
+        # Year and month boundaries are where substring and range predicates disagree
+        dates = ['2023-01-01', '2023-06-15', '2023-12-31', '2024-01-01', '2024-02-29',
+                 '2024-03-01', '2024-12-31', '2025-01-01']
+        self.db.add_transactions_bulk([
+            (self.checking if i % 2 else self.card, 1 if i % 3 == 0 else 5 + i % 3,
+             round(3 + i * 1.5, 2), 'income' if i % 3 == 0 else 'expense', f"Row {i}", dates[i % len(dates)])
+            for i in range(96)
+        ])
+
+    def test_yearly_summary_matches_raw_sums(self):
+        expected = self.raw_totals(lambda date: int(date[:4]))
+        for year in (2022, 2023, 2024, 2025):
+            with self.subTest(year=year):
+                summary = self.db.get_yearly_summary(year)
+                self.assertAlmostEqual(summary['income'], expected[year]['income'])
+                self.assertAlmostEqual(summary['expense'], expected[year]['expense'])
+                self.assertAlmostEqual(summary['net'], expected[year]['income'] - expected[year]['expense'])
+
+    def test_monthly_summary_matches_raw_sums(self):
+        expected = self.raw_totals(lambda date: date[:7])
+        for year, month in ((2023, 12), (2024, 1), (2024, 2), (2024, 3), (2024, 4)):
+            with self.subTest(year=year, month=month):
+                summary = self.db.get_monthly_summary(year, month)
+                self.assertAlmostEqual(summary['income'], expected[f"{year}-{month:02d}"]['income'])
+                self.assertAlmostEqual(summary['expense'], expected[f"{year}-{month:02d}"]['expense'])
+
+    def test_monthly_trend_covers_last_months(self):
+        self.db.conn.execute("DELETE FROM transactions")
+        month_starts = [row[0] for row in self.db.conn.execute(
+            "SELECT date('now', 'start of month', '-' || value || ' months') FROM json_each('[0, 1, 5, 11, 12]')")]
+        self.db.add_transactions_bulk([
+            (self.checking, 5 if i % 2 else 1, 10.0 + i, 'expense' if i % 2 else 'income', f"Row {i}", start)
+            for i, start in enumerate(month_starts)
+        ])
+
+        trend = self.db.get_monthly_trend(12)
+
+        expected = self.raw_totals(lambda date: date[:7])
+        months = [start[:7] for start in month_starts[:4]]
+        self.assertEqual(sorted({row['month'] for row in trend}, reverse=True), months)
+        self.assertEqual([row['month'] for row in trend], sorted((row['month'] for row in trend), reverse=True))
+        for row in trend:
+            self.assertAlmostEqual(row['total'], expected[row['month']][row['transaction_type']])
+
+    def test_category_breakdowns_match_raw_sums(self):
+        expected = defaultdict(float)
+        for row in self.db.conn.execute(
+                """SELECT c.name, t.amount FROM transactions t JOIN categories c ON c.id = t.category_id
+                   WHERE t.transaction_type = 'expense' AND t.transaction_date BETWEEN '2024-01-01' AND '2024-12-31'"""):
+            expected[row['name']] += row['amount']
+
+        breakdown = self.db.get_category_breakdown('2024-01-01', '2024-12-31', 'expense')
+
+        self.assertEqual({row['name'] for row in breakdown}, set(expected))
+        for row in breakdown:
+            self.assertAlmostEqual(row['total'], expected[row['name']])
+        self.assertEqual([row['total'] for row in breakdown],
+                         sorted((row['total'] for row in breakdown), reverse=True))
+
+
+class MonthlyRollupTests(ReportTestCase):
+    def rollups(self):
+        return sorted(tuple(row) for row in self.db.conn.execute(
+            "SELECT account_id, category_id, year_month, type, ROUND(total, 6), count FROM monthly_rollups"))
+
+    def recomputed(self):
+        return sorted(tuple(row) for row in self.db.conn.execute(
+            """SELECT account_id, category_id, substr(transaction_date, 1, 7), transaction_type,
+                      ROUND(SUM(amount), 6), COUNT(*)
+               FROM transactions
+               GROUP BY account_id, category_id, substr(transaction_date, 1, 7), transaction_type"""))
+
+    def assertRollupsCurrent(self):
+        self.assertEqual(self.rollups(), self.recomputed())
+
+    def test_triggers_follow_inserts_updates_and_deletes(self):
+        self.db.add_transactions_bulk([
+            (self.checking, 5 + i % 3, 4.25 + i, 'expense', f"Row {i}", f"2024-{1 + i % 4:02d}-10")
+            for i in range(40)
+        ])
+        salary = self.db.add_transaction(self.checking, 1, 3000.0, 'income', 'Salary', '2024-01-31')
+        self.assertRollupsCurrent()
+
+        # Moves the row to another month, account, category and type at once
+        self.db.update_transaction(salary, self.card, 7, 1200.0, 'expense', 'Rent', '2024-02-01')
+        self.assertRollupsCurrent()
+        self.assertEqual(self.db.get_monthly_summary(2024, 1)['income'], 0)
+
+        self.db.update_transaction(salary, self.card, 7, 1150.0, 'expense', 'Rent', '2024-02-01')
+        self.assertRollupsCurrent()
+
+        self.db.delete_transaction(salary)
+        self.assertRollupsCurrent()
+
+        self.db.delete_account(self.checking)
+        self.assertRollupsCurrent()
+        self.assertEqual(self.rollups(), [])
+
+    def test_emptied_groups_are_removed(self):
+        transaction_id = self.db.add_transaction(self.checking, 5, 12.5, 'expense', 'Lunch', '2024-05-05')
+        self.assertEqual(len(self.rollups()), 1)
+
+        self.db.delete_transaction(transaction_id)
+
+        self.assertEqual(self.rollups(), [])
+        self.assertEqual(self.db.get_yearly_summary(2024), {'income': 0, 'expense': 0, 'net': 0})
+
+    def test_yearly_summary_reads_rollups(self):
+        self.db.add_transactions_bulk([
+            (self.card, 6, 99.99, 'expense', f"Bill {i}", f"2024-{1 + i % 12:02d}-28") for i in range(24)
+        ])
+        self.db.add_transaction(self.checking, 1, 5000.0, 'income', 'Bonus', '2024-12-31')
+        self.assertAlmostEqual(self.db.get_yearly_summary(2024)['expense'], 24 * 99.99)
+        self.assertAlmostEqual(self.db.get_yearly_summary(2024)['income'], 5000.0)
+
+        # The summary is served from the rollups, so damaging them shows up in the report
+        self.db.conn.execute("UPDATE monthly_rollups SET total = total * 2")
+        self.assertAlmostEqual(self.db.get_yearly_summary(2024)['income'], 10000.0)
+
+        self.db.rebuild_monthly_rollups()
+
+        self.assertRollupsCurrent()
+        self.assertAlmostEqual(self.db.get_yearly_summary(2024)['income'], 5000.0)
+        self.assertAlmostEqual(self.db.get_yearly_summary(2024)['net'], 5000.0 - 24 * 99.99)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,54 @@
+"""
+Startup timer - phases are logged to a file, since the packaged build has no console
+"""
+
+import os
+import tempfile
+import unittest
+
+from utils.startup_timer import StartupTimer
+
+
+class StartupTimerTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.log_path = os.path.join(directory.name, 'startup.log')
+
+    def read_log(self):
+        with open(self.log_path, encoding='utf-8') as f:
+            return f.read().splitlines()
+
+    def test_report_appends_one_line(self):
+        for run in range(2):
+            timer = StartupTimer(start=0.0)
+            timer.mark('imports')
+            timer.mark('database')
+            timer.report(self.log_path)
+            timer.report(self.log_path)  # Only the first report is logged
+
+        lines = self.read_log()
+        self.assertEqual(len(lines), 2)
+        self.assertRegex(lines[-1], r"^\S+ Startup: imports \d+ ms, database \d+ ms \(total \d+ ms\)$")
+
+    def test_log_keeps_recent_startups(self):
+        with open(self.log_path, 'w', encoding='utf-8') as f:
+            f.writelines(f"old {i}\n" for i in range(StartupTimer.MAX_LOG_LINES + 50))
+
+        timer = StartupTimer()
+        timer.mark('window')
+        timer.report(self.log_path)
+
+        lines = self.read_log()
+        self.assertEqual(len(lines), StartupTimer.MAX_LOG_LINES)
+        self.assertIn('Startup: window', lines[-1])
+
+    def test_unwritable_log_is_ignored(self):
+        timer = StartupTimer()
+        timer.mark('window')
+        timer.report(os.path.join(self.log_path, 'missing', 'startup.log'))
+        self.assertFalse(os.path.exists(self.log_path))
+
+
+if __name__ == '__main__':
+    unittest.main()
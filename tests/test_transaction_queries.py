@@ -0,0 +1,76 @@
+"""
+Transaction filters and totals - filtering and aggregation done in SQL
+"""
+
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+
+
+class TransactionQueryTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db = DatabaseManager(os.path.join(directory.name, 'finance.db'))
+        self.addCleanup(self.db.close)
+
+        self.checking = self.db.add_account('Checking', 'debit', 0)
+        self.card = self.db.add_account('Card', 'credit', 0)
+        self.rows = [
+            (self.checking if i % 3 else self.card, 5 + i % 3, round(5 + i * 1.25, 2),
+             'income' if i % 4 == 0 else 'expense', f"Row {i}", f"2024-{1 + i % 6:02d}-{1 + i % 27:02d}")
+            for i in range(120)
+        ]
+        self.db.add_transactions_bulk(self.rows)
+
+    def expected(self, filters):
+        matching = [row for row in self.rows
+                    if (not filters.get('start_date') or row[5] >= filters['start_date'])
+                    and (not filters.get('end_date') or row[5] <= filters['end_date'])
+                    and filters.get('account_id') in (None, row[0])
+                    and filters.get('category_id') in (None, row[1])
+                    and filters.get('transaction_type') in (None, row[3])]
+        return {
+            'count': len(matching),
+            'income': sum(row[2] for row in matching if row[3] == 'income'),
+            'expense': sum(row[2] for row in matching if row[3] == 'expense'),
+            'descriptions': sorted(row[4] for row in matching),
+        }
+
+    def test_filters_and_totals(self):
+        for filters in ({},
+                        {'start_date': '2024-02-01', 'end_date': '2024-03-31'},
+                        {'account_id': self.card},
+                        {'category_id': 6, 'transaction_type': 'expense'},
+                        {'start_date': '2024-05-10', 'account_id': self.checking, 'transaction_type': 'income'}):
+            with self.subTest(filters=filters):
+                expected = self.expected(filters)
+                totals = self.db.get_transaction_totals(filters)
+
+                self.assertEqual(totals['count'], expected['count'])
+                self.assertAlmostEqual(totals['income'], expected['income'])
+                self.assertAlmostEqual(totals['expense'], expected['expense'])
+                self.assertEqual(len(self.db.get_transactions_page(filters, limit=10)), min(10, expected['count']))
+
+                everything = self.db.get_transactions_page(filters)
+                self.assertEqual(sorted(row['description'] for row in everything), expected['descriptions'])
+
+    def test_pages_are_ordered_and_disjoint(self):
+        pages = [self.db.get_transactions_page({}, offset=offset, limit=25, order='amount_desc')
+                 for offset in range(0, 120, 25)]
+        amounts = [row['amount'] for page in pages for row in page]
+        self.assertEqual(len(amounts), 120)
+        self.assertEqual(amounts, sorted(amounts, reverse=True))
+
+    def test_unknown_order_is_rejected(self):
+        with self.assertRaises(ValueError):
+            self.db.get_transactions_page({}, order='amount; DROP TABLE transactions')
+
+    def test_iter_transactions_streams_newest_first(self):
+        streamed = list(self.db.iter_transactions({'account_id': self.checking}, batch_size=7))
+        self.assertEqual(streamed, self.db.get_transactions_page({'account_id': self.checking}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+"""
+Transaction paging - keyset pages and the lazily fetched table model
+"""
+
+import os
+import tempfile
+import unittest
+
+from database.db_manager import DatabaseManager
+from ui.transactions_model import TransactionsTableModel
+
+
+class TransactionPageTests(unittest.TestCase):
+    def setUp(self):
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        self.db = DatabaseManager(os.path.join(directory.name, 'finance.db'))
+        self.addCleanup(self.db.close)
+
+        self.account_id = self.db.add_account('Checking', 'debit', 0)
+        other_account = self.db.add_account('Card', 'credit', 0)
+        # Few distinct dates and amounts, so every page boundary falls inside a tie
+        self.db.add_transactions_bulk([
+            (self.account_id if i % 3 else other_account, 1 + i % 4, 10 + i % 5,
+             'income' if i % 2 else 'expense', f"Row {i}", f"2024-01-{1 + i % 6:02d}")
+            for i in range(240)
+        ])
+
+    def page_through(self, filters, order, limit):
+        rows = []
+        while True:
+            page = self.db.get_transactions_page(filters, limit=limit, order=order,
+                                                 after=rows[-1] if rows else None)
+            if not page:
+                return rows
+            rows.extend(page)
+
+    def test_keyset_pages_match_full_listing(self):
+        for order in DatabaseManager.TRANSACTION_ORDERS:
+            for filters in ({}, {'account_id': self.account_id, 'transaction_type': 'income'}):
+                with self.subTest(order=order, filters=filters):
+                    expected = [row['id'] for row in self.db.get_transactions_page(filters, order=order)]
+                    paged = [row['id'] for row in self.page_through(filters, order, limit=7)]
+                    self.assertEqual(paged, expected)
+
+    def test_date_order_breaks_ties_on_id(self):
+        rows = self.db.get_transactions_page(order='date_desc')
+        keys = [(row['transaction_date'], row['id']) for row in rows]
+        self.assertEqual(keys, sorted(keys, reverse=True))
+
+    def test_model_fetches_every_row_once(self):
+        model = TransactionsTableModel(self.db)
+        model.CHUNK_SIZE = 50
+        filters = {'account_id': self.account_id}
+        model.set_filters(filters, self.db.get_transaction_totals(filters)['count'], order='amount_asc')
+        while model.canFetchMore():
+            model.fetchMore()
+
+        expected = [row['id'] for row in self.db.get_transactions_page(filters, order='amount_asc')]
+        self.assertEqual([row['id'] for row in model.rows], expected)
+        self.assertEqual(model.rowCount(), 160)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -16,7 +16,6 @@ class AccountsTab(QWidget):
         super().__init__()
         self.db = db_manager
         self.init_ui()
-        self.load_accounts()
 
     def init_ui(self):
         layout = QVBoxLayout()
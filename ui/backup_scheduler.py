@@ -0,0 +1,166 @@
+"""
+Backup Scheduler - Take automatic snapshots off the GUI thread
+"""
+
+import os
+import time
+from PyQt5.QtCore import QObject, QThread, QTimer, pyqtSignal, pyqtSlot
+from utils.backup import BackupManager
+from utils.backup_repository import BackupRepository
+
+class _BackupWorker(QObject):
+    """Lives in the scheduler thread and takes one snapshot at a time"""
+    finished = pyqtSignal(object)  # result dict
+    failed = pyqtSignal(str)  # error message
+
+    def __init__(self):
+        super().__init__()
+        self.stopping = False
+
+    @pyqtSlot(str, str, object)
+    def run(self, db_path, backup_directory, retention):
+        """Snapshot the database, then prune the repository to the retention policy"""
+        try:
+            start_time = time.perf_counter()
+            # The snapshot opens its own connections, so it never waits on the GUI thread
+            manifest_path = BackupManager.create_backup(
+                db_path, backup_directory,
+                progress_callback=lambda done, total: not self.stopping
+            )
+            if manifest_path is None:
+                return  # Stopped during shutdown
+            elapsed = time.perf_counter() - start_time
+
+            manifest = BackupRepository.load_manifest(manifest_path)
+            pruned = BackupManager.apply_retention(backup_directory, *retention)
+        except Exception as e:
+            self.failed.emit(str(e))
+        else:
+            self.finished.emit({
+                'path': manifest_path,
+                'created': manifest['created'],
+                'size_mb': manifest['size'] / (1024 * 1024),
+                'stored_mb': manifest['stored_bytes'] / (1024 * 1024),
+                'elapsed': elapsed,
+                'pruned': len(pruned),
+            })
+
+
+class BackupScheduler(QObject):
+    """
+    Takes a snapshot every interval_minutes, or sooner once write_threshold rows have
+    changed, on a dedicated thread
+
+    Writes made on the GUI thread's connection are counted from its total_changes;
+    work done on other connections (such as imports on the query thread) is reported
+    with record_writes(). Settings are stored in QSettings under "backup/".
+    """
+    backup_finished = pyqtSignal(object)  # result dict with path, size_mb, stored_mb, elapsed, pruned
+    backup_failed = pyqtSignal(str)
+    _run = pyqtSignal(str, str, object)
+
+    # How often the schedule and write count are checked
+    CHECK_INTERVAL_MS = 30 * 1000
+
+    DEFAULTS = {
+        'enabled': True,
+        'directory': '',  # Empty means a "backups" folder next to the database
+        'interval_minutes': 60,
+        'write_threshold': 500,
+        'keep_hourly': 24,
+        'keep_daily': 7,
+        'keep_weekly': 4,
+    }
+
+    def __init__(self, db_manager, settings, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.settings = settings
+        self.running = False
+        self.last_backup_time = time.monotonic()
+        self.writes = 0
+        self.changes_seen = self._total_changes()
+
+        self.thread = QThread()
+        self.worker = _BackupWorker()
+        self.worker.moveToThread(self.thread)
+        self._run.connect(self.worker.run)
+        self.worker.finished.connect(self._on_finished)
+        self.worker.failed.connect(self._on_failed)
+        self.thread.start()
+
+        self.timer = QTimer(self)
+        self.timer.timeout.connect(self.check)
+        self.timer.start(self.CHECK_INTERVAL_MS)
+
+    def value(self, key):
+        """Read a scheduler setting, falling back to its default"""
+        default = self.DEFAULTS[key]
+        return self.settings.value(f"backup/{key}", default, type=type(default))
+
+    def set_value(self, key, value):
+        self.settings.setValue(f"backup/{key}", value)
+
+    def default_directory(self) -> str:
+        return os.path.join(os.path.dirname(os.path.abspath(self.db.db_path)), 'backups')
+
+    def backup_directory(self) -> str:
+        return self.value('directory') or self.default_directory()
+
+    def _total_changes(self) -> int:
+        # The connection is closed while a restore replaces the database file
+        return self.db.conn.total_changes if self.db.conn is not None else 0
+
+    def record_writes(self, count: int):
+        """Count rows written through connections the scheduler cannot see"""
+        self.writes += count
+        self.check()
+
+    def pending_writes(self) -> int:
+        """Rows changed since the last snapshot started"""
+        changes = self._total_changes()
+        if changes < self.changes_seen:
+            self.changes_seen = 0  # The connection was reopened
+        self.writes += changes - self.changes_seen
+        self.changes_seen = changes
+        return self.writes
+
+    def check(self):
+        """Start a snapshot if the interval has passed or enough rows have changed"""
+        if self.running or not self.value('enabled'):
+            return
+
+        pending = self.pending_writes()
+        interval = self.value('interval_minutes') * 60
+        threshold = self.value('write_threshold')
+        if ((interval > 0 and time.monotonic() - self.last_backup_time >= interval)
+                or (threshold > 0 and pending >= threshold)):
+            self.backup_now()
+
+    def backup_now(self):
+        """Start a snapshot right away unless one is already running"""
+        if self.running:
+            return
+
+        self.running = True
+        # Writes made while the snapshot runs count towards the next one
+        self.pending_writes()
+        self.writes = 0
+        self.last_backup_time = time.monotonic()
+        retention = (self.value('keep_hourly'), self.value('keep_daily'), self.value('keep_weekly'))
+        self._run.emit(self.db.db_path, self.backup_directory(), retention)
+
+    def _on_finished(self, result):
+        self.running = False
+        self.backup_finished.emit(result)
+
+    def _on_failed(self, message):
+        self.running = False
+        self.backup_failed.emit(message)
+
+    def shutdown(self):
+        """Stop the timer, abandon any snapshot in progress and stop the thread"""
+        self.timer.stop()
+        self.worker.stopping = True
+        self.thread.quit()
+        self.thread.wait()
@@ -15,7 +15,6 @@ class CategoriesTab(QWidget):
         super().__init__()
         self.db = db_manager
         self.init_ui()
-        self.load_categories()
 
     def init_ui(self):
         layout = QVBoxLayout()
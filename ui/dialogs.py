@@ -4,7 +4,8 @@ Dialog windows for add/edit operations
 
 from PyQt5.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QFormLayout,
                              QLineEdit, QComboBox, QDoubleSpinBox, QTextEdit,
-                             QPushButton, QDateEdit, QLabel, QMessageBox)
+                             QPushButton, QDateEdit, QLabel, QMessageBox,
+                             QCheckBox, QSpinBox, QFileDialog)
 from PyQt5.QtCore import QDate, Qt
 from datetime import datetime
 
@@ -286,3 +287,109 @@ class TransactionDialog(QDialog):
             'description': self.description_edit.toPlainText().strip(),
             'transaction_date': self.date_edit.date().toString('yyyy-MM-dd')
         }
+
+
+class BackupSettingsDialog(QDialog):
+    """Dialog for configuring automatic backups"""
+    def __init__(self, parent=None, settings_data=None, default_directory=''):
+        super().__init__(parent)
+        self.settings_data = settings_data or {}
+        self.default_directory = default_directory
+        self.setWindowTitle("Automatic Backups")
+        self.setModal(True)
+        self.setMinimumWidth(450)
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+
+        # Form layout
+        form_layout = QFormLayout()
+
+        self.enabled_check = QCheckBox("Back up automatically")
+        self.enabled_check.setChecked(self.settings_data.get('enabled', True))
+        form_layout.addRow(self.enabled_check)
+
+        # Backup folder
+        directory_layout = QHBoxLayout()
+        self.directory_edit = QLineEdit()
+        self.directory_edit.setText(self.settings_data.get('directory', ''))
+        self.directory_edit.setPlaceholderText(self.default_directory)
+        browse_btn = QPushButton("Browse...")
+        browse_btn.clicked.connect(self.browse_directory)
+        directory_layout.addWidget(self.directory_edit)
+        directory_layout.addWidget(browse_btn)
+        form_layout.addRow("Backup Folder:", directory_layout)
+
+        # Schedule
+        self.interval_spin = QSpinBox()
+        self.interval_spin.setRange(0, 7 * 24 * 60)
+        self.interval_spin.setSuffix(" min")
+        self.interval_spin.setSpecialValueText("Never")
+        self.interval_spin.setValue(self.settings_data.get('interval_minutes', 60))
+        form_layout.addRow("Back Up Every:", self.interval_spin)
+
+        self.threshold_spin = QSpinBox()
+        self.threshold_spin.setRange(0, 10000000)
+        self.threshold_spin.setSuffix(" changes")
+        self.threshold_spin.setSpecialValueText("Never")
+        self.threshold_spin.setValue(self.settings_data.get('write_threshold', 500))
+        form_layout.addRow("Or After:", self.threshold_spin)
+
+        # Retention
+        self.hourly_spin = QSpinBox()
+        self.hourly_spin.setRange(0, 1000)
+        self.hourly_spin.setValue(self.settings_data.get('keep_hourly', 24))
+        form_layout.addRow("Keep Hourly:", self.hourly_spin)
+
+        self.daily_spin = QSpinBox()
+        self.daily_spin.setRange(0, 1000)
+        self.daily_spin.setValue(self.settings_data.get('keep_daily', 7))
+        form_layout.addRow("Keep Daily:", self.daily_spin)
+
+        self.weekly_spin = QSpinBox()
+        self.weekly_spin.setRange(0, 1000)
+        self.weekly_spin.setValue(self.settings_data.get('keep_weekly', 4))
+        form_layout.addRow("Keep Weekly:", self.weekly_spin)
+
+        layout.addLayout(form_layout)
+
+        # Help text
+        help_label = QLabel("The newest backup of each of the last hours, days and weeks is kept "
+                            "and older ones are deleted. Backups only store what changed since "
+                            "the previous one.")
+        help_label.setWordWrap(True)
+        help_label.setStyleSheet("color: gray; font-size: 9pt;")
+        layout.addWidget(help_label)
+
+        # Buttons
+        button_layout = QHBoxLayout()
+        self.save_btn = QPushButton("Save")
+        self.cancel_btn = QPushButton("Cancel")
+        self.save_btn.clicked.connect(self.accept)
+        self.cancel_btn.clicked.connect(self.reject)
+        button_layout.addStretch()
+        button_layout.addWidget(self.save_btn)
+        button_layout.addWidget(self.cancel_btn)
+        layout.addLayout(button_layout)
+
+        self.setLayout(layout)
+
+    def browse_directory(self):
+        directory = QFileDialog.getExistingDirectory(
+            self, "Select Backup Folder", self.directory_edit.text() or self.default_directory
+        )
+        if directory:
+            self.directory_edit.setText(directory)
+
+    def get_data(self):
+        """Return form data as dictionary"""
+        return {
+            'enabled': self.enabled_check.isChecked(),
+            'directory': self.directory_edit.text().strip(),
+            'interval_minutes': self.interval_spin.value(),
+            'write_threshold': self.threshold_spin.value(),
+            'keep_hourly': self.hourly_spin.value(),
+            'keep_daily': self.daily_spin.value(),
+            'keep_weekly': self.weekly_spin.value()
+        }
@@ -6,24 +6,29 @@ from PyQt5.QtWidgets import (QMainWindow, QTabWidget, QMessageBox, QFileDialog,
                              QDialog, QVBoxLayout, QHBoxLayout, QLabel, QTableWidget,
                              QTableWidgetItem, QPushButton, QComboBox, QSpinBox,
                              QHeaderView, QGroupBox, QFormLayout, QLineEdit, QActionGroup,
-                             QStatusBar)
-from PyQt5.QtCore import Qt, QDate, QSettings
+                             QStatusBar, QProgressDialog, QCheckBox, QWidget)
+from PyQt5.QtCore import Qt, QDate, QSettings, QTimer, pyqtSignal
 from ui.accounts_tab import AccountsTab
 from ui.categories_tab import CategoriesTab
 from ui.transactions_tab import TransactionsTab
-from ui.reports_tab import ReportsTab
 from ui.themes import ThemeManager
-from utils.csv_handler import CSVHandler
+from ui.query_executor import QueryExecutor
+from ui.backup_scheduler import BackupScheduler
+from ui.dialogs import BackupSettingsDialog
+from utils.json_handler import JSONHandler
 from utils.backup import BackupManager
+from utils.app_log import append_log
 import os
-import json
 
 class CSVImportDialog(QDialog):
     """Dialog for CSV import with column mapping"""
-    def __init__(self, parent, db_manager):
+    def __init__(self, parent, db_manager, executor):
         super().__init__(parent)
         self.db = db_manager
+        self.executor = executor
         self.csv_file = None
+        self.csv_format = None
+        self.imported_count = 0
         self.preview_data = []
         self.setWindowTitle("Import Transactions from CSV")
         self.setModal(True)
@@ -98,6 +103,12 @@ class CSVImportDialog(QDialog):
         self.type_col.setValue(-1)
         mapping_layout.addRow("Type Column (-1 = none):", self.type_col)
 
+        self.skip_duplicates = QCheckBox("Skip transactions already in the account")
+        self.skip_duplicates.setChecked(True)
+        self.skip_duplicates.setToolTip("Rows with the same date, amount and description as an "
+                                        "existing transaction are not imported again")
+        mapping_layout.addRow(self.skip_duplicates)
+
         mapping_group.setLayout(mapping_layout)
         layout.addWidget(mapping_group)
 
@@ -127,7 +138,13 @@ class CSVImportDialog(QDialog):
         if filename:
             try:
                 self.csv_file = filename
-                self.file_label.setText(os.path.basename(filename))
+                # Deferred so pandas is not imported at startup
+                from utils.csv_handler import CSVHandler
+                self.csv_format = CSVHandler.sniff(filename)
+                delimiter = {'\t': 'tab', ',': 'comma', ';': 'semicolon', '|': 'pipe'}.get(
+                    self.csv_format['delimiter'], repr(self.csv_format['delimiter']))
+                self.file_label.setText(f"{os.path.basename(filename)} "
+                                        f"({self.csv_format['codec'].upper()}, {delimiter} separated)")
                 self.preview_data = CSVHandler.get_csv_preview(filename, 5)
                 self.show_preview()
                 self.import_btn.setEnabled(True)
@@ -177,78 +194,141 @@ class CSVImportDialog(QDialog):
         categories = self.db.get_all_categories()
         category_map = {cat['name']: cat['id'] for cat in categories}
 
-        # Perform import
-        try:
-            account_id = self.account_combo.currentData()
-            success_count, error_count, errors = CSVHandler.import_transactions(
-                self.csv_file,
-                account_id,
-                column_mapping,
-                self.db,
-                category_map
-            )
+        # Perform import on the query thread so the window stays responsive
+        from utils.csv_handler import CSVHandler
+        account_id = self.account_combo.currentData()
+        csv_file = self.csv_file
+        skip_duplicates = self.skip_duplicates.isChecked()
+        self.import_btn.setEnabled(False)
+        self.import_btn.setText("Importing...")
+        if (os.path.getsize(csv_file) >= CSVHandler.PARALLEL_THRESHOLD
+                and self.csv_format['ascii_compatible']):
+            # Very large statement files are parsed across all CPU cores
+            import_fn = CSVHandler.import_transactions_parallel
+        else:
+            # Everything else, including encodings the parallel splitter cannot handle
+            import_fn = CSVHandler.import_transactions
+        self.executor.submit(
+            lambda db: import_fn(csv_file, account_id, column_mapping, db, category_map, skip_duplicates),
+            on_result=self.import_finished,
+            on_error=self.import_failed
+        )
 
-            # Show results
-            result_msg = f"Import completed!\n\nSuccessfully imported: {success_count} transactions\nErrors: {error_count}"
+    def import_finished(self, result):
+        """Show results of a completed import"""
+        success_count, error_count, errors, stats = result
+        self.import_btn.setText("Import")
+        self.import_btn.setEnabled(True)
 
-            if errors:
-                result_msg += "\n\nFirst 10 errors:\n" + "\n".join(errors[:10])
+        result_msg = (f"Import completed!\n\nSuccessfully imported: {success_count} transactions\n"
+                      f"Skipped as duplicates: {stats.get('skipped', 0)}\n"
+                      f"Errors: {error_count}\n"
+                      f"Throughput: {stats['rows_per_sec']:,.0f} rows/sec")
 
-            QMessageBox.information(self, "Import Complete", result_msg)
+        if stats.get('resumed_from_row') is not None:
+            result_msg += (f"\nResumed an interrupted import after row {stats['resumed_from_row']}; "
+                           "the counts above cover the remaining rows")
 
-            if success_count > 0:
-                self.accept()
+        if stats.get('date_format'):
+            result_msg += f"\nDate format: {stats['date_format']}"
+            if stats.get('date_format_ambiguous'):
+                result_msg += (" (ambiguous - day and month could not be told apart, "
+                               "please check the imported dates)")
 
-        except Exception as e:
-            QMessageBox.critical(self, "Import Error", f"Failed to import transactions: {str(e)}")
+        if errors:
+            result_msg += "\n\nFirst 10 errors:\n" + "\n".join(errors[:10])
+
+        QMessageBox.information(self, "Import Complete", result_msg)
+
+        if success_count > 0:
+            self.imported_count = success_count
+            self.accept()
+
+    def import_failed(self, message):
+        """Report a failed import"""
+        self.import_btn.setText("Import")
+        self.import_btn.setEnabled(True)
+        QMessageBox.critical(self, "Import Error", f"Failed to import transactions: {message}")
 
 
 class MainWindow(QMainWindow):
     """Main application window"""
+    database_restored = pyqtSignal()  # Signal after a backup replaced the database contents
 
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, startup_timer=None):
         super().__init__()
         self.db = db_manager
+        self.startup_timer = startup_timer
+        # Problems nobody is waiting on are logged here; the packaged build has no console
+        self.log_path = os.path.join(os.path.dirname(os.path.abspath(self.db.db_path)), 'finance_tracker.log')
+        self.first_paint_done = False
         self.setWindowTitle("Personal Finance Tracker")
         self.setGeometry(100, 100, 1200, 800)
 
         # Initialize settings
         self.settings = QSettings("PersonalFinanceTracker", "Settings")
 
+        # Background thread for long-running database work
+        self.executor = QueryExecutor(self.db.db_path, self)
+        self.executor.unhandled_error.connect(self.on_background_error)
+
+        # Automatic snapshots, taken on their own thread
+        self.backup_scheduler = BackupScheduler(self.db, self.settings, self)
+        self.backup_scheduler.backup_finished.connect(self.on_backup_finished)
+        self.backup_scheduler.backup_failed.connect(self.on_backup_failed)
+
         # Initialize UI
         self.init_ui()
         self.create_menu_bar()
 
         # Load and apply saved theme
         self.load_settings()
+        if self.startup_timer:
+            self.startup_timer.mark('window')
 
     def init_ui(self):
         """Initialize the UI"""
         # Create tab widget
         self.tabs = QTabWidget()
 
-        # Create tabs
+        # Create tabs; the Reports tab, which imports matplotlib, is built when first opened
         self.accounts_tab = AccountsTab(self.db)
         self.categories_tab = CategoriesTab(self.db)
-        self.transactions_tab = TransactionsTab(self.db)
-        self.reports_tab = ReportsTab(self.db)
+        self.transactions_tab = TransactionsTab(self.db, self.executor)
+        self.reports_tab = None
+        self.reports_placeholder = QWidget()
 
         # Add tabs
         self.tabs.addTab(self.accounts_tab, "Accounts")
         self.tabs.addTab(self.categories_tab, "Categories")
         self.tabs.addTab(self.transactions_tab, "Transactions")
-        self.tabs.addTab(self.reports_tab, "Reports")
+        self.tabs.addTab(self.reports_placeholder, "Reports")
+
+        # Tabs load their data when first shown, and changes made elsewhere only mark
+        # them stale (see refresh_tabs), so startup does not wait on the database
+        self.tab_loaders = {
+            self.accounts_tab: self.accounts_tab.load_accounts,
+            self.categories_tab: self.categories_tab.load_categories,
+            self.transactions_tab: self.transactions_tab.load_transactions,
+        }
+        self.stale_tabs = set(self.tab_loaders)
+        self.tabs.currentChanged.connect(self.on_tab_changed)
 
         # Connect signals to refresh related tabs
         self.accounts_tab.accounts_changed.connect(self.on_accounts_changed)
         self.categories_tab.categories_changed.connect(self.on_categories_changed)
         self.transactions_tab.transactions_changed.connect(self.on_transactions_changed)
 
+        # Every tab reloads after a restore swaps the data underneath it
+        self.database_restored.connect(lambda: self.refresh_tabs(*self.tab_loaders))
+
         self.setCentralWidget(self.tabs)
 
         # Add status bar with developer credit
         status_bar = QStatusBar()
         status_bar.showMessage("Developed by George Mikhael")
+        self.backup_status = QLabel()
+        status_bar.addPermanentWidget(self.backup_status)
         self.setStatusBar(status_bar)
 
     def create_menu_bar(self):
@@ -278,6 +358,10 @@ class MainWindow(QMainWindow):
         export_action = file_menu.addAction('Export to CSV...')
         export_action.triggered.connect(self.export_csv)
 
+        # Import JSON
+        import_json_action = file_menu.addAction('Import from JSON...')
+        import_json_action.triggered.connect(self.import_json)
+
         file_menu.addSeparator()
 
         # Backup
@@ -288,6 +372,14 @@ class MainWindow(QMainWindow):
         restore_action = file_menu.addAction('Restore from Backup...')
         restore_action.triggered.connect(self.restore_backup)
 
+        # Verify
+        verify_action = file_menu.addAction('Verify Backups...')
+        verify_action.triggered.connect(self.verify_backups)
+
+        # Automatic backups
+        auto_backup_action = file_menu.addAction('Automatic Backups...')
+        auto_backup_action.triggered.connect(self.configure_backups)
+
         file_menu.addSeparator()
 
         # Exit
@@ -319,24 +411,75 @@ class MainWindow(QMainWindow):
         about_action = help_menu.addAction('About')
         about_action.triggered.connect(self.show_about)
 
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if not self.first_paint_done:
+            self.first_paint_done = True
+            # Runs once this first frame has been drawn
+            QTimer.singleShot(0, self.finish_startup)
+
+    def finish_startup(self):
+        """Load the visible tab's data after the window first appears, and log startup timing"""
+        if self.startup_timer:
+            self.startup_timer.mark('first paint')
+        self.load_current_tab()
+        if self.startup_timer:
+            self.startup_timer.mark(f"{self.tabs.tabText(self.tabs.currentIndex()).lower()} data")
+            self.startup_timer.report(self.log_path)
+
+    def on_tab_changed(self, index):
+        """Build or load a tab the first time it is shown, or if it went stale while hidden"""
+        if self.tabs.widget(index) is self.reports_placeholder:
+            self.create_reports_tab()
+        if self.first_paint_done:
+            self.load_current_tab()
+
+    def create_reports_tab(self):
+        """Swap the Reports placeholder for the real tab"""
+        from ui.reports_tab import ReportsTab
+
+        index = self.tabs.indexOf(self.reports_placeholder)
+        self.reports_tab = ReportsTab(self.db, self.executor)
+        self.tabs.blockSignals(True)
+        self.tabs.removeTab(index)
+        self.tabs.insertTab(index, self.reports_tab, "Reports")
+        self.tabs.setCurrentIndex(index)
+        self.tabs.blockSignals(False)
+        self.reports_placeholder.deleteLater()
+        self.reports_placeholder = None
+        self.tab_loaders[self.reports_tab] = self.reports_tab.reload
+
+    def load_current_tab(self):
+        """Load the visible tab if it has not been loaded since it last changed"""
+        tab = self.tabs.currentWidget()
+        if tab in self.stale_tabs:
+            self.stale_tabs.discard(tab)
+            self.tab_loaders[tab]()
+
+    def refresh_tabs(self, *tabs):
+        """Reload tabs whose data changed: the visible one now, the others when next shown"""
+        self.stale_tabs.update(tabs)
+        if self.first_paint_done:
+            self.load_current_tab()
+
     def on_accounts_changed(self):
         """Refresh when accounts are modified"""
-        self.transactions_tab.load_filter_options()
+        self.refresh_tabs(self.transactions_tab)
 
     def on_categories_changed(self):
         """Refresh when categories are modified"""
-        self.transactions_tab.load_filter_options()
+        self.refresh_tabs(self.transactions_tab)
 
     def on_transactions_changed(self):
         """Refresh when transactions are modified"""
-        self.accounts_tab.load_accounts()
+        self.refresh_tabs(self.accounts_tab)
 
     def import_csv(self):
         """Import transactions from CSV"""
-        dialog = CSVImportDialog(self, self.db)
+        dialog = CSVImportDialog(self, self.db, self.executor)
         if dialog.exec_():
-            self.transactions_tab.load_transactions()
-            self.accounts_tab.load_accounts()
+            self.backup_scheduler.record_writes(dialog.imported_count)
+            self.refresh_tabs(self.transactions_tab, self.accounts_tab)
             QMessageBox.information(self, "Success", "Transactions imported and accounts updated")
 
     def export_csv(self):
@@ -349,17 +492,116 @@ class MainWindow(QMainWindow):
         )
 
         if filename:
-            try:
-                transactions = self.db.get_all_transactions()
-                if not transactions:
-                    QMessageBox.warning(self, "No Data", "No transactions to export")
-                    return
+            self.start_csv_export(filename, "Exported {count} transactions to {filename}")
+
+    def start_csv_export(self, filename, success_message):
+        """Stream all transactions to a CSV file on the query thread with a cancellable progress dialog"""
+        progress = QProgressDialog("Exporting transactions...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Export")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        from utils.csv_handler import CSVHandler
+
+        def export(db, report):
+            total = db.get_transaction_totals()['count']
+            if total == 0:
+                return 0
+            return CSVHandler.export_transactions(db.iter_transactions(), filename,
+                                                  total=total, progress_callback=report)
+
+        def on_progress(done, total):
+            if total > 0:
+                progress.setMaximum(total)
+            progress.setValue(done)
+
+        def finished(count):
+            progress.close()
+            if count == 0:
+                QMessageBox.warning(self, "No Data", "No transactions to export")
+            else:
+                QMessageBox.information(self, "Success", success_message.format(count=count, filename=filename))
 
-                CSVHandler.export_transactions(transactions, filename)
-                QMessageBox.information(self, "Success", f"Exported {len(transactions)} transactions to {filename}")
+        def failed(message):
+            progress.close()
+            QMessageBox.critical(self, "Error", f"Failed to export transactions: {message}")
 
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to export transactions: {str(e)}")
+        ticket = self.executor.submit(export, on_result=finished, on_error=failed, on_progress=on_progress)
+        progress.canceled.connect(lambda: self.executor.cancel(ticket))
+
+    def start_json_export(self, filename):
+        """Stream accounts, categories and transactions to JSON/NDJSON on the query thread"""
+        progress = QProgressDialog("Exporting data...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Export")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        # Compressed files are meant for machines, so skip the whitespace there too
+        compact = filename.lower().endswith('.gz')
+
+        def on_progress(done, total):
+            if total > 0:
+                progress.setMaximum(total)
+            progress.setValue(done)
+
+        def finished(counts):
+            progress.close()
+            if counts is not None:
+                QMessageBox.information(
+                    self, "Success",
+                    f"Exported {counts['accounts']} accounts, {counts['categories']} categories and "
+                    f"{counts['transactions']} transactions to:\n{filename}"
+                )
+
+        def failed(message):
+            progress.close()
+            QMessageBox.critical(self, "Error", f"Failed to save report: {message}")
+
+        ticket = self.executor.submit(
+            lambda db, report: JSONHandler.export_data(db, filename, compact=compact, progress_callback=report),
+            on_result=finished, on_error=failed, on_progress=on_progress
+        )
+        progress.canceled.connect(lambda: self.executor.cancel(ticket))
+
+    def import_json(self):
+        """Import accounts, categories and transactions from a JSON/NDJSON export"""
+        filename, _ = QFileDialog.getOpenFileName(
+            self,
+            "Import from JSON",
+            "",
+            "JSON Exports (*.json *.ndjson *.jsonl *.json.gz *.ndjson.gz);;All Files (*.*)"
+        )
+
+        if not filename:
+            return
+
+        progress = QProgressDialog("Importing data...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Import")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        def finished(counts):
+            progress.close()
+            if not counts:
+                return  # Cancelled and rolled back
+            self.backup_scheduler.record_writes(counts['transactions'])
+            self.refresh_tabs(self.accounts_tab, self.categories_tab, self.transactions_tab)
+            QMessageBox.information(
+                self, "Import Complete",
+                f"Imported {counts['accounts']} accounts, {counts['categories']} new categories and "
+                f"{counts['transactions']} transactions"
+            )
+
+        def failed(message):
+            progress.close()
+            QMessageBox.critical(self, "Error", f"Failed to import data: {message}")
+
+        ticket = self.executor.submit(
+            lambda db, report: JSONHandler.import_data(filename, db, progress_callback=report),
+            on_result=finished, on_error=failed,
+            on_progress=lambda done, total: progress.setLabelText(f"Imported {done} transactions...")
+        )
+        progress.canceled.connect(lambda: self.executor.cancel(ticket))
 
     def create_backup(self):
         """Create database backup"""
@@ -369,16 +611,39 @@ class MainWindow(QMainWindow):
             os.path.expanduser("~/Documents")
         )
 
-        if backup_location:
-            try:
-                backup_path = BackupManager.create_backup(self.db.db_path, backup_location)
+        if not backup_location:
+            return
+
+        progress = QProgressDialog("Backing up database...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Backup")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        def on_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+
+        def finished(backup_path):
+            progress.close()
+            if backup_path is not None:
                 QMessageBox.information(
                     self,
                     "Backup Created",
                     f"Database backup created successfully:\n{backup_path}"
                 )
-            except Exception as e:
-                QMessageBox.critical(self, "Error", f"Failed to create backup: {str(e)}")
+
+        def failed(message):
+            progress.close()
+            QMessageBox.critical(self, "Error", f"Failed to create backup: {message}")
+
+        # The online backup reads a consistent snapshot on the query thread while the
+        # window keeps working; the folder holds a repository that only stores changes
+        db_path = self.db.db_path
+        ticket = self.executor.submit(
+            lambda db, report: BackupManager.create_backup(db_path, backup_location, progress_callback=report),
+            on_result=finished, on_error=failed, on_progress=on_progress
+        )
+        progress.canceled.connect(lambda: self.executor.cancel(ticket))
 
     def restore_backup(self):
         """Restore database from backup"""
@@ -386,7 +651,7 @@ class MainWindow(QMainWindow):
             self,
             "Select Backup File",
             os.path.expanduser("~/Documents"),
-            "Database Files (*.db);;All Files (*.*)"
+            "Backups (*.json *.db);;All Files (*.*)"
         )
 
         if backup_file:
@@ -401,20 +666,104 @@ class MainWindow(QMainWindow):
             )
 
             if reply == QMessageBox.Yes:
-                try:
-                    BackupManager.restore_backup(backup_file, self.db.db_path, create_backup_of_current=True)
+                progress = QProgressDialog("Restoring backup...", None, 0, 0, self)
+                progress.setWindowTitle("Restore")
+                progress.setWindowModality(Qt.WindowModal)
+                progress.setMinimumDuration(500)
+
+                def on_progress(done, total):
+                    progress.setMaximum(total)
+                    progress.setValue(done)
+
+                def finished(_):
+                    # Reopen this thread's connection too, then reload every view
+                    self.db.close()
+                    self.db.connect()
+                    self.database_restored.emit()
+                    progress.close()
+                    QMessageBox.information(self, "Restore Complete", "Database restored successfully.")
+
+                def failed(message):
+                    progress.close()
+                    QMessageBox.critical(self, "Error", f"Failed to restore backup: {message}")
+
+                # The backup is verified and copied into the live database on the query thread
+                self.executor.submit(
+                    lambda db, report: BackupManager.restore_into(backup_file, db, create_backup_of_current=True,
+                                                                  progress_callback=report),
+                    on_result=finished, on_error=failed, on_progress=on_progress
+                )
+
+    def verify_backups(self):
+        """Verify every backup in a folder"""
+        backup_directory = QFileDialog.getExistingDirectory(
+            self,
+            "Select Backup Folder",
+            self.backup_scheduler.backup_directory()
+        )
+
+        if not backup_directory:
+            return
+
+        progress = QProgressDialog("Verifying backups...", "Cancel", 0, 0, self)
+        progress.setWindowTitle("Verify Backups")
+        progress.setWindowModality(Qt.WindowModal)
+        progress.setMinimumDuration(500)
+
+        def on_progress(done, total):
+            progress.setMaximum(total)
+            progress.setValue(done)
+
+        def finished(results):
+            progress.close()
+            failures = [result for result in results if not result['ok']]
+            message = f"Verified {len(results)} backups: {len(results) - len(failures)} OK, {len(failures)} failed"
+            if failures:
+                message += "\n\n" + "\n".join(
+                    f"{os.path.basename(result['path'])}: {result['problems'][0]}" for result in failures[:10]
+                )
+                QMessageBox.warning(self, "Verify Backups", message)
+            else:
+                QMessageBox.information(self, "Verify Backups", message)
+
+        def failed(message):
+            progress.close()
+            QMessageBox.critical(self, "Error", f"Failed to verify backups: {message}")
+
+        ticket = self.executor.submit(
+            lambda db, report: BackupManager.verify_all_backups(backup_directory, progress_callback=report),
+            on_result=finished, on_error=failed, on_progress=on_progress
+        )
+        progress.canceled.connect(lambda: self.executor.cancel(ticket))
 
-                    QMessageBox.information(
-                        self,
-                        "Restore Complete",
-                        "Database restored successfully.\n\n"
-                        "Please restart the application for changes to take effect."
-                    )
+    def configure_backups(self):
+        """Configure automatic backups"""
+        scheduler = self.backup_scheduler
+        settings_data = {key: scheduler.value(key) for key in BackupScheduler.DEFAULTS}
+        dialog = BackupSettingsDialog(self, settings_data, scheduler.default_directory())
+        if dialog.exec_():
+            for key, value in dialog.get_data().items():
+                scheduler.set_value(key, value)
+
+    def on_backup_finished(self, result):
+        """Show the time and size of the latest automatic backup"""
+        self.backup_status.setText(
+            f"Backed up at {result['created'][11:16]}: {result['size_mb']:.1f} MB, "
+            f"{result['stored_mb']:.2f} MB new, {result['elapsed']:.1f}s"
+        )
+        self.backup_status.setToolTip(result['path'])
 
-                    self.close()
+    def on_backup_failed(self, message):
+        """Surface automatic backup failures without interrupting the user"""
+        self.backup_status.setText("Automatic backup failed")
+        self.backup_status.setToolTip(message)
+        self.statusBar().showMessage(f"Automatic backup failed: {message}", 10000)
+        append_log(self.log_path, f"Automatic backup failed: {message}")
 
-                except Exception as e:
-                    QMessageBox.critical(self, "Error", f"Failed to restore backup: {str(e)}")
+    def on_background_error(self, message):
+        """Surface failures of background work that no caller handles"""
+        self.statusBar().showMessage(f"Background task failed: {message}", 10000)
+        append_log(self.log_path, f"Background query failed: {message}")
 
     def save_report(self):
         """Save current report with last used settings"""
@@ -442,7 +791,8 @@ class MainWindow(QMainWindow):
             self,
             "Save Report",
             f"{default_name}.pdf",
-            "PDF Files (*.pdf);;CSV Files (*.csv);;JSON Files (*.json);;All Files (*.*)"
+            "PDF Files (*.pdf);;CSV Files (*.csv);;JSON Files (*.json);;"
+            "NDJSON Files (*.ndjson);;Compressed JSON (*.json.gz *.ndjson.gz);;All Files (*.*)"
         )
 
         if filename:
@@ -455,22 +805,12 @@ class MainWindow(QMainWindow):
             file_ext = os.path.splitext(filename)[1].lower()
 
             if file_ext == '.csv':
-                # Export transactions to CSV
-                transactions = self.db.get_all_transactions()
-                CSVHandler.export_transactions(transactions, filename)
-                QMessageBox.information(self, "Success", f"Report saved to:\n{filename}")
-
-            elif file_ext == '.json':
-                # Export data to JSON
-                data = {
-                    'accounts': self.db.get_all_accounts(),
-                    'categories': self.db.get_all_categories(),
-                    'transactions': self.db.get_all_transactions(),
-                    'export_date': QDate.currentDate().toString('yyyy-MM-dd')
-                }
-                with open(filename, 'w') as f:
-                    json.dump(data, f, indent=2, default=str)
-                QMessageBox.information(self, "Success", f"Data exported to:\n{filename}")
+                # Stream transactions to CSV on the query thread
+                self.start_csv_export(filename, "Report saved to:\n{filename}")
+
+            elif filename.lower().endswith(('.json', '.json.gz')) or JSONHandler.is_ndjson(filename):
+                # Stream all data to JSON on the query thread
+                self.start_json_export(filename)
 
             elif file_ext == '.pdf':
                 # Save current report as PDF (requires matplotlib figure from reports tab)
@@ -482,7 +822,7 @@ class MainWindow(QMainWindow):
                                           "For data export, use CSV or JSON format.")
             else:
                 QMessageBox.warning(self, "Unsupported Format",
-                                   "Please use .csv, .json, or .pdf extension")
+                                   "Please use .csv, .json, .ndjson, .json.gz or .pdf extension")
 
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to save report: {str(e)}")
@@ -547,5 +887,7 @@ class MainWindow(QMainWindow):
     def closeEvent(self, event):
         """Handle window close event"""
         self.save_settings()
+        self.backup_scheduler.shutdown()
+        self.executor.shutdown()
         self.db.close()
         event.accept()
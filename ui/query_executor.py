@@ -0,0 +1,173 @@
+"""
+Query Executor - Run database operations off the GUI thread
+"""
+
+from PyQt5.QtCore import QObject, QThread, pyqtSignal, pyqtSlot
+from database.db_manager import DatabaseManager
+
+class _QueryWorker(QObject):
+    """Lives in the executor thread and owns that thread's database connection"""
+    finished = pyqtSignal(int, object)  # ticket, result
+    failed = pyqtSignal(int, str)  # ticket, error message
+    progress = pyqtSignal(int, int, int)  # ticket, done, total (-1 if unknown)
+
+    def __init__(self, db_path, cancelled):
+        super().__init__()
+        self.db_path = db_path
+        self.db = None
+        self.cancelled = cancelled
+        self.current_ticket = None
+
+    @pyqtSlot(int, object, bool)
+    def run(self, ticket, operation, with_progress):
+        """Run one operation against this thread's DatabaseManager"""
+        if ticket in self.cancelled:
+            self.cancelled.discard(ticket)
+            return
+
+        self.current_ticket = ticket
+        try:
+            if self.db is None:
+                # SQLite connections are bound to the thread that opened them
+                self.db = DatabaseManager(self.db_path, initialize=False)
+            if with_progress:
+                result = operation(self.db, lambda done, total=None: self.report_progress(ticket, done, total))
+            else:
+                result = operation(self.db)
+        except Exception as e:
+            self.failed.emit(ticket, str(e))
+        else:
+            self.finished.emit(ticket, result)
+        finally:
+            self.current_ticket = None
+
+    def report_progress(self, ticket, done, total):
+        """Forward progress to the GUI thread; returns False once the ticket is cancelled"""
+        self.progress.emit(ticket, done, -1 if total is None else total)
+        return ticket not in self.cancelled
+
+    def interrupt(self, ticket):
+        """Abort the running SQLite statement if it belongs to ticket (safe from any thread)"""
+        if self.current_ticket == ticket and self.db is not None:
+            self.db.conn.interrupt()
+
+    @pyqtSlot()
+    def shutdown(self):
+        """Close the connection and stop the thread's event loop"""
+        if self.db is not None:
+            self.db.close()
+            self.db = None
+        QThread.currentThread().quit()
+
+
+class QueryExecutor(QObject):
+    """
+    Runs DatabaseManager operations on a dedicated thread with its own connection
+
+    Operations are callables taking a DatabaseManager. Results are delivered back on
+    the GUI thread through the on_result/on_error callbacks; failures of operations
+    submitted without on_error are emitted as unhandled_error instead. Submitting to
+    a channel cancels whatever was previously submitted to that channel, so a
+    superseded request never delivers a stale result.
+    """
+    unhandled_error = pyqtSignal(str)  # Error message of an operation without on_error
+    _run = pyqtSignal(int, object, bool)
+    _shutdown = pyqtSignal()
+
+    def __init__(self, db_path, parent=None):
+        super().__init__(parent)
+        self.callbacks = {}  # ticket -> (channel, on_result, on_error)
+        self.progress_callbacks = {}  # ticket -> on_progress
+        self.channels = {}  # channel -> latest ticket
+        self.cancelled = set()
+        self.next_ticket = 1
+
+        self.thread = QThread()
+        self.worker = _QueryWorker(db_path, self.cancelled)
+        self.worker.moveToThread(self.thread)
+
+        self._run.connect(self.worker.run)
+        self._shutdown.connect(self.worker.shutdown)
+        self.worker.finished.connect(self._on_finished)
+        self.worker.failed.connect(self._on_failed)
+        self.worker.progress.connect(self._on_progress)
+
+        self.thread.start()
+
+    def submit(self, operation, on_result=None, on_error=None, channel=None, on_progress=None) -> int:
+        """
+        Queue an operation for the worker thread
+
+        Args:
+            operation: Callable receiving the worker's DatabaseManager (and, when
+                       on_progress is given, a progress(done, total) function that
+                       returns False once the operation has been cancelled)
+            on_result: Called on the GUI thread with the operation's return value
+            on_error: Called on the GUI thread with the error message
+            channel: Optional name; a newer submission cancels the older one
+            on_progress: Called on the GUI thread with (done, total); total is -1 if unknown
+
+        Returns:
+            Ticket that can be passed to cancel()
+        """
+        if channel is not None and channel in self.channels:
+            self.cancel(self.channels[channel])
+
+        ticket = self.next_ticket
+        self.next_ticket += 1
+        self.callbacks[ticket] = (channel, on_result, on_error)
+        if channel is not None:
+            self.channels[channel] = ticket
+        if on_progress is not None:
+            self.progress_callbacks[ticket] = on_progress
+
+        self._run.emit(ticket, operation, on_progress is not None)
+        return ticket
+
+    def cancel(self, ticket):
+        """Drop a pending operation, or interrupt it if it is already running"""
+        if ticket not in self.callbacks:
+            return
+
+        channel = self.callbacks.pop(ticket)[0]
+        if self.channels.get(channel) == ticket:
+            del self.channels[channel]
+        self.progress_callbacks.pop(ticket, None)
+
+        self.cancelled.add(ticket)
+        self.worker.interrupt(ticket)
+
+    def _pop_callbacks(self, ticket):
+        self.cancelled.discard(ticket)
+        if ticket not in self.callbacks:
+            return None  # Cancelled or superseded
+
+        channel, on_result, on_error = self.callbacks.pop(ticket)
+        if self.channels.get(channel) == ticket:
+            del self.channels[channel]
+        self.progress_callbacks.pop(ticket, None)
+        return on_result, on_error
+
+    def _on_progress(self, ticket, done, total):
+        on_progress = self.progress_callbacks.get(ticket)
+        if on_progress:
+            on_progress(done, total)
+
+    def _on_finished(self, ticket, result):
+        callbacks = self._pop_callbacks(ticket)
+        if callbacks and callbacks[0]:
+            callbacks[0](result)
+
+    def _on_failed(self, ticket, message):
+        callbacks = self._pop_callbacks(ticket)
+        if callbacks and callbacks[1]:
+            callbacks[1](message)
+        elif callbacks:
+            self.unhandled_error.emit(message)
+
+    def shutdown(self):
+        """Cancel outstanding work, close the worker connection and stop the thread"""
+        for ticket in list(self.callbacks):
+            self.cancel(ticket)
+        self._shutdown.emit()
+        self.thread.wait()
@@ -13,9 +13,11 @@ from datetime import datetime
 class ReportsTab(QWidget):
     """Reports and analytics tab"""
 
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, executor):
         super().__init__()
         self.db = db_manager
+        self.executor = executor
+        self.report_shown = False
         self.init_ui()
 
     def init_ui(self):
@@ -84,26 +86,54 @@ class ReportsTab(QWidget):
         year = int(self.year_selector.currentText())
         month = self.month_selector.currentData()
 
-        try:
-            if report_type == "Monthly Summary":
-                self.show_monthly_summary(year, month)
-            elif report_type == "Yearly Summary":
-                self.show_yearly_summary(year)
-            elif report_type == "Category Breakdown (Expenses)":
-                self.show_category_breakdown(year, month, 'expense')
-            elif report_type == "Category Breakdown (Income)":
-                self.show_category_breakdown(year, month, 'income')
-            elif report_type == "Monthly Trend":
-                self.show_monthly_trend()
-            elif report_type == "Account Balances":
-                self.show_account_balances()
+        # Each report fetches its data on the query thread and draws it on the GUI thread
+        if report_type == "Monthly Summary":
+            fetch = lambda db: db.get_monthly_summary(year, month)
+            show = lambda summary: self.show_monthly_summary(year, month, summary)
+        elif report_type == "Yearly Summary":
+            fetch = lambda db: db.get_yearly_summary(year)
+            show = lambda summary: self.show_yearly_summary(year, summary)
+        elif report_type in ("Category Breakdown (Expenses)", "Category Breakdown (Income)"):
+            transaction_type = 'expense' if report_type == "Category Breakdown (Expenses)" else 'income'
+            fetch = lambda db: db.get_monthly_category_breakdown(year, month, transaction_type)
+            show = lambda breakdown: self.show_category_breakdown(year, transaction_type, breakdown)
+        elif report_type == "Monthly Trend":
+            fetch = lambda db: db.get_monthly_trend(12)
+            show = self.show_monthly_trend
+        elif report_type == "Account Balances":
+            fetch = self.fetch_account_balances
+            show = self.show_account_balances
+        else:
+            return
 
+        self.summary_label.setText("Generating report...")
+        self.executor.submit(
+            fetch,
+            on_result=lambda data: self.render_report(show, data),
+            on_error=self.report_failed,
+            channel='report'
+        )
+
+    def render_report(self, show, data):
+        """Draw fetched report data"""
+        try:
+            show(data)
+            self.report_shown = True
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"Failed to generate report: {str(e)}")
+            self.report_failed(str(e))
 
-    def show_monthly_summary(self, year, month):
+    def reload(self):
+        """Regenerate the report on display, if any, after the data changed underneath it"""
+        if self.report_shown:
+            self.generate_report()
+
+    def report_failed(self, message):
+        """Show a report generation error"""
+        self.summary_label.setText("Select a report type and click 'Generate Report'")
+        QMessageBox.critical(self, "Error", f"Failed to generate report: {message}")
+
+    def show_monthly_summary(self, year, month, summary):
         """Show monthly income vs expense summary"""
-        summary = self.db.get_monthly_summary(year, month)
 
         # Update summary text
         month_name = self.month_selector.currentText()
@@ -136,9 +166,8 @@ class ReportsTab(QWidget):
 
         self.canvas.draw()
 
-    def show_yearly_summary(self, year):
+    def show_yearly_summary(self, year, summary):
         """Show yearly income vs expense summary"""
-        summary = self.db.get_yearly_summary(year)
 
         # Update summary text
         self.summary_label.setText(
@@ -170,16 +199,8 @@ class ReportsTab(QWidget):
 
         self.canvas.draw()
 
-    def show_category_breakdown(self, year, month, transaction_type):
+    def show_category_breakdown(self, year, transaction_type, breakdown):
         """Show pie chart of category breakdown"""
-        start_date = f"{year}-{month:02d}-01"
-        if month == 12:
-            end_date = f"{year + 1}-01-01"
-        else:
-            end_date = f"{year}-{month + 1:02d}-01"
-
-        breakdown = self.db.get_category_breakdown(start_date, end_date, transaction_type)
-
         if not breakdown:
             self.summary_label.setText(f"No {transaction_type} data for this period")
             self.figure.clear()
@@ -213,9 +234,8 @@ class ReportsTab(QWidget):
 
         self.canvas.draw()
 
-    def show_monthly_trend(self):
+    def show_monthly_trend(self, trend_data):
         """Show monthly income/expense trend for last 12 months"""
-        trend_data = self.db.get_monthly_trend(12)
 
         # Organize data by month
         months = {}
@@ -267,9 +287,19 @@ class ReportsTab(QWidget):
         self.figure.tight_layout()
         self.canvas.draw()
 
-    def show_account_balances(self):
+    @staticmethod
+    def fetch_account_balances(db):
+        """Fetch accounts and balance totals (runs on the query thread)"""
+        return {
+            'accounts': db.get_all_accounts(),
+            'cash_on_hand': db.get_cash_on_hand(),
+            'total_debit': db.get_total_by_type('debit'),
+            'total_credit': db.get_total_by_type('credit')
+        }
+
+    def show_account_balances(self, balances):
         """Show current account balances"""
-        accounts = self.db.get_all_accounts()
+        accounts = balances['accounts']
 
         if not accounts:
             self.summary_label.setText("No accounts available")
@@ -277,10 +307,9 @@ class ReportsTab(QWidget):
             self.canvas.draw()
             return
 
-        # Calculate totals
-        cash_on_hand = self.db.get_cash_on_hand()
-        total_debit = self.db.get_total_by_type('debit')
-        total_credit = self.db.get_total_by_type('credit')
+        cash_on_hand = balances['cash_on_hand']
+        total_debit = balances['total_debit']
+        total_credit = balances['total_credit']
 
         # Update summary text
         self.summary_label.setText(
@@ -0,0 +1,101 @@
+"""
+Transactions Table Model - Lazily fetched transactions for QTableView
+"""
+
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+from PyQt5.QtGui import QBrush
+
+class TransactionsTableModel(QAbstractTableModel):
+    """Table model that pages transactions in from SQLite as the view scrolls"""
+
+    # (transaction key, header label)
+    COLUMNS = [
+        ('id', 'ID'),
+        ('transaction_date', 'Date'),
+        ('account_name', 'Account'),
+        ('category_name', 'Category'),
+        ('transaction_type', 'Type'),
+        ('amount', 'Amount'),
+        ('description', 'Description'),
+    ]
+    CHUNK_SIZE = 500  # Rows fetched per fetchMore call
+
+    def __init__(self, db_manager, parent=None):
+        super().__init__(parent)
+        self.db = db_manager
+        self.filters = {}
+        self.order = 'date_desc'
+        self.total_count = 0
+        self.rows = []
+
+    def set_filters(self, filters, total_count, order='date_desc'):
+        """Reset the model to a new result set; rows are fetched on demand"""
+        self.beginResetModel()
+        self.filters = filters
+        self.order = order
+        self.total_count = total_count
+        self.rows = []
+        self.endResetModel()
+
+    def transaction_at(self, row):
+        """Get the transaction dict shown at a model row"""
+        if 0 <= row < len(self.rows):
+            return self.rows[row]
+        return None
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and len(self.rows) < self.total_count
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+
+        # Continue after the last row fetched rather than skipping len(rows) rows,
+        # which SQLite would step over one by one on every call
+        chunk = self.db.get_transactions_page(self.filters, limit=self.CHUNK_SIZE, order=self.order,
+                                              after=self.rows[-1] if self.rows else None)
+        if not chunk:
+            # Rows were removed since the count was taken; stop asking for more
+            self.total_count = len(self.rows)
+            return
+
+        first = len(self.rows)
+        self.beginInsertRows(QModelIndex(), first, first + len(chunk) - 1)
+        self.rows.extend(chunk)
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+
+        transaction = self.rows[index.row()]
+        key = self.COLUMNS[index.column()][0]
+
+        if role == Qt.DisplayRole:
+            value = transaction[key]
+            if key == 'id':
+                return str(value)
+            if key == 'transaction_type':
+                return value.capitalize()
+            if key == 'amount':
+                return f"${value:.2f}"
+            return value or ''
+
+        if role == Qt.ForegroundRole and key in ('transaction_type', 'amount'):
+            # Color code type and amount
+            if transaction['transaction_type'] == 'income':
+                return QBrush(Qt.darkGreen)
+            return QBrush(Qt.darkRed)
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.COLUMNS[section][1]
+        return super().headerData(section, orientation, role)
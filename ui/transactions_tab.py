@@ -3,21 +3,22 @@ Transactions Tab - Manage transactions with filtering
 """
 
 from PyQt5.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton,
-                             QTableWidget, QTableWidgetItem, QMessageBox, QHeaderView,
+                             QTableView, QMessageBox, QHeaderView,
                              QComboBox, QDateEdit, QLabel, QGroupBox)
 from PyQt5.QtCore import Qt, QDate, pyqtSignal
 from ui.dialogs import TransactionDialog
+from ui.transactions_model import TransactionsTableModel
 from datetime import datetime, timedelta
 
 class TransactionsTab(QWidget):
     """Transactions management tab"""
     transactions_changed = pyqtSignal()  # Signal when transactions are modified
 
-    def __init__(self, db_manager):
+    def __init__(self, db_manager, executor):
         super().__init__()
         self.db = db_manager
+        self.executor = executor
         self.init_ui()
-        self.load_transactions()
 
     def init_ui(self):
         layout = QVBoxLayout()
@@ -93,13 +94,14 @@ class TransactionsTab(QWidget):
 
         layout.addLayout(button_layout)
 
-        # Transactions table
-        self.table = QTableWidget()
-        self.table.setColumnCount(7)
-        self.table.setHorizontalHeaderLabels(['ID', 'Date', 'Account', 'Category', 'Type', 'Amount', 'Description'])
+        # Transactions table (rows are fetched lazily as the view scrolls)
+        self.model = TransactionsTableModel(self.db, self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
         self.table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
-        self.table.setSelectionBehavior(QTableWidget.SelectRows)
-        self.table.setEditTriggers(QTableWidget.NoEditTriggers)
+        self.table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.table.setSelectionBehavior(QTableView.SelectRows)
+        self.table.setEditTriggers(QTableView.NoEditTriggers)
         self.table.hideColumn(0)  # Hide ID column
         self.table.doubleClicked.connect(self.edit_transaction)
 
@@ -132,39 +134,46 @@ class TransactionsTab(QWidget):
         self.load_filter_options()
         self.apply_filters()
 
-    def apply_filters(self):
-        """Apply current filters to transaction list"""
-        try:
-            # Get all transactions
-            start_date = self.date_from.date().toString('yyyy-MM-dd')
-            end_date = self.date_to.date().toString('yyyy-MM-dd')
-            transactions = self.db.get_transactions_by_date_range(start_date, end_date)
+    def get_filters(self):
+        """Build the database filter dict from the current filter widgets"""
+        filters = {
+            'start_date': self.date_from.date().toString('yyyy-MM-dd'),
+            'end_date': self.date_to.date().toString('yyyy-MM-dd'),
+            'account_id': self.account_filter.currentData(),
+            'category_id': self.category_filter.currentData()
+        }
 
-            # Apply account filter
-            account_id = self.account_filter.currentData()
-            if account_id is not None:
-                transactions = [t for t in transactions if t['account_id'] == account_id]
+        type_text = self.type_filter.currentText()
+        if type_text != "All Types":
+            filters['transaction_type'] = type_text.lower()
 
-            # Apply category filter
-            category_id = self.category_filter.currentData()
-            if category_id is not None:
-                transactions = [t for t in transactions if t['category_id'] == category_id]
+        return filters
 
-            # Apply type filter
-            type_text = self.type_filter.currentText()
-            if type_text != "All Types":
-                transactions = [t for t in transactions if t['transaction_type'] == type_text.lower()]
+    def apply_filters(self):
+        """Apply current filters to transaction list"""
+        # Totals are computed on the query thread; a newer filter change supersedes this one
+        filters = self.get_filters()
+        self.executor.submit(
+            lambda db: db.get_transaction_totals(filters),
+            on_result=lambda totals: self.show_transactions(filters, totals),
+            on_error=lambda message: QMessageBox.critical(
+                self, "Error", f"Failed to load transactions: {message}"),
+            channel='transactions'
+        )
 
-            # Update table
-            self.display_transactions(transactions)
+    def show_transactions(self, filters, totals):
+        """Point the table at a filtered result set and update the summary"""
+        try:
+            # The model pages rows in as they are scrolled into view
+            self.model.set_filters(filters, totals['count'])
 
             # Update summary
-            total_income = sum(t['amount'] for t in transactions if t['transaction_type'] == 'income')
-            total_expense = sum(t['amount'] for t in transactions if t['transaction_type'] == 'expense')
+            total_income = totals['income']
+            total_expense = totals['expense']
             net = total_income - total_expense
 
             self.summary_label.setText(
-                f"Showing {len(transactions)} transactions | "
+                f"Showing {totals['count']} transactions | "
                 f"Income: ${total_income:.2f} | "
                 f"Expense: ${total_expense:.2f} | "
                 f"Net: ${net:.2f}"
@@ -173,33 +182,9 @@ class TransactionsTab(QWidget):
         except Exception as e:
             QMessageBox.critical(self, "Error", f"Failed to load transactions: {str(e)}")
 
-    def display_transactions(self, transactions):
-        """Display transactions in table"""
-        self.table.setRowCount(len(transactions))
-
-        for row, transaction in enumerate(transactions):
-            self.table.setItem(row, 0, QTableWidgetItem(str(transaction['id'])))
-            self.table.setItem(row, 1, QTableWidgetItem(transaction['transaction_date']))
-            self.table.setItem(row, 2, QTableWidgetItem(transaction['account_name']))
-            self.table.setItem(row, 3, QTableWidgetItem(transaction['category_name']))
-
-            # Color code type
-            type_item = QTableWidgetItem(transaction['transaction_type'].capitalize())
-            if transaction['transaction_type'] == 'income':
-                type_item.setForeground(Qt.darkGreen)
-            else:
-                type_item.setForeground(Qt.darkRed)
-            self.table.setItem(row, 4, type_item)
-
-            # Color code amount
-            amount_item = QTableWidgetItem(f"${transaction['amount']:.2f}")
-            if transaction['transaction_type'] == 'income':
-                amount_item.setForeground(Qt.darkGreen)
-            else:
-                amount_item.setForeground(Qt.darkRed)
-            self.table.setItem(row, 5, amount_item)
-
-            self.table.setItem(row, 6, QTableWidgetItem(transaction['description'] or ''))
+    def selected_transaction(self):
+        """Get the transaction dict for the currently selected row"""
+        return self.model.transaction_at(self.table.currentIndex().row())
 
     def clear_filters(self):
         """Reset all filters to default"""
@@ -241,12 +226,12 @@ class TransactionsTab(QWidget):
 
     def edit_transaction(self):
         """Open dialog to edit selected transaction"""
-        current_row = self.table.currentRow()
-        if current_row < 0:
+        selected = self.selected_transaction()
+        if selected is None:
             QMessageBox.warning(self, "No Selection", "Please select a transaction to edit")
             return
 
-        transaction_id = int(self.table.item(current_row, 0).text())
+        transaction_id = selected['id']
         transaction = self.db.get_transaction(transaction_id)
         accounts = self.db.get_all_accounts()
         categories = self.db.get_all_categories()
@@ -273,13 +258,13 @@ class TransactionsTab(QWidget):
 
     def delete_transaction(self):
         """Delete selected transaction"""
-        current_row = self.table.currentRow()
-        if current_row < 0:
+        selected = self.selected_transaction()
+        if selected is None:
             QMessageBox.warning(self, "No Selection", "Please select a transaction to delete")
             return
 
-        transaction_id = int(self.table.item(current_row, 0).text())
-        amount = self.table.item(current_row, 5).text()
+        transaction_id = selected['id']
+        amount = f"${selected['amount']:.2f}"
 
         reply = QMessageBox.question(
             self,
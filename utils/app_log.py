@@ -0,0 +1,29 @@
+"""
+Application Log - Short text log kept next to the database
+"""
+
+from datetime import datetime
+
+# Lines kept in the log; older ones are dropped as new ones are appended
+MAX_LOG_LINES = 200
+
+
+def append_log(log_path: str, message: str, max_lines: int = MAX_LOG_LINES):
+    """
+    Append message to log_path as one timestamped line
+
+    The packaged application has no console, so anything it would otherwise print
+    goes here. Only the newest max_lines lines are kept, and a log that cannot be
+    written is skipped silently, since logging must never take the application down.
+    """
+    line = f"{datetime.now().isoformat(timespec='seconds')} {message}\n"
+    try:
+        try:
+            with open(log_path, 'r', encoding='utf-8') as f:
+                lines = f.readlines()[-(max_lines - 1):]
+        except FileNotFoundError:
+            lines = []
+        with open(log_path, 'w', encoding='utf-8') as f:
+            f.writelines(lines + [line])
+    except OSError:
+        pass
@@ -2,32 +2,111 @@
 Backup and Restore Functionality
 """
 
+import hashlib
+import multiprocessing
 import shutil
+import sqlite3
 import os
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from database.migrations import SCHEMA_VERSION
+from utils.backup_catalog import BackupCatalog
+from utils.backup_repository import BackupRepository
 
 class BackupManager:
     """Handle database backup and restore operations"""
 
+    # Pages copied per step of the online backup (-1 copies everything in one step);
+    # progress is reported and cancellation checked between steps
+    BACKUP_PAGES = 1024
+
+    # Tables every restorable database must have
+    REQUIRED_TABLES = ('accounts', 'categories', 'transactions')
+
+    @staticmethod
+    def copy_database(db_path: str, dest_path: str, pages: int = BACKUP_PAGES,
+                      progress_callback: Callable[[int, int], bool] = None) -> bool:
+        """
+        Copy a database to a standalone file with SQLite's online backup API
+
+        Unlike a file copy this is safe while the application is writing, and it
+        includes changes still in the WAL. Every step reads from one read transaction,
+        so the copy is the snapshot at its start: under WAL, writers carry on
+        meanwhile instead of forcing the copy to restart (in rollback journal mode
+        they wait for it). The copy is written next to dest_path and only renamed
+        into place once complete.
+
+        Args:
+            db_path: Path to the database file
+            dest_path: Path of the copy
+            pages: Pages copied per backup step (see BACKUP_PAGES)
+            progress_callback: Called as (pages_copied, total_pages) after each step;
+                               returning False cancels the copy
+
+        Returns:
+            True if the copy was made, False if cancelled
+        """
+        partial_path = dest_path + '.partial'
+
+        class _Cancelled(Exception):
+            pass
+
+        def progress(status, remaining, total):
+            if progress_callback and progress_callback(total - remaining, total) is False:
+                raise _Cancelled()
+
+        source = dest = None
+        try:
+            source = sqlite3.connect(db_path)
+            dest = sqlite3.connect(partial_path)
+            # Pin the snapshot; backup steps run inside an already open read transaction
+            source.execute("BEGIN")
+            source.execute("SELECT COUNT(*) FROM sqlite_master").fetchone()
+            source.backup(dest, pages=pages, progress=progress)
+            # The copy inherits WAL mode from the source; make it a self-contained file
+            dest.execute("PRAGMA journal_mode = DELETE")
+            dest.close()
+            dest = None
+            os.replace(partial_path, dest_path)
+            return True
+        except _Cancelled:
+            return False
+        finally:
+            if source is not None:
+                source.close()
+            if dest is not None:
+                dest.close()
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
     @staticmethod
-    def create_backup(db_path: str, backup_location: str = None) -> str:
+    def create_backup(db_path: str, backup_location: str = None, pages: int = BACKUP_PAGES,
+                      progress_callback: Callable[[int, int], bool] = None,
+                      compression: str = 'zlib') -> Optional[str]:
         """
-        Create a backup of the database
+        Snapshot the database into the backup repository at backup_location
+
+        The database is copied with copy_database and the copy is stored in a
+        BackupRepository, which only writes the chunks earlier snapshots lack.
 
         Args:
             db_path: Path to the database file
-            backup_location: Directory to save backup (defaults to same directory as database)
+            backup_location: Repository directory (defaults to same directory as database)
+            pages: Pages copied per backup step (see BACKUP_PAGES)
+            progress_callback: Called as (done, total) through the copy and then the
+                               chunking, in pages; returning False cancels the backup
+            compression: 'zlib' or 'lzma' for newly stored chunks
 
         Returns:
-            Path to the backup file
+            Path to the snapshot manifest, or None if cancelled
         """
         if not os.path.exists(db_path):
             raise FileNotFoundError(f"Database file not found: {db_path}")
 
-        # Generate backup filename with timestamp
-        timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-        backup_filename = f"finance_backup_{timestamp}.db"
-
         # Determine backup location
         if backup_location is None:
             backup_location = os.path.dirname(db_path)
@@ -35,22 +114,70 @@ class BackupManager:
         # Ensure backup directory exists
         os.makedirs(backup_location, exist_ok=True)
 
-        backup_path = os.path.join(backup_location, backup_filename)
+        # Repair the catalog first; once this snapshot is cataloged it would look current
+        if not BackupCatalog(backup_location).is_current():
+            BackupManager.rescan_backups(backup_location)
+
+        fd, copy_path = tempfile.mkstemp(prefix='.snapshot_', suffix='.db', dir=backup_location)
+        os.close(fd)
+        page_count = [0]
+
+        def copy_progress(done, total):
+            page_count[0] = total
+            return progress_callback(done, total * 2)
+
+        def chunk_progress(done, total):
+            pages = page_count[0]
+            return progress_callback(pages + done * pages // max(total, 1), pages * 2)
 
         try:
-            # Copy database file
-            shutil.copy2(db_path, backup_path)
-            return backup_path
+            if not BackupManager.copy_database(db_path, copy_path, pages,
+                                                progress_callback and copy_progress):
+                return None
+            # Counted on the private copy, so the live database is not read twice
+            manifest = BackupRepository(backup_location).add_snapshot(
+                copy_path, compression, chunk_progress if progress_callback else None,
+                metadata=BackupManager.describe_database(copy_path)
+            )
+            return manifest['path'] if manifest else None
         except Exception as e:
             raise Exception(f"Failed to create backup: {str(e)}")
+        finally:
+            if os.path.exists(copy_path):
+                os.remove(copy_path)
+
+    @staticmethod
+    def _stage_backup(backup_path: str, staged_path: str):
+        """Write a backup out as a plain database file and verify it"""
+        if BackupRepository.is_manifest(backup_path):
+            BackupRepository.for_manifest(backup_path).restore_snapshot(backup_path, staged_path)
+        else:
+            shutil.copy2(backup_path, staged_path)
+
+        problems = BackupManager.check_database_file(
+            staged_path, BackupManager.expected_metadata(backup_path)
+        )['problems']
+        if problems:
+            raise ValueError("backup failed verification: " + "; ".join(problems))
+
+    @staticmethod
+    def _remove_staged(staged_path: str):
+        for suffix in ('', '-wal', '-shm', '-journal'):
+            if os.path.exists(staged_path + suffix):
+                os.remove(staged_path + suffix)
 
     @staticmethod
     def restore_backup(backup_path: str, db_path: str, create_backup_of_current: bool = True) -> bool:
         """
         Restore database from backup
 
+        The backup is first written next to the database and checked with
+        check_database_file; the current database is only replaced if it passes.
+        Every connection to the database must be closed; see restore_into for
+        restoring while the application is running.
+
         Args:
-            backup_path: Path to the backup file
+            backup_path: Snapshot manifest, or a single-file backup from earlier versions
             db_path: Path to the current database file
             create_backup_of_current: Whether to backup current database before restoring
 
@@ -60,30 +187,315 @@ class BackupManager:
         if not os.path.exists(backup_path):
             raise FileNotFoundError(f"Backup file not found: {backup_path}")
 
+        staged_path = db_path + '.restoring'
         try:
+            BackupManager._stage_backup(backup_path, staged_path)
+
             # Optionally backup current database before restoring
             if create_backup_of_current and os.path.exists(db_path):
                 current_backup_dir = os.path.join(os.path.dirname(db_path), 'pre_restore_backups')
                 os.makedirs(current_backup_dir, exist_ok=True)
                 BackupManager.create_backup(db_path, current_backup_dir)
 
-            # Restore from backup
-            shutil.copy2(backup_path, db_path)
+            # Drop any WAL left from the old database so it is not replayed onto the restored file
+            for suffix in ('-wal', '-shm'):
+                if os.path.exists(db_path + suffix):
+                    os.remove(db_path + suffix)
+
+            os.replace(staged_path, db_path)
             return True
 
         except Exception as e:
             raise Exception(f"Failed to restore backup: {str(e)}")
+        finally:
+            BackupManager._remove_staged(staged_path)
+
+    @staticmethod
+    def restore_into(backup_path: str, db_manager, create_backup_of_current: bool = True,
+                     progress_callback: Callable[[int, int], bool] = None) -> bool:
+        """
+        Restore a backup into an open database without restarting the application
+
+        The backup is staged and verified as in restore_backup, then copied into
+        the live file through db_manager's connection (see
+        DatabaseManager.restore_from). Other connections stay open and see the
+        restored contents on their next read.
+
+        Args:
+            backup_path: Snapshot manifest, or a single-file backup from earlier versions
+            db_manager: DatabaseManager whose connection performs the restore
+            create_backup_of_current: Whether to backup current database before restoring
+            progress_callback: Called as (pages_copied, total_pages) while copying;
+                               returning False aborts, leaving the current database
+
+        Returns:
+            True if successful
+        """
+        if not os.path.exists(backup_path):
+            raise FileNotFoundError(f"Backup file not found: {backup_path}")
+
+        db_path = db_manager.db_path
+        staged_path = db_path + '.restoring'
+        try:
+            BackupManager._stage_backup(backup_path, staged_path)
+
+            # Optionally backup current database before restoring
+            if create_backup_of_current:
+                current_backup_dir = os.path.join(os.path.dirname(db_path), 'pre_restore_backups')
+                os.makedirs(current_backup_dir, exist_ok=True)
+                BackupManager.create_backup(db_path, current_backup_dir)
+
+            db_manager.restore_from(staged_path, BackupManager.BACKUP_PAGES, progress_callback)
+            return True
+
+        except Exception as e:
+            raise Exception(f"Failed to restore backup: {str(e)}")
+        finally:
+            BackupManager._remove_staged(staged_path)
+
+    @staticmethod
+    def expected_metadata(backup_path: str) -> Dict:
+        """
+        What a backup should contain: its catalog entry, else its manifest
+
+        Returns:
+            Dictionary that may hold sha256, schema_version and row_counts; empty for
+            uncataloged single-file backups
+        """
+        if BackupRepository.is_manifest(backup_path):
+            entry = BackupRepository.for_manifest(backup_path).catalog.get(backup_path)
+            return entry or BackupRepository.load_manifest(backup_path)
+        return BackupCatalog(os.path.dirname(os.path.abspath(backup_path))).get(backup_path) or {}
+
+    @staticmethod
+    def check_database_file(db_path: str, expected: Dict, full: bool = False) -> Dict:
+        """
+        Check a standalone database file against what its backup recorded
+
+        Args:
+            db_path: Database file to check (opened read-only)
+            expected: Recorded sha256, schema_version and row_counts; missing keys
+                      are not compared
+            full: Run PRAGMA integrity_check instead of the faster quick_check, which
+                  skips verifying that indexes match their tables
+
+        Returns:
+            Dictionary with problems (empty if the file is sound), schema_version and
+            row_counts
+        """
+        problems = []
+        result = {'problems': problems, 'schema_version': None, 'row_counts': None}
+
+        if expected.get('sha256') and BackupManager.file_sha256(db_path) != expected['sha256']:
+            problems.append("content hash does not match the one recorded at backup time")
+
+        try:
+            conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+            try:
+                check = 'integrity_check' if full else 'quick_check'
+                messages = [row[0] for row in conn.execute(f"PRAGMA {check}(20)")]
+            finally:
+                conn.close()
+            if messages != ['ok']:
+                problems.extend(f"{check}: {message}" for message in messages)
+                return result
+
+            info = BackupManager.describe_database(db_path)
+        except sqlite3.Error as e:
+            problems.append(f"not a readable database: {e}")
+            return result
+
+        result.update(info)
+        if info['schema_version'] > SCHEMA_VERSION:
+            problems.append(f"schema version {info['schema_version']} is newer than this "
+                            f"application supports ({SCHEMA_VERSION})")
+        missing = [table for table in BackupManager.REQUIRED_TABLES if table not in info['row_counts']]
+        if missing:
+            problems.append(f"missing tables: {', '.join(missing)}")
+
+        if expected.get('schema_version') is not None and info['schema_version'] != expected['schema_version']:
+            problems.append(f"schema version {info['schema_version']} does not match the "
+                            f"recorded {expected['schema_version']}")
+        for table, count in (expected.get('row_counts') or {}).items():
+            actual = info['row_counts'].get(table)
+            if actual != count:
+                problems.append(f"{table} has {actual if actual is not None else 'no'} rows, "
+                                f"{count} recorded")
+        return result
+
+    @staticmethod
+    def verify_backup(backup_path: str, full: bool = False) -> Dict:
+        """
+        Verify a backup without restoring it
+
+        Snapshots are reassembled into a temporary file (which also checks every
+        chunk's hash); single-file backups are checked in place. See
+        check_database_file for the checks made.
+
+        Args:
+            backup_path: Snapshot manifest or single-file backup
+            full: Run integrity_check rather than quick_check
+
+        Returns:
+            Dictionary with path, ok, problems, schema_version, row_counts and elapsed
+        """
+        start_time = time.perf_counter()
+        result = {'path': backup_path}
+        try:
+            expected = BackupManager.expected_metadata(backup_path)
+            if BackupRepository.is_manifest(backup_path):
+                fd, db_file = tempfile.mkstemp(prefix='verify_', suffix='.db')
+                os.close(fd)
+                try:
+                    BackupRepository.for_manifest(backup_path).restore_snapshot(backup_path, db_file)
+                    result.update(BackupManager.check_database_file(db_file, expected, full))
+                finally:
+                    os.remove(db_file)
+            else:
+                result.update(BackupManager.check_database_file(backup_path, expected, full))
+        except Exception as e:
+            result.update(problems=[str(e)], schema_version=None, row_counts=None)
+
+        result['ok'] = not result['problems']
+        result['elapsed'] = time.perf_counter() - start_time
+        return result
 
     @staticmethod
-    def list_backups(backup_directory: str) -> list:
+    def verify_all_backups(backup_directory: str, full: bool = False, workers: int = None,
+                           progress_callback: Callable[[int, int], bool] = None) -> List[Dict]:
         """
-        List all backup files in a directory
+        Verify every backup in a directory, several at a time in a process pool
+
+        The packaged executable verifies in a thread pool instead: spawned workers
+        would start by unpacking and re-running the whole application. Hashing,
+        decompression and SQLite's checks release the GIL, so threads still overlap.
+
+        Args:
+            backup_directory: Directory holding the backups
+            full: Run integrity_check rather than quick_check
+            workers: Number of verifiers (defaults to the CPU count)
+            progress_callback: Called as (verified, total) as each backup finishes;
+                               returning False stops before the remaining backups
+
+        Returns:
+            verify_backup results for the backups verified, newest backup first
+        """
+        # Verify what is on disk, not what the catalog last saw
+        backups = BackupManager.list_backups(backup_directory, refresh=True)
+        if not backups:
+            return []
+        workers = min(workers or os.cpu_count() or 1, len(backups))
+
+        results = {}
+        if getattr(sys, 'frozen', False):
+            pool = ThreadPoolExecutor(max_workers=workers)
+        else:
+            # Spawned workers are safe to start from the GUI's query thread, unlike forked ones
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+        try:
+            futures = [pool.submit(BackupManager.verify_backup, backup['filepath'], full)
+                       for backup in backups]
+            for future in as_completed(futures):
+                result = future.result()
+                results[result['path']] = result
+                if progress_callback and progress_callback(len(results), len(backups)) is False:
+                    break
+        finally:
+            pool.shutdown(cancel_futures=True)
+
+        return [results[backup['filepath']] for backup in backups if backup['filepath'] in results]
+
+    @staticmethod
+    def describe_database(db_path: str) -> Dict:
+        """
+        Read the schema version and per-table row counts of a database file
+
+        Args:
+            db_path: Path to the database file (opened read-only)
+
+        Returns:
+            Dictionary with schema_version and row_counts ({table: rows})
+        """
+        conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        try:
+            tables = [row[0] for row in conn.execute(
+                "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%' ORDER BY name"
+            )]
+            return {
+                'schema_version': conn.execute("PRAGMA user_version").fetchone()[0],
+                'row_counts': {
+                    table: conn.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0]
+                    for table in tables
+                }
+            }
+        finally:
+            conn.close()
+
+    @staticmethod
+    def file_sha256(path: str) -> str:
+        """SHA-256 of a file's contents, read in blocks"""
+        digest = hashlib.sha256()
+        with open(path, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def rescan_backups(backup_directory: str) -> int:
+        """
+        Rebuild the backup catalog of a directory from the files on disk
+
+        Snapshot metadata is read back from the manifests. Single-file backups from
+        earlier versions are hashed and counted, so a rescan of a directory holding
+        many of them takes a while.
+
+        Args:
+            backup_directory: Directory holding the backups
+
+        Returns:
+            Number of backups cataloged
+        """
+        try:
+            legacy_entries = {}
+            for filename in BackupCatalog(backup_directory).legacy_files():
+                filepath = os.path.join(backup_directory, filename)
+                size = os.path.getsize(filepath)
+                entry = {
+                    'kind': 'file',
+                    'created': datetime.fromtimestamp(os.path.getctime(filepath)).isoformat(timespec='seconds'),
+                    'size': size,
+                    'stored_bytes': size,
+                    'sha256': BackupManager.file_sha256(filepath),
+                }
+                try:
+                    entry.update(BackupManager.describe_database(filepath))
+                except sqlite3.Error:
+                    pass  # Cataloged anyway; verification reports the damage
+                legacy_entries[filepath] = entry
+
+            snapshot_count = BackupRepository(backup_directory).rescan(legacy_entries)
+            return snapshot_count + len(legacy_entries)
+        except Exception as e:
+            raise Exception(f"Failed to rescan backups: {str(e)}")
+
+    @staticmethod
+    def list_backups(backup_directory: str, refresh: bool = False) -> list:
+        """
+        List the snapshots of the repository in a directory, plus any single-file
+        backups from earlier versions
+
+        Listings come from the directory's BackupCatalog; it is rebuilt first if
+        missing or out of date with the snapshots on disk.
 
         Args:
             backup_directory: Directory to search for backups
+            refresh: Rebuild the catalog regardless, picking up single-file backups
+                     added or removed by hand
 
         Returns:
-            List of tuples: (filename, filepath, size_mb, created_time)
+            List of dicts with filename, filepath (manifest or file), kind ('snapshot'
+            or 'file'), size_mb (database size), stored_mb (new data the backup added
+            to the directory), created_time, sha256, schema_version and row_counts
         """
         backups = []
 
@@ -91,34 +503,38 @@ class BackupManager:
             return backups
 
         try:
-            for filename in os.listdir(backup_directory):
-                if filename.startswith('finance_backup_') and filename.endswith('.db'):
-                    filepath = os.path.join(backup_directory, filename)
-                    size_mb = os.path.getsize(filepath) / (1024 * 1024)
-                    created_time = datetime.fromtimestamp(os.path.getctime(filepath))
-
-                    backups.append({
-                        'filename': filename,
-                        'filepath': filepath,
-                        'size_mb': size_mb,
-                        'created_time': created_time
-                    })
-
-            # Sort by creation time (newest first)
-            backups.sort(key=lambda x: x['created_time'], reverse=True)
+            catalog = BackupCatalog(backup_directory)
+            if refresh or not catalog.is_current():
+                BackupManager.rescan_backups(backup_directory)
+
+            for entry in catalog.entries():
+                backups.append({
+                    'filename': os.path.basename(entry['filepath']),
+                    'filepath': entry['filepath'],
+                    'kind': entry['kind'],
+                    'size_mb': entry['size'] / (1024 * 1024),
+                    'stored_mb': entry['stored_bytes'] / (1024 * 1024),
+                    'created_time': datetime.fromisoformat(entry['created']),
+                    'sha256': entry.get('sha256'),
+                    'schema_version': entry.get('schema_version'),
+                    'row_counts': entry.get('row_counts')
+                })
 
         except Exception as e:
             raise Exception(f"Failed to list backups: {str(e)}")
 
+        # Catalog entries are newest first
         return backups
 
     @staticmethod
     def delete_backup(backup_path: str) -> bool:
         """
-        Delete a backup file
+        Delete a backup
+
+        Deleting a snapshot also removes the chunks no other snapshot uses.
 
         Args:
-            backup_path: Path to the backup file to delete
+            backup_path: Snapshot manifest or single-file backup to delete
 
         Returns:
             True if successful
@@ -127,22 +543,91 @@ class BackupManager:
             raise FileNotFoundError(f"Backup file not found: {backup_path}")
 
         try:
-            os.remove(backup_path)
+            if BackupRepository.is_manifest(backup_path):
+                BackupRepository.for_manifest(backup_path).delete_snapshot(backup_path)
+            else:
+                os.remove(backup_path)
+                BackupCatalog(os.path.dirname(os.path.abspath(backup_path))).remove([backup_path])
             return True
         except Exception as e:
             raise Exception(f"Failed to delete backup: {str(e)}")
 
+    @staticmethod
+    def apply_retention(backup_directory: str, keep_hourly: int = 24, keep_daily: int = 7,
+                        keep_weekly: int = 4) -> list:
+        """
+        Prune the repository snapshots in a directory down to a retention policy
+
+        The newest snapshot of each of the last keep_hourly hours, keep_daily days and
+        keep_weekly ISO weeks that have any snapshots is kept, as is the newest snapshot
+        overall; the rest are deleted and their unreferenced chunks collected.
+        Single-file backups from earlier versions are never touched.
+
+        Args:
+            backup_directory: Directory holding the backup repository
+            keep_hourly: Number of hourly buckets to keep
+            keep_daily: Number of daily buckets to keep
+            keep_weekly: Number of weekly buckets to keep
+
+        Returns:
+            List of the deleted manifest paths
+        """
+        snapshots = [backup for backup in BackupManager.list_backups(backup_directory)
+                     if backup['kind'] == 'snapshot']
+        if not snapshots:
+            return []
+
+        # Snapshots are newest first, so the first one seen in a bucket is the one kept
+        keep = {snapshots[0]['filepath']}
+        for count, bucket_format in ((keep_hourly, '%Y-%m-%d %H'), (keep_daily, '%Y-%m-%d'),
+                                     (keep_weekly, '%G-%V')):
+            buckets = set()
+            for backup in snapshots:
+                if len(buckets) >= count:
+                    break
+                bucket = backup['created_time'].strftime(bucket_format)
+                if bucket not in buckets:
+                    buckets.add(bucket)
+                    keep.add(backup['filepath'])
+
+        try:
+            deleted = [backup['filepath'] for backup in snapshots if backup['filepath'] not in keep]
+            if deleted:
+                BackupRepository(backup_directory).delete_snapshots(deleted)
+            return deleted
+        except Exception as e:
+            raise Exception(f"Failed to apply backup retention: {str(e)}")
+
     @staticmethod
     def get_database_info(db_path: str) -> dict:
         """
         Get information about the database file
 
+        For a cataloged backup the recorded metadata is returned without touching
+        the backup itself.
+
         Args:
-            db_path: Path to the database file
+            db_path: Path to the database file, snapshot manifest or backup file
 
         Returns:
             Dictionary with database information
         """
+        if BackupRepository.is_manifest(db_path):
+            catalog = BackupRepository.for_manifest(db_path).catalog
+        else:
+            catalog = BackupCatalog(os.path.dirname(os.path.abspath(db_path)))
+        entry = catalog.get(db_path)
+        if entry is not None:
+            return {
+                'exists': True,
+                'path': db_path,
+                'size_mb': entry['size'] / (1024 * 1024),
+                'last_modified': datetime.fromisoformat(entry['created']),
+                'sha256': entry.get('sha256'),
+                'schema_version': entry.get('schema_version'),
+                'row_counts': entry.get('row_counts')
+            }
+
         if not os.path.exists(db_path):
             return {
                 'exists': False,
@@ -0,0 +1,137 @@
+"""
+Backup Catalog - Cached index of the backups in a directory
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Iterable, List, Optional
+
+# Serializes read-modify-write cycles on catalog files within the process
+_catalog_lock = threading.RLock()
+
+class BackupCatalog:
+    """
+    JSON index of the backups in a directory, kept in <root>/catalog.json
+
+    Every backup written or deleted through BackupManager updates its entry, so a
+    listing reads one small file instead of opening every manifest or statting every
+    backup. Entries hold the metadata recorded when the backup was made: size,
+    stored size, creation time, SHA-256 of the database, schema version and row
+    counts per table.
+
+    The catalog also records the modification time of the snapshots folder. If it no
+    longer matches (a snapshot was added or removed by hand, or the application
+    stopped between writing a manifest and cataloging it) is_current() returns
+    False and the caller rescans the directory to repair it. Single-file backups
+    in the root folder are only written by earlier versions, so rather than listing
+    the root folder on every check they are picked up by an explicit rescan (see
+    BackupManager.list_backups).
+    """
+
+    FORMAT_NAME = 'finance-backup-catalog'
+    FORMAT_VERSION = 1
+    FILENAME = 'catalog.json'
+    # Single-file backups made by earlier versions: finance_backup_<timestamp>.db
+    LEGACY_PREFIX = 'finance_backup_'
+    LEGACY_SUFFIX = '.db'
+
+    def __init__(self, root: str):
+        self.root = root
+        self.path = os.path.join(root, self.FILENAME)
+        self.snapshots_dir = os.path.join(root, 'snapshots')
+
+    def _snapshots_mtime(self) -> Optional[int]:
+        try:
+            return os.stat(self.snapshots_dir).st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def legacy_files(self) -> List[str]:
+        """Names of the single-file backups in the root folder, sorted"""
+        try:
+            names = os.listdir(self.root)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names
+                      if name.startswith(self.LEGACY_PREFIX) and name.endswith(self.LEGACY_SUFFIX))
+
+    def _load(self) -> Optional[Dict]:
+        """Read the catalog file, or None if it is missing or unreadable"""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                catalog = json.load(f)
+        except (OSError, ValueError):
+            return None
+        if catalog.get('format') != self.FORMAT_NAME or catalog.get('version') != self.FORMAT_VERSION:
+            return None
+        return catalog
+
+    def _save(self, entries: Dict[str, Dict]):
+        """Write the catalog, recording the current state of the backup folders"""
+        catalog = {
+            'format': self.FORMAT_NAME,
+            'version': self.FORMAT_VERSION,
+            'snapshots_mtime_ns': self._snapshots_mtime(),
+            'entries': entries,
+        }
+        partial_path = self.path + '.partial'
+        with open(partial_path, 'w', encoding='utf-8') as f:
+            json.dump(catalog, f, indent=1)
+        os.replace(partial_path, self.path)
+
+    def is_current(self) -> bool:
+        """Check whether the catalog exists and matches the backup folders"""
+        catalog = self._load()
+        return catalog is not None and catalog['snapshots_mtime_ns'] == self._snapshots_mtime()
+
+    def entries(self) -> List[Dict]:
+        """All cataloged backups, newest first, with 'filepath' filled in"""
+        catalog = self._load()
+        if catalog is None:
+            return []
+
+        entries = []
+        for key, entry in catalog['entries'].items():
+            entries.append(dict(entry, filepath=os.path.join(self.root, key)))
+        entries.sort(key=lambda entry: (entry['created'], entry['filepath']), reverse=True)
+        return entries
+
+    def get(self, backup_path: str) -> Optional[Dict]:
+        """Look up one backup by path without scanning anything"""
+        catalog = self._load()
+        if catalog is None:
+            return None
+        entry = catalog['entries'].get(os.path.relpath(os.path.abspath(backup_path), self.root))
+        return dict(entry, filepath=backup_path) if entry else None
+
+    def add(self, backup_path: str, entry: Dict):
+        """Record a new backup; call after it has been written"""
+        with _catalog_lock:
+            catalog = self._load()
+            entries = catalog['entries'] if catalog else {}
+            entries[os.path.relpath(os.path.abspath(backup_path), self.root)] = entry
+            self._save(entries)
+
+    def remove(self, backup_paths: Iterable[str]):
+        """Forget backups; call after they have been deleted"""
+        with _catalog_lock:
+            catalog = self._load()
+            if catalog is None:
+                return
+            for backup_path in backup_paths:
+                catalog['entries'].pop(os.path.relpath(os.path.abspath(backup_path), self.root), None)
+            self._save(catalog['entries'])
+
+    def replace(self, entries: Dict[str, Dict]):
+        """
+        Overwrite the catalog with freshly scanned entries
+
+        Args:
+            entries: Entries keyed by backup path
+        """
+        with _catalog_lock:
+            self._save({
+                os.path.relpath(os.path.abspath(backup_path), self.root): entry
+                for backup_path, entry in entries.items()
+            })
@@ -0,0 +1,268 @@
+"""
+Content-Addressed Backup Repository
+"""
+
+import hashlib
+import json
+import lzma
+import os
+import threading
+import zlib
+from datetime import datetime
+from typing import Callable, Dict, List, Optional
+from utils.backup_catalog import BackupCatalog
+
+# Serializes snapshot writes and garbage collection within the process, so a collection
+# never deletes chunks a snapshot has written but not yet referenced from its manifest
+_repository_lock = threading.Lock()
+
+class BackupRepository:
+    """
+    Deduplicated, compressed store of database snapshots
+
+    A snapshot is split into fixed CHUNK_SIZE chunks. Since SQLite pages never move
+    unless the database is vacuumed, unchanged pages produce byte-identical chunks
+    from one snapshot to the next. Each chunk is stored once under its SHA-256 and
+    a per-snapshot manifest lists the chunks in order, so a daily backup of a
+    database that changed a little costs a few chunks rather than a full copy.
+
+    Layout:
+        <root>/chunks/<first 2 hex digits>/<sha256>   one compressed chunk each
+        <root>/snapshots/finance_backup_<ts>.json     one manifest per snapshot
+        <root>/catalog.json                           BackupCatalog of the snapshots
+    """
+
+    FORMAT_NAME = 'finance-backup-snapshot'
+    FORMAT_VERSION = 1
+    # A multiple of every SQLite page size up to the 64 KB maximum
+    CHUNK_SIZE = 64 * 1024
+    COMPRESSORS = {
+        'zlib': (b'Z', lambda data: zlib.compress(data, 6), zlib.decompress),
+        'lzma': (b'X', lzma.compress, lzma.decompress),
+    }
+
+    def __init__(self, root: str):
+        self.root = root
+        self.chunks_dir = os.path.join(root, 'chunks')
+        self.snapshots_dir = os.path.join(root, 'snapshots')
+        self.catalog = BackupCatalog(root)
+
+    @staticmethod
+    def is_manifest(path: str) -> bool:
+        """Check whether a path names a snapshot manifest"""
+        return (path.endswith('.json')
+                and os.path.basename(os.path.dirname(os.path.abspath(path))) == 'snapshots')
+
+    @staticmethod
+    def for_manifest(manifest_path: str) -> 'BackupRepository':
+        """Open the repository a manifest belongs to"""
+        return BackupRepository(os.path.dirname(os.path.dirname(os.path.abspath(manifest_path))))
+
+    def _chunk_path(self, digest: str) -> str:
+        return os.path.join(self.chunks_dir, digest[:2], digest)
+
+    @staticmethod
+    def _write_atomic(path: str, data: bytes):
+        """Write a file under a temporary name and rename it into place"""
+        partial_path = path + '.partial'
+        with open(partial_path, 'wb') as f:
+            f.write(data)
+        os.replace(partial_path, path)
+
+    def _new_manifest_path(self) -> str:
+        """Timestamped manifest name, suffixed if a snapshot was taken in the same second"""
+        stem = f"finance_backup_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+        path = os.path.join(self.snapshots_dir, f"{stem}.json")
+        suffix = 1
+        while os.path.exists(path):
+            suffix += 1
+            path = os.path.join(self.snapshots_dir, f"{stem}_{suffix}.json")
+        return path
+
+    def add_snapshot(self, db_file: str, compression: str = 'zlib',
+                     progress_callback: Callable[[int, int], bool] = None,
+                     metadata: Dict = None) -> Optional[Dict]:
+        """
+        Store a consistent database file (such as an online backup copy) as a snapshot
+
+        Args:
+            db_file: Database file to store; it must not change while being read
+            compression: 'zlib' (fast) or 'lzma' (smaller) for newly stored chunks
+            progress_callback: Called as (bytes_done, total_bytes) after each chunk;
+                               returning False cancels without writing a manifest
+            metadata: Extra fields for the manifest and catalog, such as row counts
+
+        Returns:
+            The manifest, with its path under 'path', or None if cancelled
+        """
+        if compression not in self.COMPRESSORS:
+            raise ValueError(f"Unknown compression: {compression}")
+        tag, compress, _ = self.COMPRESSORS[compression]
+
+        size = os.path.getsize(db_file)
+        chunks = []
+        file_hash = hashlib.sha256()
+        new_chunks = 0
+        stored_bytes = 0
+
+        with _repository_lock:
+            os.makedirs(self.snapshots_dir, exist_ok=True)
+            with open(db_file, 'rb') as f:
+                for data in iter(lambda: f.read(self.CHUNK_SIZE), b''):
+                    digest = hashlib.sha256(data).hexdigest()
+                    file_hash.update(data)
+                    chunk_path = self._chunk_path(digest)
+                    if not os.path.exists(chunk_path):
+                        os.makedirs(os.path.dirname(chunk_path), exist_ok=True)
+                        packed = tag + compress(data)
+                        self._write_atomic(chunk_path, packed)
+                        new_chunks += 1
+                        stored_bytes += len(packed)
+                    chunks.append(digest)
+
+                    if progress_callback and progress_callback(f.tell(), size) is False:
+                        return None  # Chunks already written are reused or collected later
+
+            manifest = {
+                **(metadata or {}),
+                'format': self.FORMAT_NAME,
+                'version': self.FORMAT_VERSION,
+                'created': datetime.now().isoformat(timespec='seconds'),
+                'size': size,
+                'sha256': file_hash.hexdigest(),
+                'chunk_size': self.CHUNK_SIZE,
+                'compression': compression,
+                'new_chunks': new_chunks,
+                'stored_bytes': stored_bytes,
+                'chunks': chunks,
+            }
+            manifest_path = self._new_manifest_path()
+            self._write_atomic(manifest_path, json.dumps(manifest).encode('utf-8'))
+            self.catalog.add(manifest_path, self.catalog_entry(manifest))
+
+        manifest['path'] = manifest_path
+        return manifest
+
+    @staticmethod
+    def load_manifest(manifest_path: str) -> Dict:
+        """Read and validate a snapshot manifest"""
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        if manifest.get('format') != BackupRepository.FORMAT_NAME:
+            raise ValueError(f"Not a backup snapshot manifest: {manifest_path}")
+        manifest['path'] = manifest_path
+        return manifest
+
+    @staticmethod
+    def catalog_entry(manifest: Dict) -> Dict:
+        """The catalog's copy of a manifest: everything but the chunk list"""
+        entry = {key: value for key, value in manifest.items()
+                 if key not in ('format', 'version', 'chunks', 'path')}
+        entry['kind'] = 'snapshot'
+        return entry
+
+    def rescan(self, extra_entries: Dict[str, Dict] = None) -> int:
+        """
+        Rebuild the catalog from the manifests on disk
+
+        Args:
+            extra_entries: Entries for other backups in the directory, keyed by path
+
+        Returns:
+            Number of snapshots found
+        """
+        with _repository_lock:
+            entries = dict(extra_entries or {})
+            snapshots = self.list_snapshots()
+            for manifest in snapshots:
+                entries[manifest['path']] = self.catalog_entry(manifest)
+            if entries or os.path.exists(self.catalog.path):
+                self.catalog.replace(entries)
+        return len(snapshots)
+
+    def list_snapshots(self) -> List[Dict]:
+        """Load every snapshot manifest in the repository, newest first"""
+        if not os.path.isdir(self.snapshots_dir):
+            return []
+
+        snapshots = []
+        for filename in os.listdir(self.snapshots_dir):
+            if filename.endswith('.json'):
+                snapshots.append(self.load_manifest(os.path.join(self.snapshots_dir, filename)))
+        snapshots.sort(key=lambda manifest: (manifest['created'], manifest['path']), reverse=True)
+        return snapshots
+
+    def read_chunk(self, digest: str) -> bytes:
+        """Load and check one chunk"""
+        with open(self._chunk_path(digest), 'rb') as f:
+            packed = f.read()
+
+        for tag, _, decompress in self.COMPRESSORS.values():
+            if packed[:1] == tag:
+                data = decompress(packed[1:])
+                break
+        else:
+            raise ValueError(f"Chunk {digest} has an unknown compression tag")
+
+        if hashlib.sha256(data).hexdigest() != digest:
+            raise ValueError(f"Chunk {digest} is corrupt")
+        return data
+
+    def restore_snapshot(self, manifest_path: str, target_path: str):
+        """
+        Reassemble a snapshot into a database file
+
+        The file is written under a temporary name and renamed over target_path only
+        after every chunk has been read and checked.
+        """
+        manifest = self.load_manifest(manifest_path)
+        partial_path = target_path + '.partial'
+        try:
+            with open(partial_path, 'wb') as f:
+                for digest in manifest['chunks']:
+                    f.write(self.read_chunk(digest))
+            if os.path.getsize(partial_path) != manifest['size']:
+                raise ValueError(f"Snapshot {os.path.basename(manifest_path)} is incomplete")
+            os.replace(partial_path, target_path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+    def delete_snapshot(self, manifest_path: str) -> Dict:
+        """Remove a snapshot's manifest and collect the chunks only it used"""
+        return self.delete_snapshots([manifest_path])
+
+    def delete_snapshots(self, manifest_paths: List[str]) -> Dict:
+        """Remove several snapshots, updating the catalog and collecting chunks once"""
+        with _repository_lock:
+            for manifest_path in manifest_paths:
+                os.remove(manifest_path)
+            self.catalog.remove(manifest_paths)
+        return self.collect_garbage()
+
+    def collect_garbage(self) -> Dict:
+        """
+        Delete chunks no manifest references
+
+        Returns:
+            Dictionary with the number of chunks removed and bytes freed
+        """
+        removed = 0
+        freed = 0
+
+        with _repository_lock:
+            referenced = set()
+            for manifest in self.list_snapshots():
+                referenced.update(manifest['chunks'])
+
+            if os.path.isdir(self.chunks_dir):
+                for prefix in os.listdir(self.chunks_dir):
+                    prefix_dir = os.path.join(self.chunks_dir, prefix)
+                    for filename in os.listdir(prefix_dir):
+                        if filename not in referenced:
+                            chunk_path = os.path.join(prefix_dir, filename)
+                            freed += os.path.getsize(chunk_path)
+                            os.remove(chunk_path)
+                            removed += 1
+
+        return {'removed_chunks': removed, 'freed_bytes': freed}
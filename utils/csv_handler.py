@@ -2,43 +2,121 @@
 CSV Import/Export Handler
 """
 
+import calendar
 import csv
+import hashlib
+import io
+import multiprocessing
+import os
+import re
 import pandas as pd
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
 from datetime import datetime
-from typing import List, Dict
+from functools import lru_cache
+from typing import List, Dict, Iterable, Callable, Optional, Tuple
+from utils.mapped_csv import MappedCSVFile
+
+# Accepted import date formats, in order of preference when a column fits more than one.
+# Each maps to a regex and the order of its (year, month, day) groups.
+DATE_FORMATS = {
+    '%Y-%m-%d': (r'(\d{4})-(\d{1,2})-(\d{1,2})', 'ymd'),
+    '%Y/%m/%d': (r'(\d{4})/(\d{1,2})/(\d{1,2})', 'ymd'),
+    '%m/%d/%Y': (r'(\d{1,2})/(\d{1,2})/(\d{4})', 'mdy'),
+    '%d/%m/%Y': (r'(\d{1,2})/(\d{1,2})/(\d{4})', 'dmy'),
+    '%m-%d-%Y': (r'(\d{1,2})-(\d{1,2})-(\d{4})', 'mdy'),
+    '%d-%m-%Y': (r'(\d{1,2})-(\d{1,2})-(\d{4})', 'dmy'),
+    '%Y%m%d': (r'(\d{4})(\d{2})(\d{2})', 'ymd'),
+    '%m/%d/%y': (r'(\d{1,2})/(\d{1,2})/(\d{2})', 'mdy'),
+    '%d/%m/%y': (r'(\d{1,2})/(\d{1,2})/(\d{2})', 'dmy'),
+}
 
 class CSVHandler:
     """Handle CSV import and export operations"""
 
     @staticmethod
-    def export_transactions(transactions: List[Dict], filename: str):
-        """Export transactions to CSV file"""
-        if not transactions:
-            raise ValueError("No transactions to export")
+    def export_transactions(transactions: Iterable[Dict], filename: str, total: int = None,
+                            progress_callback: Callable[[int, Optional[int]], bool] = None,
+                            progress_interval: int = 5000) -> Optional[int]:
+        """
+        Export transactions to CSV file, writing rows as they are produced
+
+        Args:
+            transactions: List or iterator of transaction dicts (e.g. DatabaseManager.iter_transactions)
+            filename: Destination CSV path
+            total: Expected row count, passed through to progress_callback
+            progress_callback: Called as (rows_written, total) every progress_interval rows;
+                               returning False cancels the export
+            progress_interval: Rows between progress callbacks
 
+        Returns:
+            Number of rows written, or None if cancelled (the partial file is removed)
+        """
         # Define columns to export
         fieldnames = ['date', 'account', 'category', 'type', 'amount', 'description']
+        count = 0
+        cancelled = False
 
-        with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
-            writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
-            writer.writeheader()
+        try:
+            with open(filename, 'w', newline='', encoding='utf-8') as csvfile:
+                writer = csv.DictWriter(csvfile, fieldnames=fieldnames)
+                writer.writeheader()
+
+                for transaction in transactions:
+                    writer.writerow({
+                        'date': transaction['transaction_date'],
+                        'account': transaction['account_name'],
+                        'category': transaction['category_name'],
+                        'type': transaction['transaction_type'],
+                        'amount': transaction['amount'],
+                        'description': transaction['description'] or ''
+                    })
+                    count += 1
+
+                    if progress_callback and count % progress_interval == 0:
+                        if progress_callback(count, total) is False:
+                            cancelled = True
+                            break
+        except Exception:
+            if os.path.exists(filename):
+                os.remove(filename)
+            raise
+
+        if cancelled:
+            os.remove(filename)
+            return None
 
-            for transaction in transactions:
-                writer.writerow({
-                    'date': transaction['transaction_date'],
-                    'account': transaction['account_name'],
-                    'category': transaction['category_name'],
-                    'type': transaction['transaction_type'],
-                    'amount': transaction['amount'],
-                    'description': transaction['description'] or ''
-                })
+        if count == 0:
+            os.remove(filename)
+            raise ValueError("No transactions to export")
+
+        if progress_callback:
+            progress_callback(count, total)
+        return count
+
+    # Files at least this large are imported with import_transactions_parallel
+    PARALLEL_THRESHOLD = 64 * 1024 * 1024
+    PARALLEL_CHUNK_SIZE = 16 * 1024 * 1024
+    # Rows sampled to pick the date format of a file
+    DATE_SAMPLE_SIZE = 1000
+    # Rows committed per checkpoint by import_transactions
+    CHECKPOINT_ROWS = 50000
 
     @staticmethod
     def import_transactions(filename: str, account_id: int, column_mapping: Dict[str, int],
-                          db_manager, category_map: Dict[str, int]) -> tuple:
+                          db_manager, category_map: Dict[str, int], skip_duplicates: bool = True,
+                          checkpoint_rows: int = CHECKPOINT_ROWS) -> tuple:
         """
         Import transactions from CSV file
 
+        This is the import path for everything the parallel one does not take: files
+        below PARALLEL_THRESHOLD and encodings that are not ASCII-compatible. The file
+        is read in whatever encoding, delimiter and quoting sniff() detects.
+        Rows are committed every checkpoint_rows rows together with a checkpoint in
+        the import_jobs table. Importing the same file into the same account again
+        after a failure or crash resumes after the last committed row instead of
+        starting over.
+
         Args:
             filename: Path to CSV file
             account_id: Target account ID for all imported transactions
@@ -46,120 +124,462 @@ class CSVHandler:
                            e.g., {'date': 0, 'amount': 1, 'description': 2, 'category': 3, 'type': 4}
             db_manager: Database manager instance
             category_map: Maps category names to category IDs
+            skip_duplicates: Leave out rows already in the database, so an overlapping
+                             statement can be imported again (see add_transactions_bulk)
+            checkpoint_rows: File rows read between commits
 
         Returns:
-            Tuple of (success_count, error_count, errors_list)
+            Tuple of (success_count, error_count, errors_list, stats) where stats holds
+            the bulk insert results (inserted, skipped, elapsed, rows_per_sec), the
+            inferred date_format and date_format_ambiguous (see infer_date_format) and
+            resumed_from_row, the last row committed by an earlier run (or None). The
+            counts and errors cover this run only.
         """
-        success_count = 0
-        error_count = 0
         errors = []
+        rows = []
+        totals = {'inserted': 0, 'skipped': 0, 'elapsed': 0.0}
 
         try:
-            # Read CSV file
-            with open(filename, 'r', encoding='utf-8') as csvfile:
-                # Try to detect if file has headers
-                sample = csvfile.read(1024)
-                csvfile.seek(0)
-                sniffer = csv.Sniffer()
-                has_header = sniffer.has_header(sample)
-
-                reader = csv.reader(csvfile)
-
-                # Skip header if present
-                if has_header:
-                    next(reader)
-
-                for row_num, row in enumerate(reader, start=2 if has_header else 1):
-                    try:
-                        # Extract fields based on column mapping
-                        date_str = row[column_mapping['date']].strip()
-                        amount_str = row[column_mapping['amount']].strip()
-                        description = row[column_mapping.get('description', -1)].strip() if column_mapping.get('description', -1) >= 0 else ''
-
-                        # Parse date (try multiple formats)
-                        transaction_date = CSVHandler._parse_date(date_str)
-                        if not transaction_date:
-                            errors.append(f"Row {row_num}: Invalid date format '{date_str}'")
-                            error_count += 1
-                            continue
-
-                        # Parse amount
-                        amount = CSVHandler._parse_amount(amount_str)
-                        if amount is None or amount <= 0:
-                            errors.append(f"Row {row_num}: Invalid amount '{amount_str}'")
-                            error_count += 1
-                            continue
-
-                        # Get transaction type
-                        if 'type' in column_mapping and column_mapping['type'] >= 0:
-                            transaction_type = row[column_mapping['type']].strip().lower()
-                            if transaction_type not in ['income', 'expense']:
-                                errors.append(f"Row {row_num}: Invalid transaction type '{transaction_type}'")
-                                error_count += 1
-                                continue
-                        else:
-                            # Default to expense if not specified
-                            transaction_type = 'expense'
-
-                        # Get category
-                        category_id = None
-                        if 'category' in column_mapping and column_mapping['category'] >= 0:
-                            category_name = row[column_mapping['category']].strip()
-                            category_id = category_map.get(category_name)
-
-                        # If no category found, use default
-                        if not category_id:
-                            # Try to find "Other Income" or "Other Expense" category
-                            default_category_name = 'Other Income' if transaction_type == 'income' else 'Other Expense'
-                            category_id = category_map.get(default_category_name)
-
-                        if not category_id:
-                            errors.append(f"Row {row_num}: No valid category found")
-                            error_count += 1
-                            continue
-
-                        # Add transaction to database
-                        db_manager.add_transaction(
-                            account_id=account_id,
-                            category_id=category_id,
-                            amount=amount,
-                            transaction_type=transaction_type,
-                            description=description,
-                            transaction_date=transaction_date
-                        )
-
-                        success_count += 1
-
-                    except IndexError:
-                        errors.append(f"Row {row_num}: Invalid row format (not enough columns)")
-                        error_count += 1
-                    except Exception as e:
-                        errors.append(f"Row {row_num}: {str(e)}")
-                        error_count += 1
+            job, seen = CSVHandler._open_import_job(filename, account_id, column_mapping,
+                                                    db_manager, skip_duplicates)
+            csv_format = CSVHandler.sniff(filename)
+            codec = csv_format['codec']
+            date_format, ambiguous = CSVHandler._infer_file_date_format(filename, column_mapping)
+
+            def commit_chunk(offset, row_num):
+                CSVHandler._commit_chunk(db_manager, job, rows, skip_duplicates, seen, totals,
+                                         offset, row_num, len(errors))
+                rows.clear()
+
+            # Track the byte offset after every row; csv.reader pulls exactly the
+            # lines of one record at a time
+            start = job['byte_offset'] or csv_format['bom_length']
+            with open(filename, 'rb') as raw:
+                raw.seek(start)
+                with io.TextIOWrapper(raw, encoding=codec, newline='') as csvfile:
+                    offset = start
+
+                    def lines():
+                        # Re-encoding each line gives its length in bytes for any codec
+                        nonlocal offset
+                        for line in csvfile:
+                            offset += len(line.encode(codec))
+                            yield line
+
+                    reader = csv.reader(lines(), delimiter=csv_format['delimiter'],
+                                        quotechar=csv_format['quotechar'])
+                    if job['byte_offset']:
+                        row_num = job['row_num']
+                    else:
+                        row_num = 0
+                        if csv_format['has_header']:
+                            next(reader, None)
+                            row_num = 1
+                    chunk_start = row_num
+
+                    for row in reader:
+                        row_num += 1
+                        error = CSVHandler._parse_row(row, account_id, column_mapping, category_map, rows,
+                                                      date_format)
+                        if error:
+                            errors.append(f"Row {row_num}: {error}")
+
+                        if row_num - chunk_start >= checkpoint_rows:
+                            commit_chunk(offset, row_num)
+                            chunk_start = row_num
+
+                    commit_chunk(offset, row_num)
+                    db_manager.complete_import_job(job['id'])
 
         except FileNotFoundError:
             raise ValueError(f"File not found: {filename}")
         except Exception as e:
             raise ValueError(f"Error reading CSV file: {str(e)}")
 
-        return success_count, error_count, errors
+        return CSVHandler._import_result(totals, errors, date_format, ambiguous, job)
 
     @staticmethod
-    def _parse_date(date_str: str) -> str:
-        """Parse date string in various formats to YYYY-MM-DD"""
-        date_formats = [
-            '%Y-%m-%d',
-            '%Y/%m/%d',
-            '%m/%d/%Y',
-            '%d/%m/%Y',
-            '%m-%d-%Y',
-            '%d-%m-%Y',
-            '%Y%m%d',
-            '%m/%d/%y',
-            '%d/%m/%y',
-        ]
+    def import_transactions_parallel(filename: str, account_id: int, column_mapping: Dict[str, int],
+                                     db_manager, category_map: Dict[str, int], skip_duplicates: bool = True,
+                                     workers: int = None, chunk_size: int = PARALLEL_CHUNK_SIZE) -> tuple:
+        """
+        Import a large CSV file by parsing byte-range chunks in a process pool
+
+        The file is split on record boundaries, tracking quotes so that quoted fields
+        may contain line breaks. Chunks are parsed and validated in worker processes while this process
+        inserts the validated rows in file order, committing each chunk with an
+        import_jobs checkpoint so an interrupted import resumes after the last
+        committed chunk (see import_transactions).
 
-        for fmt in date_formats:
+        Args:
+            filename: Path to CSV file
+            account_id: Target account ID for all imported transactions
+            column_mapping: Maps field names to column indices (see import_transactions)
+            db_manager: Database manager instance
+            category_map: Maps category names to category IDs
+            skip_duplicates: Leave out rows already in the database
+            workers: Number of parser processes (defaults to the CPU count)
+            chunk_size: Approximate bytes per chunk
+
+        Returns:
+            Same tuple as import_transactions
+        """
+        workers = workers or os.cpu_count() or 1
+        errors = []
+        totals = {'inserted': 0, 'skipped': 0, 'elapsed': 0.0}
+
+        try:
+            job, seen = CSVHandler._open_import_job(filename, account_id, column_mapping,
+                                                    db_manager, skip_duplicates)
+            csv_format = CSVHandler.sniff(filename)
+            CSVHandler._require_ascii_compatible(csv_format)
+            has_header = csv_format['has_header']
+            date_format, ambiguous = CSVHandler._infer_file_date_format(filename, column_mapping)
+            resuming = job['byte_offset'] > 0
+            chunks = iter(CSVHandler._split_record_ranges(filename, chunk_size, csv_format['quotechar'],
+                                                          skip_first_record=has_header and not resuming,
+                                                          start=job['byte_offset'] or csv_format['bom_length']))
+            row_num = job['row_num'] + 1 if resuming else (2 if has_header else 1)
+
+            # Spawned workers are safe to start from the GUI's query thread, unlike forked ones
+            pool = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+            try:
+                def submit_next():
+                    chunk = next(chunks, None)
+                    if chunk is not None:
+                        future = pool.submit(CSVHandler._parse_chunk, filename, chunk[0], chunk[1],
+                                             account_id, column_mapping, category_map, date_format,
+                                             csv_format)
+                        pending.append((future, chunk[1]))
+
+                # Keep a bounded number of chunks in flight so parsed rows never pile up in memory
+                pending = deque()
+                for _ in range(workers * 2):
+                    submit_next()
+
+                while pending:
+                    future, end = pending.popleft()
+                    rows, chunk_errors, row_count = future.result()
+                    submit_next()
+
+                    errors.extend(f"Row {row_num + index}: {error}" for index, error in chunk_errors)
+                    row_num += row_count
+
+                    CSVHandler._commit_chunk(db_manager, job, rows, skip_duplicates, seen, totals,
+                                             end, row_num - 1, len(errors))
+                db_manager.complete_import_job(job['id'])
+            finally:
+                pool.shutdown(cancel_futures=True)
+
+        except FileNotFoundError:
+            raise ValueError(f"File not found: {filename}")
+        except Exception as e:
+            raise ValueError(f"Error reading CSV file: {str(e)}")
+
+        return CSVHandler._import_result(totals, errors, date_format, ambiguous, job)
+
+    @staticmethod
+    def sniff(filename: str) -> Dict:
+        """
+        Detect the format of a CSV file from its first bytes (see MappedCSVFile)
+
+        Returns:
+            Dictionary with encoding (for open()), codec and bom_length (for
+            decoding raw bytes after the byte order mark), ascii_compatible, delimiter,
+            quotechar and has_header
+        """
+        with MappedCSVFile(filename) as f:
+            return {
+                'encoding': f.encoding,
+                'codec': f.codec,
+                'bom_length': f.bom_length,
+                'ascii_compatible': f.ascii_compatible,
+                'delimiter': f.delimiter,
+                'quotechar': f.quotechar,
+                'has_header': f.has_header,
+            }
+
+    @staticmethod
+    def _require_ascii_compatible(csv_format: Dict):
+        """Reject encodings that import_transactions_parallel cannot split into lines"""
+        if not csv_format['ascii_compatible']:
+            raise ValueError(f"{csv_format['encoding'].upper()} files can only be imported with "
+                             "import_transactions")
+
+    @staticmethod
+    def _file_hash(filename: str) -> str:
+        """Hash a file's contents, identifying it across import attempts"""
+        digest = hashlib.blake2b(digest_size=16)
+        with open(filename, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                digest.update(block)
+        return digest.hexdigest()
+
+    @staticmethod
+    def _open_import_job(filename: str, account_id: int, column_mapping: Dict[str, int],
+                         db_manager, skip_duplicates: bool) -> Tuple[Dict, Dict[str, int]]:
+        """
+        Resume the unfinished import job for this file, account and mapping, or start one
+
+        Returns:
+            Tuple of (job, seen) where seen is the fingerprint counts to continue
+            duplicate detection with (see add_transactions_bulk)
+        """
+        file_hash = CSVHandler._file_hash(filename)
+        job = db_manager.get_unfinished_import_job(file_hash, account_id, column_mapping)
+        if job is None:
+            job_id = db_manager.create_import_job(file_hash, os.path.abspath(filename), account_id,
+                                                  column_mapping)
+            return db_manager.get_import_job(job_id), {}
+
+        seen = db_manager.get_import_job_fingerprint_counts(job) if skip_duplicates else {}
+        return job, seen
+
+    @staticmethod
+    def _commit_chunk(db_manager, job: Dict, rows: List[tuple], skip_duplicates: bool, seen: Dict[str, int],
+                      totals: Dict, byte_offset: int, row_num: int, error_count: int):
+        """
+        Insert one chunk of parsed rows and checkpoint the import job in the same commit
+
+        totals holds this run's inserted, skipped and elapsed so far and is updated in
+        place; error_count is this run's errors up to row_num.
+        """
+        with db_manager.batch():
+            stats = db_manager.add_transactions_bulk(rows, skip_duplicates, seen)
+            for key in totals:
+                totals[key] += stats[key]
+            db_manager.checkpoint_import_job(job['id'], byte_offset, row_num,
+                                             job['inserted'] + totals['inserted'],
+                                             job['skipped'] + totals['skipped'],
+                                             job['error_count'] + error_count,
+                                             stats['skipped_fingerprints'])
+
+    @staticmethod
+    def _import_result(totals: Dict, errors: List[str], date_format: Optional[str], ambiguous: bool,
+                       job: Dict) -> tuple:
+        """Build the (success_count, error_count, errors, stats) tuple the import paths return"""
+        stats = dict(totals)
+        stats.update(
+            rows_per_sec=(totals['inserted'] + totals['skipped']) / totals['elapsed'] if totals['elapsed'] > 0 else 0.0,
+            date_format=date_format,
+            date_format_ambiguous=ambiguous,
+            resumed_from_row=job['row_num'] if job['byte_offset'] else None
+        )
+        return totals['inserted'], len(errors), errors, stats
+
+    @staticmethod
+    def _split_record_ranges(filename: str, chunk_size: int, quotechar: str = '"',
+                             skip_first_record: bool = False, start: int = 0) -> List[tuple]:
+        """
+        Split a file from byte start on into (start, end) byte ranges that each end on a record boundary
+
+        A line break ends a record only outside quotes, that is after an even number
+        of quote characters, so quoted fields may span lines. Escaped ("doubled")
+        quotes leave the count even. start must itself be a record boundary.
+        """
+        quote = quotechar.encode('ascii')
+        size = os.path.getsize(filename)
+        ranges = []
+        in_quotes = False
+
+        with open(filename, 'rb') as f:
+            def finish_record():
+                # Read on to the first line break outside quotes
+                nonlocal in_quotes
+                for line in iter(f.readline, b''):
+                    in_quotes ^= line.count(quote) % 2 == 1
+                    if not in_quotes:
+                        break
+
+            f.seek(start)
+            if skip_first_record:
+                finish_record()
+            start = f.tell()
+
+            while start < size:
+                # Count the quotes skipped over to know whether the seek lands inside a field
+                remaining = min(start + chunk_size, size) - start
+                while remaining > 0:
+                    block = f.read(min(remaining, 1024 * 1024))
+                    in_quotes ^= block.count(quote) % 2 == 1
+                    remaining -= len(block)
+                finish_record()
+                end = f.tell()
+                ranges.append((start, end))
+                start = end
+
+        return ranges
+
+    @staticmethod
+    def _parse_chunk(filename: str, start: int, end: int, account_id: int, column_mapping: Dict[str, int],
+                     category_map: Dict[str, int], date_format: Optional[str] = None,
+                     csv_format: Optional[Dict] = None) -> tuple:
+        """
+        Parse one byte range of a CSV file (runs in a worker process)
+
+        csv_format is the result of sniff(); without it the chunk is read as
+        comma-separated UTF-8.
+
+        Returns:
+            Tuple of (rows, errors, row_count) where errors holds (row_index, message)
+            pairs indexed from the start of the chunk
+        """
+        with open(filename, 'rb') as f:
+            f.seek(start)
+            text = f.read(end - start).decode(csv_format['codec'] if csv_format else 'utf-8')
+
+        dialect = {'delimiter': csv_format['delimiter'], 'quotechar': csv_format['quotechar']} if csv_format else {}
+        rows = []
+        errors = []
+        row_count = 0
+        for row_count, row in enumerate(csv.reader(io.StringIO(text, newline=''), **dialect), start=1):
+            error = CSVHandler._parse_row(row, account_id, column_mapping, category_map, rows, date_format)
+            if error:
+                errors.append((row_count - 1, error))
+
+        return rows, errors, row_count
+
+    @staticmethod
+    def _parse_row(row: List[str], account_id: int, column_mapping: Dict[str, int],
+                   category_map: Dict[str, int], rows: List[tuple],
+                   date_format: Optional[str] = None) -> Optional[str]:
+        """
+        Validate one CSV row and append it to rows as a bulk insert tuple
+
+        Returns:
+            None if the row was added, otherwise the error message for the row
+        """
+        try:
+            # Extract fields based on column mapping
+            date_str = row[column_mapping['date']].strip()
+            amount_str = row[column_mapping['amount']].strip()
+            description = row[column_mapping.get('description', -1)].strip() if column_mapping.get('description', -1) >= 0 else ''
+
+            # Parse date (the file's format first, then the other formats)
+            transaction_date = CSVHandler._parse_date(date_str, date_format)
+            if not transaction_date:
+                return f"Invalid date format '{date_str}'"
+
+            # Parse amount
+            amount = CSVHandler._parse_amount(amount_str)
+            if amount is None or not amount > 0:  # Also rejects 'nan'
+                return f"Invalid amount '{amount_str}'"
+
+            # Get transaction type
+            if 'type' in column_mapping and column_mapping['type'] >= 0:
+                transaction_type = row[column_mapping['type']].strip().lower()
+                if transaction_type not in ['income', 'expense']:
+                    return f"Invalid transaction type '{transaction_type}'"
+            else:
+                # Default to expense if not specified
+                transaction_type = 'expense'
+
+            # Get category
+            category_id = None
+            if 'category' in column_mapping and column_mapping['category'] >= 0:
+                category_name = row[column_mapping['category']].strip()
+                category_id = category_map.get(category_name)
+
+            # If no category found, use default
+            if not category_id:
+                # Try to find "Other Income" or "Other Expense" category
+                default_category_name = 'Other Income' if transaction_type == 'income' else 'Other Expense'
+                category_id = category_map.get(default_category_name)
+
+            if not category_id:
+                return "No valid category found"
+
+            # Queue transaction for the bulk insert
+            rows.append((account_id, category_id, amount, transaction_type,
+                         description, transaction_date))
+            return None
+
+        except IndexError:
+            return "Invalid row format (not enough columns)"
+        except Exception as e:
+            return str(e)
+
+    @staticmethod
+    def infer_date_format(values: Iterable[str]) -> Tuple[Optional[str], bool]:
+        """
+        Pick the single date format that fits a sample of a date column
+
+        Args:
+            values: Sample of date strings from one column
+
+        Returns:
+            Tuple of (format, ambiguous). format is the preferred format among those
+            matching the most values, or None if no value matched any format. ambiguous
+            is True when another format fits just as well, e.g. a column where every day
+            is 12 or less reads as both month/day and day/month.
+        """
+        values = [value.strip() for value in values if value and value.strip()]
+        match_counts = {}
+        for fmt in DATE_FORMATS:
+            parse = CSVHandler._date_parser(fmt)
+            match_counts[fmt] = sum(1 for value in values if parse(value))
+
+        best = max(match_counts.values(), default=0)
+        if best == 0:
+            return None, False
+
+        matching = [fmt for fmt, count in match_counts.items() if count == best]
+        return matching[0], len(matching) > 1
+
+    @staticmethod
+    def _infer_file_date_format(filename: str, column_mapping: Dict[str, int]) -> Tuple[Optional[str], bool]:
+        """Infer the date format from the first DATE_SAMPLE_SIZE rows of a CSV file"""
+        date_col = column_mapping['date']
+        with MappedCSVFile(filename) as f:
+            rows = f.rows(CSVHandler.DATE_SAMPLE_SIZE + f.has_header)[f.has_header:]
+        sample = [row[date_col] for row in rows if len(row) > date_col]
+        return CSVHandler.infer_date_format(sample)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _date_parser(date_format: str) -> Callable[[str], Optional[str]]:
+        """
+        Build a fast parser for one of DATE_FORMATS
+
+        The parser returns the date as YYYY-MM-DD, or None if the string does not
+        match the format or is not a real calendar date.
+        """
+        pattern, order = DATE_FORMATS[date_format]
+        fullmatch = re.compile(pattern).fullmatch
+        year_idx, month_idx, day_idx = order.index('y'), order.index('m'), order.index('d')
+        two_digit_year = date_format.endswith('%y')
+
+        def parse(date_str: str) -> Optional[str]:
+            match = fullmatch(date_str)
+            if not match:
+                return None
+
+            fields = match.groups()
+            year, month, day = int(fields[year_idx]), int(fields[month_idx]), int(fields[day_idx])
+            if two_digit_year:
+                # Same pivot as strptime's %y
+                year += 1900 if year >= 69 else 2000
+
+            if year < 1 or not 1 <= month <= 12 or not 1 <= day <= calendar.monthrange(year, month)[1]:
+                return None
+            return f"{year:04d}-{month:02d}-{day:02d}"
+
+        return parse
+
+    @staticmethod
+    def _parse_date(date_str: str, date_format: Optional[str] = None) -> str:
+        """
+        Parse date string in various formats to YYYY-MM-DD
+
+        If date_format is given (usually from infer_date_format) it is tried first with
+        a precompiled parser; the strptime loop over every format is only the fallback.
+        """
+        if date_format:
+            parsed = CSVHandler._date_parser(date_format)(date_str)
+            if parsed:
+                return parsed
+
+        for fmt in DATE_FORMATS:
             try:
                 date_obj = datetime.strptime(date_str, fmt)
                 return date_obj.strftime('%Y-%m-%d')
@@ -185,16 +605,14 @@ class CSVHandler:
 
     @staticmethod
     def get_csv_preview(filename: str, num_rows: int = 5) -> List[List[str]]:
-        """Get preview of first few rows of CSV file"""
-        preview = []
+        """
+        Get preview of first few rows of CSV file
+
+        Only the start of the file is mapped and decoded, in whatever encoding and
+        delimiter sniff() detects, so previews of multi-GB files are instant.
+        """
         try:
-            with open(filename, 'r', encoding='utf-8') as csvfile:
-                reader = csv.reader(csvfile)
-                for i, row in enumerate(reader):
-                    if i >= num_rows:
-                        break
-                    preview.append(row)
+            with MappedCSVFile(filename) as f:
+                return f.rows(num_rows)
         except Exception as e:
             raise ValueError(f"Error reading CSV file: {str(e)}")
-
-        return preview
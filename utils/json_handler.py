@@ -0,0 +1,302 @@
+"""
+JSON Import/Export Handler
+"""
+
+import gzip
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterator, Tuple, Callable, Optional
+
+# Tables in the order they are written; transactions reference the other two
+EXPORT_TABLES = ['accounts', 'categories', 'transactions']
+
+class JSONHandler:
+    """Stream whole-database JSON and NDJSON exports and read them back"""
+
+    FORMAT_NAME = 'personal-finance-tracker'
+    FORMAT_VERSION = 1
+    IMPORT_BATCH_SIZE = 5000
+
+    @staticmethod
+    def _open(filename: str, mode: str):
+        """Open a text file, transparently gzip-compressed when the name ends in .gz"""
+        if filename.lower().endswith('.gz'):
+            return gzip.open(filename, mode + 't', encoding='utf-8')
+        return open(filename, mode, encoding='utf-8', newline='\n')
+
+    @staticmethod
+    def is_ndjson(filename: str) -> bool:
+        """Check whether a filename uses the newline-delimited format"""
+        name = filename.lower()
+        if name.endswith('.gz'):
+            name = name[:-3]
+        return name.endswith('.ndjson') or name.endswith('.jsonl')
+
+    @staticmethod
+    def export_data(db_manager, filename: str, compact: bool = False,
+                    progress_callback: Callable[[int, Optional[int]], bool] = None,
+                    progress_interval: int = 5000) -> Optional[Dict]:
+        """
+        Export accounts, categories and transactions record by record
+
+        A .json file holds one document shaped like {"export_date": ..., "accounts": [...],
+        "categories": [...], "transactions": [...]}; a .ndjson/.jsonl file holds a header
+        line followed by one {"table": ..., "record": ...} object per line. Either can be
+        gzip-compressed by adding .gz to the name.
+
+        Args:
+            db_manager: Database manager instance
+            filename: Destination path
+            compact: Drop the whitespace and per-record line breaks of a .json document
+            progress_callback: Called as (transactions_written, total) every progress_interval
+                               transactions; returning False cancels the export
+            progress_interval: Transactions between progress callbacks
+
+        Returns:
+            Dictionary of record counts per table, or None if cancelled (the partial file is removed)
+        """
+        ndjson = JSONHandler.is_ndjson(filename)
+        separators = (',', ':') if compact or ndjson else (', ', ': ')
+        encode = json.JSONEncoder(separators=separators, default=str).encode
+        export_date = datetime.now().strftime('%Y-%m-%d')
+        total = db_manager.get_transaction_totals()['count']
+
+        sources = {
+            'accounts': db_manager.get_all_accounts(),
+            'categories': db_manager.get_all_categories(),
+            'transactions': db_manager.iter_transactions(),
+        }
+        counts = {table: 0 for table in EXPORT_TABLES}
+        cancelled = False
+
+        try:
+            with JSONHandler._open(filename, 'w') as f:
+                if ndjson:
+                    f.write(encode({'format': JSONHandler.FORMAT_NAME,
+                                    'version': JSONHandler.FORMAT_VERSION,
+                                    'export_date': export_date}) + '\n')
+                else:
+                    newline = '' if compact else '\n'
+                    f.write('{' + newline + encode('export_date') + separators[1] + encode(export_date))
+
+                for table in EXPORT_TABLES:
+                    if not ndjson:
+                        f.write(separators[0].strip() + newline + encode(table) + separators[1] + '[')
+
+                    for record in sources[table]:
+                        if ndjson:
+                            f.write(encode({'table': table, 'record': record}) + '\n')
+                        else:
+                            f.write(('' if counts[table] == 0 else ',') + newline + encode(record))
+                        counts[table] += 1
+
+                        if (table == 'transactions' and progress_callback
+                                and counts[table] % progress_interval == 0):
+                            if progress_callback(counts[table], total) is False:
+                                cancelled = True
+                                break
+
+                    if cancelled:
+                        break
+                    if not ndjson:
+                        f.write(newline + ']')
+
+                if not ndjson and not cancelled:
+                    f.write(newline + '}\n')
+        except Exception:
+            if os.path.exists(filename):
+                os.remove(filename)
+            raise
+
+        if cancelled:
+            os.remove(filename)
+            return None
+
+        if progress_callback:
+            progress_callback(counts['transactions'], total)
+        return counts
+
+    @staticmethod
+    def iter_records(filename: str) -> Iterator[Tuple[str, Dict]]:
+        """
+        Stream (table, record) pairs from a file written by export_data
+
+        Neither format is loaded into memory as a whole: NDJSON is read line by line and
+        JSON documents are decoded one array element at a time.
+        """
+        with JSONHandler._open(filename, 'r') as f:
+            if JSONHandler.is_ndjson(filename):
+                header = json.loads(f.readline() or '{}')
+                if header.get('format') != JSONHandler.FORMAT_NAME:
+                    raise ValueError("Not a Personal Finance Tracker NDJSON export")
+                for line_num, line in enumerate(f, start=2):
+                    if not line.strip():
+                        continue
+                    try:
+                        item = json.loads(line)
+                        yield item['table'], item['record']
+                    except (ValueError, KeyError) as e:
+                        raise ValueError(f"Line {line_num}: invalid record ({e})")
+            else:
+                yield from _JSONDocumentReader(f).iter_records()
+
+    @staticmethod
+    def import_data(filename: str, db_manager,
+                    progress_callback: Callable[[int, Optional[int]], bool] = None) -> Dict:
+        """
+        Import an export_data file into the database in a single transaction
+
+        Categories are matched by name; accounts are added as new accounts. Transactions
+        are remapped to the new account and category IDs and bulk-inserted in batches.
+
+        Args:
+            filename: Path to a .json/.ndjson file (optionally .gz)
+            db_manager: Database manager instance
+            progress_callback: Called as (transactions_imported, None) after each batch;
+                               returning False cancels and rolls back the import
+
+        Returns:
+            Dictionary of imported record counts per table (empty if cancelled)
+        """
+        if not os.path.exists(filename):
+            raise ValueError(f"File not found: {filename}")
+
+        category_ids = {c['name']: c['id'] for c in db_manager.get_all_categories()}
+        account_map = {}
+        category_map = {}
+        counts = {table: 0 for table in EXPORT_TABLES}
+        batch = []
+
+        class _Cancelled(Exception):
+            pass
+
+        def flush():
+            db_manager.add_transactions_bulk(batch)
+            counts['transactions'] += len(batch)
+            batch.clear()
+            if progress_callback and progress_callback(counts['transactions'], None) is False:
+                raise _Cancelled()
+
+        try:
+            with db_manager.batch():
+                for table, record in JSONHandler.iter_records(filename):
+                    if table == 'accounts':
+                        account_map[record['id']] = db_manager.add_account(
+                            record['name'], record['account_type'],
+                            record.get('initial_balance') or 0, record.get('currency') or 'USD'
+                        )
+                        counts['accounts'] += 1
+
+                    elif table == 'categories':
+                        if record['name'] not in category_ids:
+                            category_ids[record['name']] = db_manager.add_category(
+                                record['name'], record['type'], record.get('description') or ''
+                            )
+                            counts['categories'] += 1
+                        category_map[record['id']] = category_ids[record['name']]
+
+                    elif table == 'transactions':
+                        if record['account_id'] not in account_map or record['category_id'] not in category_map:
+                            raise ValueError(f"Transaction {record.get('id')} references an unknown "
+                                             "account or category")
+                        batch.append((account_map[record['account_id']], category_map[record['category_id']],
+                                      record['amount'], record['transaction_type'],
+                                      record.get('description') or '', record['transaction_date']))
+                        if len(batch) >= JSONHandler.IMPORT_BATCH_SIZE:
+                            flush()
+
+                if batch:
+                    flush()
+        except _Cancelled:
+            return {}
+        except (KeyError, TypeError) as e:
+            raise ValueError(f"Invalid record in {os.path.basename(filename)}: {e}")
+
+        return counts
+
+
+class _JSONDocumentReader:
+    """Incrementally decode the table arrays of an exported JSON document"""
+
+    WHITESPACE = re.compile(r'[ \t\n\r]*')
+    CHUNK_SIZE = 1024 * 1024
+
+    def __init__(self, f):
+        self.f = f
+        self.buffer = ''
+        self.pos = 0
+        self.eof = False
+        self.decoder = json.JSONDecoder()
+
+    def _fill(self) -> bool:
+        """Append the next chunk to the buffer, discarding what has been consumed"""
+        if self.eof:
+            return False
+        chunk = self.f.read(self.CHUNK_SIZE)
+        if not chunk:
+            self.eof = True
+            return False
+        self.buffer = self.buffer[self.pos:] + chunk
+        self.pos = 0
+        return True
+
+    def _peek(self) -> str:
+        """Skip whitespace and return the next character ('' at end of file)"""
+        while True:
+            self.pos = self.WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos < len(self.buffer):
+                return self.buffer[self.pos]
+            if not self._fill():
+                return ''
+
+    def _expect(self, char: str):
+        if self._peek() != char:
+            raise ValueError(f"Invalid JSON export: expected '{char}'")
+        self.pos += 1
+
+    def _value(self):
+        """Decode one JSON value, reading more input until it is complete"""
+        self._peek()
+        while True:
+            try:
+                value, end = self.decoder.raw_decode(self.buffer, self.pos)
+                # A number ending exactly at the buffer edge may continue in the next chunk
+                if end < len(self.buffer) or self.eof or isinstance(value, (dict, list, str)):
+                    self.pos = end
+                    return value
+            except json.JSONDecodeError:
+                if self.eof:
+                    raise ValueError("Invalid JSON export: truncated or malformed value")
+            self._fill()
+
+    def iter_records(self) -> Iterator[Tuple[str, Dict]]:
+        self._expect('{')
+        if self._peek() == '}':
+            return
+
+        while True:
+            key = self._value()
+            self._expect(':')
+
+            if key in EXPORT_TABLES:
+                self._expect('[')
+                if self._peek() == ']':
+                    self.pos += 1
+                else:
+                    while True:
+                        yield key, self._value()
+                        if self._peek() == ',':
+                            self.pos += 1
+                            continue
+                        self._expect(']')
+                        break
+            else:
+                self._value()  # Metadata such as export_date
+
+            if self._peek() == ',':
+                self.pos += 1
+                continue
+            self._expect('}')
+            return
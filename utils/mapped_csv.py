@@ -0,0 +1,163 @@
+"""
+Memory-Mapped CSV Reader for previews and format detection
+"""
+
+import codecs
+import csv
+import io
+import mmap
+import os
+from itertools import islice
+from typing import List, Tuple
+
+# Byte order marks as (bom, encoding for whole-file readers, codec for the bytes after
+# the mark). UTF-32 LE comes first because its mark starts with the UTF-16 LE one.
+BOMS = [
+    (codecs.BOM_UTF32_LE, 'utf-32', 'utf-32-le'),
+    (codecs.BOM_UTF32_BE, 'utf-32', 'utf-32-be'),
+    (codecs.BOM_UTF8, 'utf-8-sig', 'utf-8'),
+    (codecs.BOM_UTF16_LE, 'utf-16', 'utf-16-le'),
+    (codecs.BOM_UTF16_BE, 'utf-16', 'utf-16-be'),
+]
+
+# Codecs in which a b'\n' byte is always a line break, so files can be split on it
+ASCII_COMPATIBLE_CODECS = ('utf-8', 'cp1252', 'latin-1')
+
+class MappedCSVFile:
+    """
+    Read-only memory map of a CSV file that decodes only the bytes it needs
+
+    Opening the file detects its encoding, delimiter and header row from the first
+    SNIFF_BYTES bytes, and rows() decodes just enough of the start of the file for
+    the rows asked for, so both take the same time for a 1 KB file as a 10 GB one.
+
+    Usage:
+        with MappedCSVFile(filename) as f:
+            preview = f.rows(5)
+    """
+
+    SNIFF_BYTES = 64 * 1024
+    DELIMITERS = ',;\t|'
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self._file = open(filename, 'rb')
+        try:
+            self.size = os.fstat(self._file.fileno()).st_size
+            # Empty files cannot be mapped
+            self._map = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ) if self.size else b''
+        except Exception:
+            self._file.close()
+            raise
+
+        self.encoding, self.codec, self.bom_length = self._detect_encoding()
+        sample = self._sample()
+        self.delimiter, self.quotechar = self._detect_dialect(sample)
+        self.has_header = self._detect_header(sample)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        if isinstance(self._map, mmap.mmap):
+            self._map.close()
+        self._file.close()
+
+    @property
+    def ascii_compatible(self) -> bool:
+        """Whether the file can be split into lines on b'\\n' bytes without decoding it"""
+        return self.codec in ASCII_COMPATIBLE_CODECS
+
+    def _detect_encoding(self) -> Tuple[str, str, int]:
+        """
+        Detect the encoding from a byte order mark or the first SNIFF_BYTES bytes
+
+        Returns:
+            Tuple of (encoding, codec, bom_length): encoding suits readers of the whole
+            file such as open() or pandas, codec decodes the bytes after the mark
+        """
+        head = self._map[:4]
+        for bom, encoding, codec in BOMS:
+            if head.startswith(bom):
+                return encoding, codec, len(bom)
+
+        sample = self._map[:self.SNIFF_BYTES]
+
+        # UTF-16 without a mark: mostly-ASCII text leaves every other byte zero
+        if sample.count(0) > len(sample) // 4:
+            codec = 'utf-16-le' if sample[1::2].count(0) > sample[0::2].count(0) else 'utf-16-be'
+            return codec, codec, 0
+
+        # Only the sample is checked; a stray byte further on fails the import instead
+        for codec in ('utf-8', 'cp1252'):
+            try:
+                codecs.getincrementaldecoder(codec)().decode(sample, final=len(sample) == self.size)
+                return codec, codec, 0
+            except UnicodeDecodeError:
+                continue
+        return 'latin-1', 'latin-1', 0
+
+    def text(self, max_bytes: int) -> Tuple[str, bool]:
+        """
+        Decode up to max_bytes bytes from the start of the file
+
+        Returns:
+            Tuple of (text, complete) where complete is True if the text reaches the
+            end of the file; otherwise it may stop partway through a line
+        """
+        end = min(self.size, self.bom_length + max_bytes)
+        complete = end == self.size
+        decoder = codecs.getincrementaldecoder(self.codec)(errors='replace')
+        return decoder.decode(self._map[self.bom_length:end], final=complete), complete
+
+    def _sample(self) -> str:
+        """The first SNIFF_BYTES bytes as text, cut after the last whole line"""
+        text, complete = self.text(self.SNIFF_BYTES)
+        if not complete and '\n' in text:
+            text = text[:text.rindex('\n') + 1]
+        return text
+
+    def _detect_dialect(self, sample: str) -> Tuple[str, str]:
+        """Pick the delimiter and quote character, defaulting to comma and double quote"""
+        try:
+            dialect = csv.Sniffer().sniff(sample, delimiters=self.DELIMITERS)
+            return dialect.delimiter, dialect.quotechar or '"'
+        except csv.Error:
+            return ',', '"'
+
+    def _detect_header(self, sample: str) -> bool:
+        """Sniff the sample for a header row"""
+        # has_header compares the first row with the next 20 and re-sniffs whatever it
+        # is given, so hand it just those lines
+        lines = sample.splitlines(keepends=True)[:21]
+        try:
+            return csv.Sniffer().has_header(''.join(lines))
+        except csv.Error:
+            return False
+
+    def rows(self, count: int) -> List[List[str]]:
+        """
+        Parse the first count rows of the file (including any header row)
+
+        The decoded window grows until it holds count complete rows, so rows with
+        quoted line breaks or very long lines are read whole.
+        """
+        window = self.SNIFF_BYTES
+        while True:
+            text, complete = self.text(window)
+            reader = csv.reader(io.StringIO(text, newline=''), delimiter=self.delimiter,
+                                quotechar=self.quotechar)
+            try:
+                rows = list(islice(reader, count + 1))
+            except csv.Error:
+                if complete:
+                    raise
+                rows = []
+
+            # A row followed by another one cannot have been cut off by the window
+            if complete or len(rows) > count:
+                return rows[:count]
+            window *= 4
@@ -0,0 +1,52 @@
+"""
+Startup Timer - Per-phase timing of application startup
+"""
+
+import time
+from typing import List, Tuple
+from utils import app_log
+
+class StartupTimer:
+    """
+    Records how long each startup phase takes and logs them as one line
+
+    The packaged application has no console, so the line is appended to the
+    application log next to the database (see append_log), which keeps the most
+    recent MAX_LOG_LINES lines.
+
+    Usage:
+        timer = StartupTimer()
+        db_manager = DatabaseManager()
+        timer.mark('database')
+        ...
+        timer.report(log_path)
+    """
+
+    MAX_LOG_LINES = app_log.MAX_LOG_LINES
+
+    def __init__(self, start: float = None):
+        """
+        Args:
+            start: time.perf_counter() value startup began at (defaults to now)
+        """
+        self.start = self.last = time.perf_counter() if start is None else start
+        self.phases: List[Tuple[str, float]] = []
+        self.reported = False
+
+    def mark(self, phase: str):
+        """Record that phase ended now; it began where the previous phase ended"""
+        now = time.perf_counter()
+        self.phases.append((phase, now - self.last))
+        self.last = now
+
+    def summary(self) -> str:
+        """The phases and the total as one line"""
+        phases = ", ".join(f"{phase} {seconds * 1000:.0f} ms" for phase, seconds in self.phases)
+        return f"Startup: {phases} (total {(self.last - self.start) * 1000:.0f} ms)"
+
+    def report(self, log_path: str):
+        """Append the summary to log_path with a timestamp, once; logging never stops startup"""
+        if self.reported:
+            return
+        self.reported = True
+        app_log.append_log(log_path, self.summary(), self.MAX_LOG_LINES)